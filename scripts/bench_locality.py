@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+任务顺序基准(冷页缓存)
+
+比较批量转换按三种顺序提交任务时的耗时:
+    shuffled     打乱的调用顺序(模拟文件选择对话框/多次拖放得到的顺序)
+    locality     按(设备, 目录, inode)排序
+    interleave   按(设备, 目录, inode)排序并在目录内交替大小文件
+每轮开始前sync并对所有输入发出POSIX_FADV_DONTNEED,让输入不在页缓存中
+(无需root;对tmpfs无效,测量时应把--dir指向真实磁盘上的目录)。
+默认只测量按顺序读完全部输入的时间,--convert时测量完整的batch_convert。
+
+用法:
+    python scripts/bench_locality.py [--dir DIR] [--dirs 8] [--files 64]
+                                     [--size 512] [--repeat 3] [--convert]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# 确保项目根目录在路径中
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def create_inputs(root: Path, dirs: int, files: int, size: int) -> list[Path]:
+    """在dirs个子目录中生成files张噪声图(大小交替为size和size/4),交错写入各目录"""
+    from PIL import Image
+
+    paths = []
+    for i in range(files):
+        directory = root / f"dir_{i % dirs:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        side = size if i % 2 else max(8, size // 4)
+        path = directory / f"img_{i:04d}.bmp"
+        Image.effect_noise((side, side), 64).convert('RGB').save(path)
+        paths.append(path)
+    return paths
+
+
+def drop_cache(paths: list[Path]) -> None:
+    """写回脏页后丢弃输入文件的页缓存"""
+    from src.utils.file_access import release
+
+    os.sync()
+    for path in paths:
+        release(path)
+
+
+def read_all(tasks, order: list[int]) -> None:
+    """按顺序读完全部输入"""
+    for index in order:
+        Path(tasks[index].input_file.file_path).read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="任务顺序基准(冷页缓存)")
+    parser.add_argument("--dir", type=Path, help="生成测试文件的目录(默认临时目录)")
+    parser.add_argument("--dirs", type=int, default=8, help="子目录数")
+    parser.add_argument("--files", type=int, default=64, help="文件数")
+    parser.add_argument("--size", type=int, default=512, help="大图边长(像素)")
+    parser.add_argument("--repeat", type=int, default=3, help="每种顺序重复次数")
+    parser.add_argument("--workers", type=int, default=3, help="--convert时的并发数")
+    parser.add_argument("--convert", action="store_true", help="测量完整的批量转换")
+    args = parser.parse_args()
+
+    from src.models.image_file import ImageFile
+    from src.models.conversion_task import ConversionTask
+    from src.models.scheduling_policy import SchedulingPolicy, TaskOrder
+    from src.services.converter_service import ConverterService
+    from src.services.task_scheduler import TaskScheduler
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+        root = Path(temp_dir)
+        paths = create_inputs(root / "input", args.dirs, args.files, args.size)
+        random.Random(0).shuffle(paths)
+        output_dir = root / "output"
+        output_dir.mkdir()
+        tasks = [
+            ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=output_dir / f"{path.parent.name}_{path.stem}.webp",
+                quality=80
+            )
+            for path in paths
+        ]
+
+        policies = {
+            'shuffled': SchedulingPolicy(),
+            'locality': SchedulingPolicy(order=TaskOrder.LOCALITY),
+            'interleave': SchedulingPolicy(order=TaskOrder.LOCALITY, interleave_sizes=True),
+        }
+        scheduler = TaskScheduler()
+        service = ConverterService()
+        total_bytes = sum(task.input_file.file_size for task in tasks)
+        print(f"{len(tasks)} 个文件, {args.dirs} 个目录, 共 {total_bytes / 1024 / 1024:.1f} MB")
+        print(f"{'顺序':<12}{'最佳(ms)':>12}{'平均(ms)':>12}")
+
+        for name, policy in policies.items():
+            timings = []
+            for _ in range(args.repeat):
+                drop_cache(paths)
+                start = time.perf_counter()
+                if args.convert:
+                    service.batch_convert(tasks, max_workers=args.workers, scheduling=policy)
+                else:
+                    read_all(tasks, scheduler.order(tasks, range(len(tasks)), policy))
+                timings.append(time.perf_counter() - start)
+            print(
+                f"{name:<12}{min(timings) * 1000:>12.1f}"
+                f"{sum(timings) / len(timings) * 1000:>12.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
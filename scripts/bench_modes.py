@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+颜色模式转换基准
+
+比较CMYK、I;16、I、F模式图片交给WebP编码器前的两种转换方式:
+    implicit  直接convert('RGB')(即编码器内部的隐式转换,高位深会被截断)
+    explicit  ConverterService.prepare_image的显式转换路径
+输出每种方式的最佳耗时(毫秒)及转换结果的不同灰度级数(渐变图应接近256),
+用于衡量显式路径的额外开销以及它保留下来的灰度层次。
+
+用法:
+    python scripts/bench_modes.py [--size 2048] [--repeat 5]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 确保项目根目录在路径中
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def create_sources(size: int) -> dict:
+    """生成各模式的size×size渐变测试图"""
+    from PIL import Image
+
+    gradient = Image.linear_gradient('L').resize((size, size))
+    wide = gradient.convert('I').point(lambda v: v * 257)
+    return {
+        'CMYK': Image.merge('CMYK', [gradient, gradient.rotate(90), gradient.rotate(180),
+                                     Image.new('L', (size, size), 0)]),
+        'I;16': wide.convert('I;16'),
+        'I': wide,
+        'F': gradient.convert('F').point(lambda v: v / 255),
+    }
+
+
+def best_time(func, repeat: int):
+    """返回(最佳耗时秒, 最后一次结果)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def gray_levels(img) -> int:
+    """转换结果的不同灰度级数"""
+    return sum(1 for count in img.convert('L').histogram() if count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="颜色模式转换基准")
+    parser.add_argument("--size", type=int, default=2048, help="测试图边长(像素)")
+    parser.add_argument("--repeat", type=int, default=5, help="每种方式重复次数")
+    args = parser.parse_args()
+
+    from src.services.converter_service import ConverterService
+
+    service = ConverterService()
+    sources = create_sources(args.size)
+
+    print(f"{'模式':<8}{'隐式(ms)':>12}{'显式(ms)':>12}{'隐式灰度级':>12}{'显式灰度级':>12}")
+    for mode, img in sources.items():
+        implicit_time, implicit = best_time(lambda: img.convert('RGB'), args.repeat)
+        explicit_time, explicit = best_time(lambda: service.prepare_image(img), args.repeat)
+        implicit_levels = gray_levels(implicit)
+        explicit_levels = gray_levels(explicit)
+        print(
+            f"{mode:<8}{implicit_time * 1000:>12.1f}{explicit_time * 1000:>12.1f}"
+            f"{implicit_levels:>12}{explicit_levels:>12}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
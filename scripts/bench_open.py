@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+图片打开延迟基准
+
+在临时目录生成大量小图片(五种支持格式轮换),分别用Image.open和
+open_image(预注册插件+扩展名提示)打开并读取尺寸,比较单次open()延迟。
+每种方式在独立子进程中运行,保证插件注册状态从零开始。
+
+用法:
+    python scripts/bench_open.py [--count 10000] [--size 16]
+"""
+
+import sys
+import argparse
+import subprocess
+import tempfile
+import json
+from pathlib import Path
+
+# 确保项目根目录在路径中
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+FORMATS = [('jpg', 'JPEG'), ('png', 'PNG'), ('gif', 'GIF'), ('bmp', 'BMP'), ('webp', 'WEBP')]
+
+# 子进程中执行的计时代码
+WORKER = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+from pathlib import Path
+paths = sorted(Path({corpus!r}).iterdir())
+if {mode!r} == 'hinted':
+    from src.utils.image_open import open_image as opener
+else:
+    from PIL import Image
+    opener = Image.open
+latencies = []
+for path in paths:
+    start = time.perf_counter()
+    with opener(path) as img:
+        img.size
+    latencies.append((path.suffix, time.perf_counter() - start))
+print(json.dumps(latencies))
+"""
+
+
+def create_corpus(directory: Path, count: int, size: int):
+    """生成count张size×size的小图片"""
+    from PIL import Image
+
+    img = Image.new('RGB', (size, size), (120, 60, 30))
+    for index in range(count):
+        extension, format_name = FORMATS[index % len(FORMATS)]
+        img.save(directory / f"{index:05d}.{extension}", format=format_name)
+
+
+def run_worker(mode: str, corpus: Path) -> list[tuple[str, float]]:
+    """在新进程中计时,返回每次open的(扩展名, 耗时秒)"""
+    code = WORKER.format(root=str(PROJECT_ROOT), corpus=str(corpus), mode=mode)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def summarize(samples: list[tuple[str, float]]) -> dict:
+    """计算启动/平均/分位延迟及各格式平均延迟(微秒)"""
+    latencies = [latency for _, latency in samples]
+    ordered = sorted(latencies)
+    by_format = {}
+    for suffix, latency in samples:
+        by_format.setdefault(suffix, []).append(latency)
+    return {
+        # 每种格式首次打开的总耗时,包含插件导入/Image.init()的一次性开销
+        'startup_us': round(sum(latencies[:len(FORMATS)]) * 1e6, 1),
+        'mean_us': round(sum(latencies) / len(latencies) * 1e6, 1),
+        'p50_us': round(ordered[len(ordered) // 2] * 1e6, 1),
+        'p95_us': round(ordered[int(len(ordered) * 0.95)] * 1e6, 1),
+        'total_s': round(sum(latencies), 3),
+        'format_mean_us': {
+            suffix: round(sum(values) / len(values) * 1e6, 1)
+            for suffix, values in sorted(by_format.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="图片open()延迟基准")
+    parser.add_argument("--count", type=int, default=10000, help="图片数量")
+    parser.add_argument("--size", type=int, default=16, help="图片边长(像素)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus = Path(temp_dir)
+        print(f"生成 {args.count} 张 {args.size}x{args.size} 图片...")
+        create_corpus(corpus, args.count, args.size)
+
+        results = {mode: summarize(run_worker(mode, corpus)) for mode in ('default', 'hinted')}
+
+    print(f"{'方式':<10}{'启动(us)':>12}{'平均(us)':>12}{'P50(us)':>12}{'P95(us)':>12}{'总计(s)':>10}")
+    for mode, stats in results.items():
+        print(
+            f"{mode:<10}{stats['startup_us']:>12}{stats['mean_us']:>12}"
+            f"{stats['p50_us']:>12}{stats['p95_us']:>12}{stats['total_s']:>10}"
+        )
+    print("\n各格式平均延迟(us):")
+    for mode, stats in results.items():
+        formats = "  ".join(f"{suffix}={mean}" for suffix, mean in stats['format_mean_us'].items())
+        print(f"  {mode:<10}{formats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
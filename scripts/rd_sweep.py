@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+率失真扫描工具
+
+对图片语料按质量×method网格编码,输出CSV/JSON报告和各内容类型的拐点摘要。
+
+用法:
+    python scripts/rd_sweep.py <语料目录> [--qualities 50,60,80] [--methods 0,4,6]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 确保项目根目录在路径中
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.rate_distortion_service import RateDistortionService
+
+SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+
+
+def parse_int_list(value: str) -> list[int]:
+    """解析逗号分隔的整数列表"""
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebP率失真扫描")
+    parser.add_argument("corpus", type=Path, help="图片语料目录")
+    parser.add_argument("--qualities", type=parse_int_list, default=None, help="质量网格,逗号分隔")
+    parser.add_argument("--methods", type=parse_int_list, default=None, help="method网格,逗号分隔")
+    parser.add_argument("--workers", type=int, default=4, help="并行编码线程数")
+    parser.add_argument("--output-dir", type=Path, default=Path("."), help="报告输出目录")
+    args = parser.parse_args()
+
+    image_paths = sorted(
+        path for path in args.corpus.rglob("*")
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+    if not image_paths:
+        print(f"✗ 未在 {args.corpus} 中找到图片")
+        return 1
+
+    service = RateDistortionService()
+
+    def on_progress(completed: int, total: int):
+        print(f"  [{completed}/{total}] 已完成", file=sys.stderr)
+
+    print(f"开始扫描 {len(image_paths)} 张图片...")
+    points = service.sweep(
+        image_paths,
+        qualities=args.qualities,
+        methods=args.methods,
+        max_workers=args.workers,
+        progress_callback=on_progress
+    )
+    summary = service.summarize(points)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = service.write_csv(points, args.output_dir / "rd_sweep.csv")
+    json_path = service.write_json(points, args.output_dir / "rd_sweep.json", summary)
+
+    print("\n拐点摘要(质量值):")
+    for content_type, info in summary.items():
+        knees = ", ".join(
+            f"method {method}: {data['knee_quality']}"
+            for method, data in info['methods'].items()
+        )
+        print(f"  {content_type} ({info['image_count']}张) - {knees}")
+
+    print(f"\n✓ CSV: {csv_path}")
+    print(f"✓ JSON: {json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
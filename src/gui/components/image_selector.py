@@ -11,6 +11,7 @@ from typing import Optional, Callable
 from PIL import Image, ImageTk
 
 from src.models.image_file import ImageFile
+from src.gui.components.warning_dialog import SoftLimitChecker
 
 
 class ImageSelector(ttk.Frame):
@@ -116,7 +117,12 @@ class ImageSelector(ttk.Frame):
 文件大小: {info['file_size_mb']} MB
 元数据: {'有' if info['has_metadata'] else '无'}"""
 
-        if info['exceeds_soft_limit']:
+        decode_exceeds, decode_check = SoftLimitChecker.check_decode_cost(image_file.file_path)
+        if decode_exceeds:
+            details += "\n\n⚠️ 警告: " + (
+                decode_check.message or f"解码约需{info['decode_mb']} MB内存,将按条带分块处理"
+            )
+        elif info['exceeds_soft_limit']:
             details += "\n\n⚠️ 警告: 文件较大,转换可能需要较长时间"
 
         self.detail_text.config(state="normal")
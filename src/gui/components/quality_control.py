@@ -32,6 +32,9 @@ class QualityControl(ttk.Frame):
         # 自定义质量变量
         self.custom_quality = tk.IntVar(value=80)
 
+        # 内容识别变量(截图/图形自动改用无损编码)
+        self.content_routing = tk.BooleanVar(value=False)
+
         # 创建UI
         self._create_widgets()
 
@@ -122,6 +125,14 @@ class QualityControl(ttk.Frame):
         )
         hint_label.grid(row=4, column=0, columnspan=2, sticky='w', pady=(5, 0))
 
+        # --- 内容识别 ---
+        content_check = ttk.Checkbutton(
+            self,
+            text="自动识别内容类型(截图/图形使用无损编码)",
+            variable=self.content_routing
+        )
+        content_check.grid(row=3, column=0, columnspan=2, sticky='w', pady=(0, 10))
+
         # 配置网格权重
         self.columnconfigure(0, weight=1)
         preset_frame.columnconfigure(0, weight=1)
@@ -203,6 +214,15 @@ class QualityControl(ttk.Frame):
             preset = QualityPreset[preset_name]
             return preset.quality_value
 
+    def is_content_routing_enabled(self) -> bool:
+        """
+        是否启用内容识别
+
+        返回:
+            True表示按内容类型自动选择有损/近无损/无损编码
+        """
+        return self.content_routing.get()
+
     def set_quality_value(self, quality: int):
         """
         设置质量值
@@ -223,4 +243,5 @@ class QualityControl(ttk.Frame):
         self.quality_mode.set("preset")
         self.preset_quality.set("NORMAL")
         self.custom_quality.set(80)
+        self.content_routing.set(False)
         self._update_controls_state()
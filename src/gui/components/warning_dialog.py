@@ -6,8 +6,11 @@
 
 import tkinter as tk
 from tkinter import messagebox
+from pathlib import Path
 from typing import Callable, Optional
 
+from src.services.decode_guard import DecodeGuard, DecodeCheck, DecodeVerdict
+
 
 class WarningDialog:
     """警告对话框"""
@@ -107,6 +110,31 @@ class WarningDialog:
 
         return result
 
+    @staticmethod
+    def show_decode_limit_warning(check: DecodeCheck) -> bool:
+        """
+        显示解码成本超限警告
+
+        参数:
+            check: 解码检查结果
+
+        返回:
+            True表示用户选择继续(分块处理),False表示取消或已拒绝
+        """
+        if check.verdict == DecodeVerdict.REJECT:
+            messagebox.showerror("解码上限", f"⚠️ {check.message}\n\n该图片将被跳过。")
+            return False
+
+        header = check.header
+        message = (
+            f"⚠️ 警告\n\n"
+            f"图片尺寸过大({header.width}x{header.height}像素),\n"
+            f"整张解码约需{header.decode_bytes / (1024 * 1024):.0f} MB内存。\n\n"
+            f"将按条带分块处理以限制内存占用。\n\n"
+            f"是否继续转换?"
+        )
+        return messagebox.askyesno("解码成本警告", message, icon='warning')
+
     @staticmethod
     def show_quality_warning(quality: int, warning_type: str = "low") -> bool:
         """
@@ -230,6 +258,25 @@ class SoftLimitChecker:
         exceeds = width > cls.MAX_DIMENSION or height > cls.MAX_DIMENSION
         return exceeds, width, height
 
+    @classmethod
+    def check_decode_cost(
+        cls,
+        file_path: Path,
+        guard: Optional[DecodeGuard] = None
+    ) -> tuple[bool, DecodeCheck]:
+        """
+        按文件头检查解码成本(不读取像素数据)
+
+        参数:
+            file_path: 图片文件路径
+            guard: 解码防护,默认使用DecodeGuard()的上限
+
+        返回:
+            (是否超出解码上限, 解码检查结果)
+        """
+        check = (guard or DecodeGuard()).check(file_path)
+        return check.verdict != DecodeVerdict.ALLOW, check
+
     @classmethod
     def check_and_warn(
         cls,
@@ -40,7 +40,8 @@ class ConversionHandler:
         image_file: ImageFile,
         output_path: Path,
         quality: int,
-        preserve_metadata: bool = True
+        preserve_metadata: bool = True,
+        content_routing: bool = False
     ):
         """
         开始转换
@@ -50,6 +51,7 @@ class ConversionHandler:
             output_path: 输出文件路径
             quality: 质量参数
             preserve_metadata: 是否保留元数据
+            content_routing: 是否按内容类型自动选择编码方式
         """
         # 重置停止标志
         self.stop_event.clear()
@@ -57,7 +59,7 @@ class ConversionHandler:
         # 创建工作线程
         self.worker_thread = threading.Thread(
             target=self._conversion_worker,
-            args=(image_file, output_path, quality, preserve_metadata),
+            args=(image_file, output_path, quality, preserve_metadata, content_routing),
             daemon=True
         )
         self.worker_thread.start()
@@ -67,7 +69,8 @@ class ConversionHandler:
         image_file: ImageFile,
         output_path: Path,
         quality: int,
-        preserve_metadata: bool
+        preserve_metadata: bool,
+        content_routing: bool
     ):
         """转换工作线程"""
         import sys
@@ -84,7 +87,8 @@ class ConversionHandler:
                 output_path=output_path,
                 quality=quality,
                 preserve_metadata=preserve_metadata,
-                stop_event=self.stop_event
+                stop_event=self.stop_event,
+                content_routing=content_routing
             )
 
             print(f"[DEBUG] 转换完成: success={result.success}", file=sys.stderr)
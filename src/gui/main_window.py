@@ -165,7 +165,8 @@ class MainWindow:
             image_file=self.current_image,
             output_path=output_path,
             quality=quality,
-            preserve_metadata=True
+            preserve_metadata=True,
+            content_routing=self.quality_control.is_content_routing_enabled()
         )
 
     def _on_cancel_click(self):
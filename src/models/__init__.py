@@ -4,6 +4,14 @@
 
 from .image_metadata import ImageMetadata
 from .quality_preset import QualityPreset
+from .encoder_profile import EncoderProfile
+from .output_policy import OutputPolicy, OutputOutcome, FallbackAction
+from .alpha_policy import AlphaPolicy
+from .animation_policy import AnimationPolicy
+from .tiling_policy import TilingPolicy, TileMode
+from .metadata_policy import MetadataPolicy
+from .io_policy import IOPolicy
+from .scheduling_policy import SchedulingPolicy, TaskOrder
 from .image_file import ImageFile
 from .conversion_task import ConversionTask, TaskStatus
 from .batch_conversion_job import BatchConversionJob
@@ -11,6 +19,18 @@ from .batch_conversion_job import BatchConversionJob
 __all__ = [
     'ImageMetadata',
     'QualityPreset',
+    'EncoderProfile',
+    'OutputPolicy',
+    'OutputOutcome',
+    'FallbackAction',
+    'AlphaPolicy',
+    'AnimationPolicy',
+    'TilingPolicy',
+    'TileMode',
+    'MetadataPolicy',
+    'IOPolicy',
+    'SchedulingPolicy',
+    'TaskOrder',
     'ImageFile',
     'ConversionTask',
     'TaskStatus',
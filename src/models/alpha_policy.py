@@ -0,0 +1,24 @@
+"""
+透明通道策略实体
+
+控制透明通道的快速路径(丢弃全不透明通道)和WebP透明通道编码参数。
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class AlphaPolicy:
+    """透明通道策略实体"""
+
+    # 透明通道全部为255时转换为RGB,省去透明通道编码
+    drop_opaque_alpha: bool = True
+    # 半透明(渐变)透明通道的编码质量(0-100,100为无损)
+    alpha_quality: int = 100
+    # 二值透明通道(仅0/255)的编码质量。有损透明通道只做灰阶量化且至少保留两级,
+    # 二值蒙版解码后仍逐像素一致,因此默认使用较低的质量
+    binary_alpha_quality: int = 50
+    # 是否保留完全透明像素下的RGB值(关闭时编码器可改写以减小体积)
+    exact: bool = False
+    # 是否额外编码一次原始图片,测量快速路径节省的字节数和时间
+    measure_savings: bool = False
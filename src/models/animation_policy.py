@@ -0,0 +1,22 @@
+"""
+动画策略实体
+
+控制多帧图片(动画GIF等)转换为动画WebP的方式,包括重复帧丢弃和循环次数。
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class AnimationPolicy:
+    """动画策略实体"""
+
+    # 多帧图片输出为动画WebP,关闭时只转换第一帧
+    animate: bool = True
+    # 丢弃与上一保留帧相同或近似相同的帧,其显示时长并入上一保留帧
+    drop_duplicate_frames: bool = True
+    # 判定为近似相同帧的最大通道差值(0表示完全相同)
+    duplicate_tolerance: int = 2
+    # 循环次数,None沿用源图片(没有循环信息的GIF只播放一次),0为无限循环
+    loop: Optional[int] = None
@@ -12,6 +12,12 @@ from typing import Optional
 import uuid
 
 from .image_file import ImageFile
+from .encoder_profile import EncoderProfile
+from .output_policy import OutputPolicy
+from .alpha_policy import AlphaPolicy
+from .animation_policy import AnimationPolicy
+from .tiling_policy import TilingPolicy
+from .metadata_policy import MetadataPolicy
 
 
 class TaskStatus(Enum):
@@ -31,6 +37,16 @@ class ConversionTask:
     output_path: Path
     quality: int
     preserve_metadata: bool = True
+    encoder_profile: EncoderProfile = EncoderProfile.BALANCED
+    time_budget: Optional[float] = None
+    output_policy: Optional[OutputPolicy] = None
+    content_routing: bool = False
+    alpha_policy: Optional[AlphaPolicy] = None
+    animation_policy: Optional[AnimationPolicy] = None
+    tiling_policy: Optional[TilingPolicy] = None
+    metadata_policy: MetadataPolicy = MetadataPolicy.KEEP_ALL
+    normalize_orientation: bool = False
+    convert_to_srgb: bool = False
     status: TaskStatus = TaskStatus.PENDING
     task_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     output_file_size: Optional[int] = None
@@ -79,6 +95,7 @@ class ConversionTask:
             'input_file': self.input_file.file_name,
             'output_path': str(self.output_path),
             'quality': self.quality,
+            'encoder_profile': self.encoder_profile.name,
             'output_file_size': self.output_file_size,
             'compression_ratio': self.compression_ratio,
             'duration_seconds': self.duration_seconds,
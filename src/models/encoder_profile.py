@@ -0,0 +1,96 @@
+"""
+编码器速度档位枚举
+
+定义WebP编码器method参数的命名档位,以及按像素数和单图时间预算
+自动选择method的"自动"档位。
+"""
+
+from enum import Enum
+from typing import Optional
+
+
+# 各method的保守编码吞吐量估计(百万像素/秒),用于自动档位的耗时预测
+METHOD_THROUGHPUT_MPPS = {
+    0: 30.0,
+    1: 25.0,
+    2: 20.0,
+    3: 12.0,
+    4: 10.0,
+    5: 7.0,
+    6: 5.0,
+}
+
+# 低于该像素数的图片(缩略图)method=6的额外开销可以忽略
+THUMBNAIL_PIXELS = 500_000
+
+# 自动档位默认的单图编码时间预算(秒)
+DEFAULT_TIME_BUDGET = 2.0
+
+
+class EncoderProfile(Enum):
+    """编码器速度档位枚举"""
+
+    FASTEST = ("最快", 1, "编码速度优先,文件略大")
+    BALANCED = ("平衡", 4, "平衡编码速度和文件大小")
+    SMALLEST = ("最小", 6, "文件大小优先,编码较慢")
+    AUTO = ("自动", None, "根据像素数和时间预算自动选择")
+
+    def __init__(self, name: str, method: Optional[int], description: str):
+        self.display_name = name
+        self.method_value = method
+        self.desc = description
+
+    def resolve_method(self, pixel_count: int, time_budget: Optional[float] = None) -> int:
+        """
+        返回该档位对指定图片使用的method
+
+        参数:
+            pixel_count: 图片像素数(宽×高)
+            time_budget: 单图编码时间预算(秒),仅AUTO档位使用
+
+        返回:
+            WebP编码器method参数(0-6)
+        """
+        if self.method_value is not None:
+            return self.method_value
+        return select_method(pixel_count, time_budget)
+
+
+def estimate_encode_time(pixel_count: int, method: int) -> float:
+    """
+    估算指定method下的编码耗时
+
+    参数:
+        pixel_count: 图片像素数
+        method: WebP编码器method参数(0-6)
+
+    返回:
+        预估耗时(秒)
+    """
+    return pixel_count / 1_000_000 / METHOD_THROUGHPUT_MPPS[method]
+
+
+def select_method(pixel_count: int, time_budget: Optional[float] = None) -> int:
+    """
+    按像素数和时间预算选择method
+
+    缩略图直接使用method=6;其余图片选择预估耗时不超过预算的最高method,
+    即使method=0也超出预算时仍返回0。
+
+    参数:
+        pixel_count: 图片像素数
+        time_budget: 单图编码时间预算(秒),默认DEFAULT_TIME_BUDGET
+
+    返回:
+        WebP编码器method参数(0-6)
+    """
+    if pixel_count <= THUMBNAIL_PIXELS:
+        return 6
+
+    if time_budget is None:
+        time_budget = DEFAULT_TIME_BUDGET
+
+    for method in sorted(METHOD_THROUGHPUT_MPPS, reverse=True):
+        if estimate_encode_time(pixel_count, method) <= time_budget:
+            return method
+    return 0
@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Optional, Tuple
 from PIL import Image
 
+from src.utils.image_header import read_image_header
+from src.utils.image_open import open_image
 from .image_metadata import ImageMetadata
 
 
@@ -23,6 +25,10 @@ class ImageFile:
     height: int
     file_size: int
     metadata: Optional[ImageMetadata] = None
+    # 按文件头估算的整张解码内存(字节),文件头无法解析时为0
+    decode_bytes: int = 0
+    # Pillow颜色模式(如RGB、RGBA、P),仅凭文件头创建时为None
+    mode: Optional[str] = None
 
     @property
     def file_size_mb(self) -> float:
@@ -53,12 +59,29 @@ class ImageFile:
         if not file_path.is_file():
             raise ValueError(f"路径不是有效的文件: {file_path}")
 
+        # 先解析文件头估算解码成本;超出Pillow解压炸弹硬上限的图片
+        # Image.open会直接报错,只用文件头信息创建实例,由转换阶段拒绝
+        header = read_image_header(file_path)
+        decode_bytes = header.decode_bytes if header else 0
+        hard_limit = Image.MAX_IMAGE_PIXELS and 2 * Image.MAX_IMAGE_PIXELS
+        if header and hard_limit and header.pixel_count > hard_limit:
+            return cls(
+                file_path=file_path,
+                file_name=file_path.name,
+                format=header.format,
+                width=header.width,
+                height=header.height,
+                file_size=file_path.stat().st_size,
+                decode_bytes=decode_bytes
+            )
+
         # 使用Pillow打开图片并提取信息
         try:
-            with Image.open(file_path) as img:
+            with open_image(file_path) as img:
                 format_str = img.format if img.format else "UNKNOWN"
                 width = img.width
                 height = img.height
+                mode = img.mode
 
                 # 提取元数据
                 metadata = ImageMetadata.from_pil_image(img)
@@ -76,7 +99,9 @@ class ImageFile:
             width=width,
             height=height,
             file_size=file_size,
-            metadata=metadata
+            metadata=metadata,
+            decode_bytes=decode_bytes,
+            mode=mode
         )
 
     def validate(self) -> Tuple[bool, str]:
@@ -111,5 +136,6 @@ class ImageFile:
             'file_size': self.file_size,
             'file_size_mb': round(self.file_size_mb, 2),
             'exceeds_soft_limit': self.exceeds_soft_limit,
+            'decode_mb': round(self.decode_bytes / (1024 * 1024), 1),
             'has_metadata': self.metadata.has_metadata if self.metadata else False
         }
@@ -43,6 +43,11 @@ class ImageMetadata:
 
         return cls(exif=exif, xmp=xmp, icc_profile=icc_profile)
 
+    @property
+    def byte_size(self) -> int:
+        """EXIF/XMP/ICC数据的总字节数"""
+        return sum(len(data) for data in (self.exif, self.xmp, self.icc_profile) if data)
+
     def to_save_params(self) -> dict:
         """返回用于Pillow保存时的参数字典"""
         params = {}
@@ -0,0 +1,25 @@
+"""
+输入读取策略实体
+
+定义大文件的读取方式: 超过阈值的本地文件用mmap映射后解码,批量转换时
+用posix_fadvise预读后续任务的输入,并在每张图片处理完后释放其页缓存。
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class IOPolicy:
+    """输入读取策略实体"""
+
+    # 文件大小达到该值时用mmap打开(None表示不使用mmap)
+    mmap_min_bytes: Optional[int] = 8 * 1024 * 1024
+    # 批量转换时提前WILLNEED的后续任务数(0表示不预读)
+    readahead: int = 0
+    # 处理完一张图片后对其输入文件DONTNEED
+    drop_cache: bool = True
+
+    def use_mmap(self, file_size: int) -> bool:
+        """该大小的文件是否用mmap打开"""
+        return self.mmap_min_bytes is not None and file_size >= self.mmap_min_bytes
@@ -0,0 +1,23 @@
+"""
+元数据策略枚举
+
+定义转换时保留哪些元数据: 全部保留、去除EXIF缩略图、去除GPS、
+只保留方向和ICC、全部去除。
+"""
+
+from enum import Enum
+
+
+class MetadataPolicy(Enum):
+    """元数据保留策略"""
+
+    KEEP_ALL = "保留全部"
+    STRIP_THUMBNAIL = "去除EXIF缩略图"
+    STRIP_GPS = "去除GPS位置"
+    KEEP_ORIENTATION_AND_ICC = "仅保留方向和ICC"
+    STRIP_ALL = "去除全部"
+
+    @property
+    def display_name(self) -> str:
+        """显示名称"""
+        return self.value
@@ -0,0 +1,41 @@
+"""
+输出策略实体
+
+定义WebP结果不够小时的处理方式: 尝试无损编码,或保留/链接原图。
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+class OutputOutcome(Enum):
+    """单张图片的输出结果类型"""
+    WEBP_LOSSY = "有损WebP"
+    WEBP_LOSSLESS = "无损WebP"
+    ORIGINAL_KEPT = "保留原图"
+    ORIGINAL_LINKED = "链接原图"
+
+
+class FallbackAction(Enum):
+    """WebP不够小时的兜底动作"""
+    KEEP_ORIGINAL = "保留原图,不写输出文件"
+    LINK_ORIGINAL = "在输出目录创建原图的硬链接(不支持时复制)"
+
+
+@dataclass
+class OutputPolicy:
+    """输出策略实体"""
+
+    # WebP至少要比原图小的百分比,0表示只要不比原图大即可
+    min_savings_percent: float = 0.0
+    # 有损结果不达标时,对调色板/图形类图片尝试无损编码
+    try_lossless: bool = True
+    fallback: FallbackAction = FallbackAction.KEEP_ORIGINAL
+
+    def size_threshold(self, input_size: int) -> int:
+        """返回可接受的最大输出字节数"""
+        return int(input_size * (1 - self.min_savings_percent / 100))
+
+    def accepts(self, output_size: int, input_size: int) -> bool:
+        """输出大小是否满足策略要求"""
+        return output_size <= self.size_threshold(input_size)
@@ -0,0 +1,33 @@
+"""
+调度策略实体
+
+定义批量转换中任务的提交顺序: 按调用顺序;按(设备, 目录, inode)排序以减少
+机械硬盘和网络共享上的随机访问,并可选地在同一目录内交替提交大文件和小文件;
+或按估计耗时排序(短任务优先缩短首批结果的等待,长任务优先缩短整批耗时)。
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+from .conversion_task import ConversionTask
+
+
+class TaskOrder(Enum):
+    """任务提交顺序"""
+    FIFO = "按调用顺序"
+    LOCALITY = "按设备/目录/inode排序"
+    SJF = "短任务优先"
+    LPT = "长任务优先"
+
+
+@dataclass
+class SchedulingPolicy:
+    """调度策略实体"""
+
+    order: TaskOrder = TaskOrder.FIFO
+    # LOCALITY顺序下,在同一目录内交替提交大文件和小文件,
+    # 让读取大文件的I/O与处理小文件的CPU重叠
+    interleave_sizes: bool = False
+    # SJF/LPT顺序使用的单任务耗时估计(秒),默认按像素数和格式估算
+    cost_estimator: Optional[Callable[[ConversionTask], float]] = None
@@ -0,0 +1,41 @@
+"""
+分块策略实体
+
+定义超出WebP尺寸上限(16383像素)或内存上限的图片的处理方式:
+拆分为多个WebP分块并生成清单,或缩小到上限以内。
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+# WebP格式允许的最大宽/高
+WEBP_MAX_DIMENSION = 16383
+
+
+class TileMode(Enum):
+    """超限图片的输出方式"""
+    SPLIT = "拆分为WebP分块并生成清单"
+    DOWNSCALE = "缩小到尺寸上限以内"
+
+
+@dataclass
+class TilingPolicy:
+    """分块策略实体"""
+
+    mode: TileMode = TileMode.SPLIT
+    # 输出允许的最大宽/高,超出时启用分块处理
+    max_dimension: int = WEBP_MAX_DIMENSION
+    # 像素数超出该值时也启用分块处理(None表示不按像素数限制)
+    max_pixels: Optional[int] = None
+    # SPLIT模式下每个分块的边长
+    tile_size: int = 4096
+    # 按条带读取时每条带的行数,峰值内存与条带高度成正比
+    strip_height: int = 1024
+
+    def requires_tiling(self, width: int, height: int) -> bool:
+        """图片是否需要分块处理"""
+        if width > self.max_dimension or height > self.max_dimension:
+            return True
+        return self.max_pixels is not None and width * height > self.max_pixels
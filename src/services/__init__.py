@@ -5,10 +5,18 @@
 from .file_service import FileService
 from .metadata_service import MetadataService
 from .converter_service import ConverterService, ConversionResult
+from .rate_distortion_service import RateDistortionService, RateDistortionPoint
+from .batch_report import BatchReport
+from .cost_model import CostModel, CostPrediction
 
 __all__ = [
     'FileService',
     'MetadataService',
     'ConverterService',
     'ConversionResult',
+    'RateDistortionService',
+    'RateDistortionPoint',
+    'BatchReport',
+    'CostModel',
+    'CostPrediction',
 ]
@@ -0,0 +1,79 @@
+"""
+透明通道优化服务
+
+基于getextrema/histogram(均为C实现,不复制像素)分析透明通道,
+丢弃全不透明的透明通道,并按二值/渐变透明选择编码参数。
+"""
+
+from enum import Enum
+from PIL import Image
+
+from src.models.alpha_policy import AlphaPolicy
+
+
+class AlphaProfile(Enum):
+    """透明通道特征"""
+    NONE = "none"        # 无透明通道
+    OPAQUE = "opaque"    # 透明通道全部为255
+    BINARY = "binary"    # 仅包含0和255
+    GRADED = "graded"    # 包含半透明值
+
+
+class AlphaOptimizer:
+    """透明通道优化器"""
+
+    def analyze(self, img: Image.Image) -> AlphaProfile:
+        """
+        分析图片的透明通道
+
+        Args:
+            img: Pillow图片对象
+
+        Returns:
+            AlphaProfile
+        """
+        if img.mode == 'P' and 'transparency' in img.info:
+            img = img.convert('RGBA')
+
+        bands = img.getbands()
+        if 'A' not in bands:
+            return AlphaProfile.NONE
+
+        index = bands.index('A')
+        low, _ = img.getextrema()[index]
+        if low == 255:
+            return AlphaProfile.OPAQUE
+
+        histogram = img.histogram()[index * 256:(index + 1) * 256]
+        if not any(histogram[1:255]):
+            return AlphaProfile.BINARY
+        return AlphaProfile.GRADED
+
+    def optimize(
+        self,
+        img: Image.Image,
+        policy: AlphaPolicy
+    ) -> tuple[Image.Image, AlphaProfile, dict]:
+        """
+        按策略处理透明通道
+
+        Args:
+            img: 已准备好的图片对象
+            policy: 透明通道策略
+
+        Returns:
+            (待编码图片, 透明通道特征, 追加的WebP保存参数)
+        """
+        profile = self.analyze(img)
+
+        if profile == AlphaProfile.NONE:
+            return img, profile, {}
+
+        if profile == AlphaProfile.OPAQUE and policy.drop_opaque_alpha:
+            return img.convert('RGB'), profile, {}
+
+        alpha_quality = (
+            policy.binary_alpha_quality if profile == AlphaProfile.BINARY
+            else policy.alpha_quality
+        )
+        return img, profile, {'alpha_quality': alpha_quality, 'exact': policy.exact}
@@ -0,0 +1,166 @@
+"""
+动画编码服务
+
+将多帧图片(动画GIF/APNG/WebP)流式编码为动画WebP。
+
+分两遍处理: 第一遍逐帧比较,确定要保留的帧及合并后的显示时长;
+第二遍按需逐帧解码并交给WebP动画编码器。任何时刻只有当前帧和
+上一保留帧在内存中,帧数再多也不会把所有RGBA帧同时载入内存。
+源图片的disposal和透明叠加由Pillow在解码时合成,每帧都是完整画布,
+帧间差异区域由libwebp动画编码器自行裁剪。
+"""
+
+import io
+from dataclasses import dataclass
+from PIL import Image, ImageChops
+
+from src.models.animation_policy import AnimationPolicy
+
+
+@dataclass
+class AnimationPlan:
+    """动画帧计划"""
+    frame_indices: list[int]
+    durations: list[int]
+    source_frames: int
+    loop: int
+
+    @property
+    def dropped_frames(self) -> int:
+        """被丢弃的重复帧数"""
+        return self.source_frames - len(self.frame_indices)
+
+    def to_dict(self) -> dict:
+        """返回可序列化的计划摘要"""
+        return {
+            'frames': len(self.frame_indices),
+            'source_frames': self.source_frames,
+            'dropped_frames': self.dropped_frames,
+            'loop': self.loop,
+        }
+
+
+class _FrameSequence:
+    """
+    按需解码保留帧的帧序列
+
+    作为append_images传给WebP编码器: 编码器按n_frames逐个seek,
+    每次seek只解码一帧并释放上一帧,其余属性委托给当前帧。
+    """
+
+    def __init__(self, img: Image.Image, frame_indices: list[int]):
+        self._img = img
+        self._frame_indices = frame_indices
+        self._frame = None
+        self.n_frames = len(frame_indices)
+
+    def seek(self, index: int) -> None:
+        self._frame = None
+        self._img.seek(self._frame_indices[index])
+        self._img.load()
+        self._frame = _as_rgba(self._img)
+
+    def __getattr__(self, name):
+        return getattr(self._frame, name)
+
+
+def _as_rgba(img: Image.Image) -> Image.Image:
+    """转换为编码器可直接使用的模式,已是RGB/RGBA时不复制"""
+    if img.mode in ('RGB', 'RGBA'):
+        return img
+    return img.convert('RGBA')
+
+
+class AnimationEncoder:
+    """动画WebP编码器"""
+
+    def plan(self, img: Image.Image, policy: AnimationPolicy) -> AnimationPlan:
+        """
+        第一遍: 逐帧比较,确定保留帧和显示时长
+
+        Args:
+            img: 已打开的多帧图片对象
+            policy: 动画策略
+
+        Returns:
+            AnimationPlan
+        """
+        source_frames = getattr(img, 'n_frames', 1)
+        loop = policy.loop if policy.loop is not None else img.info.get('loop', 1)
+
+        frame_indices: list[int] = []
+        durations: list[int] = []
+        previous = None
+
+        for index in range(source_frames):
+            img.seek(index)
+            duration = int(img.info.get('duration', 0))
+
+            if policy.drop_duplicate_frames:
+                current = img.convert('RGBA')
+                if previous is not None and self._is_duplicate(
+                    previous, current, policy.duplicate_tolerance
+                ):
+                    durations[-1] += duration
+                    continue
+                previous = current
+
+            frame_indices.append(index)
+            durations.append(duration)
+
+        return AnimationPlan(
+            frame_indices=frame_indices,
+            durations=durations,
+            source_frames=source_frames,
+            loop=loop,
+        )
+
+    def encode(
+        self,
+        img: Image.Image,
+        plan: AnimationPlan,
+        quality: int,
+        method: int = 4,
+        **params
+    ) -> bytes:
+        """
+        第二遍: 按计划逐帧编码动画WebP
+
+        Args:
+            img: 已打开的多帧图片对象
+            plan: plan()的结果
+            quality: 质量参数
+            method: 编码器method
+            **params: 其他WebP保存参数(lossless、icc_profile、exif等)
+
+        Returns:
+            动画WebP字节
+        """
+        # 第一帧需独立于后续seek,复制一份
+        img.seek(plan.frame_indices[0])
+        first = img.copy() if img.mode in ('RGB', 'RGBA') else img.convert('RGBA')
+
+        buffer = io.BytesIO()
+        first.save(
+            buffer,
+            format='WEBP',
+            save_all=True,
+            append_images=[_FrameSequence(img, plan.frame_indices[1:])],
+            duration=plan.durations,
+            loop=plan.loop,
+            background=(0, 0, 0, 0),
+            quality=quality,
+            method=method,
+            **params
+        )
+        return buffer.getvalue()
+
+    def _is_duplicate(
+        self,
+        previous: Image.Image,
+        current: Image.Image,
+        tolerance: int
+    ) -> bool:
+        """两帧所有通道的最大差值是否不超过容差"""
+        extrema = ImageChops.difference(previous, current).getextrema()
+        return max(high for _, high in extrema) <= tolerance
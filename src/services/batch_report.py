@@ -0,0 +1,92 @@
+"""
+批量转换报告
+
+汇总batch_convert返回的ConversionResult列表,统计各输出结果类型的数量、
+输出字节数、各阶段耗时、各类优化节省的字节数/时间以及去重比例。
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from src.services.converter_service import ConversionResult
+
+
+@dataclass
+class BatchReport:
+    """批量转换报告"""
+
+    total_count: int = 0
+    success_count: int = 0
+    failed_count: int = 0
+    cancelled_count: int = 0
+    output_bytes: int = 0
+    total_duration: float = 0.0
+    outcome_counts: dict = field(default_factory=dict)
+    stage_timings: dict = field(default_factory=dict)
+    savings: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_results(cls, results: list[ConversionResult]) -> "BatchReport":
+        """
+        从转换结果列表生成报告
+
+        参数:
+            results: batch_convert返回的结果列表
+
+        返回:
+            BatchReport实例
+        """
+        report = cls(total_count=len(results))
+        outcomes = Counter()
+        stage_timings = Counter()
+        savings: dict[str, Counter] = {}
+
+        for result in results:
+            report.total_duration += result.duration
+
+            if result.success:
+                report.success_count += 1
+                report.output_bytes += result.output_size or 0
+            elif result.error_message == "转换已取消":
+                report.cancelled_count += 1
+            else:
+                report.failed_count += 1
+
+            if result.outcome is not None:
+                outcomes[result.outcome.name] += 1
+            if result.stage_timings:
+                stage_timings.update(result.stage_timings)
+            for kind, saved in (result.savings or {}).items():
+                totals = savings.setdefault(kind, Counter())
+                totals.update(saved)
+                totals['count'] += 1
+
+        report.outcome_counts = dict(outcomes)
+        report.stage_timings = {k: round(v, 6) for k, v in stage_timings.items()}
+        report.savings = {
+            kind: {k: round(v, 6) if isinstance(v, float) else v for k, v in totals.items()}
+            for kind, totals in savings.items()
+        }
+        return report
+
+    @property
+    def dedup_ratio(self) -> float:
+        """去重模式下复用其他任务输出的任务占比"""
+        if not self.total_count:
+            return 0.0
+        return self.savings.get('dedup', {}).get('count', 0) / self.total_count
+
+    def get_summary(self) -> dict:
+        """返回报告摘要字典(用于UI显示或导出)"""
+        return {
+            'total_count': self.total_count,
+            'success_count': self.success_count,
+            'failed_count': self.failed_count,
+            'cancelled_count': self.cancelled_count,
+            'output_bytes': self.output_bytes,
+            'total_duration': round(self.total_duration, 3),
+            'outcome_counts': dict(self.outcome_counts),
+            'stage_timings': dict(self.stage_timings),
+            'savings': {kind: dict(totals) for kind, totals in self.savings.items()},
+            'dedup_ratio': round(self.dedup_ratio, 4),
+        }
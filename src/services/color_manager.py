@@ -0,0 +1,141 @@
+"""
+色彩管理服务
+
+基于PIL.ImageCms将带ICC配置文件(Display P3、AdobeRGB等)的图片转换到sRGB,
+转换后可丢弃ICC配置文件。构建变换需要数毫秒,而同一批次中不同的配置文件
+通常只有几个,因此按(配置文件哈希, 颜色模式)缓存已构建的变换,在批次内复用。
+"""
+
+import hashlib
+import io
+import threading
+from typing import Optional
+from PIL import Image, ImageCms
+
+
+class ColorManager:
+    """ICC到sRGB的色彩转换器(变换缓存线程安全)"""
+
+    # 支持转换的输入模式 -> 输出模式
+    OUTPUT_MODES = {
+        'RGB': 'RGB',
+        'RGBA': 'RGBA',
+        'CMYK': 'RGB',
+    }
+    # 渲染意图: 感知(与浏览器对未标记sRGB内容的处理一致)
+    INTENT = ImageCms.Intent.PERCEPTUAL
+    # 多线程共享同一变换时禁用lcms的单像素缓存
+    FLAGS = ImageCms.Flags.NOCACHE
+
+    def __init__(self):
+        self._srgb = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB'))
+        # 缓存值为None表示无需(配置文件本身就是sRGB)或无法(配置文件无法解析、
+        # 与颜色模式不匹配)变换
+        self._transforms: dict[tuple[str, str], Optional[ImageCms.ImageCmsTransform]] = {}
+        # 配置文件哈希 -> 是否为sRGB
+        self._srgb_profiles: dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def to_srgb(self, img: Image.Image, icc_profile: Optional[bytes]) -> Image.Image:
+        """
+        将图片从其ICC配置文件转换到sRGB
+
+        Args:
+            img: 已解码的Pillow图片对象
+            icc_profile: 图片内嵌的ICC配置文件字节
+
+        Returns:
+            sRGB图片对象;没有配置文件、模式不支持、配置文件已是sRGB或
+            无法构建变换时返回原对象
+        """
+        if not icc_profile or img.mode not in self.OUTPUT_MODES:
+            return img
+
+        transform = self.get_transform(icc_profile, img.mode)
+        if transform is None:
+            return img
+        try:
+            return ImageCms.applyTransform(img, transform)
+        except ImageCms.PyCMSError:
+            return img
+
+    def is_srgb(self, icc_profile: bytes) -> bool:
+        """
+        判断配置文件是否已是sRGB(结果按配置文件哈希缓存)
+
+        Args:
+            icc_profile: ICC配置文件字节
+
+        Returns:
+            是否为sRGB配置文件;无法解析时返回False
+        """
+        key = hashlib.sha1(icc_profile).hexdigest()
+        with self._lock:
+            if key in self._srgb_profiles:
+                return self._srgb_profiles[key]
+        try:
+            is_srgb = self._is_srgb(ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)))
+        except (OSError, ImageCms.PyCMSError):
+            is_srgb = False
+        with self._lock:
+            self._srgb_profiles[key] = is_srgb
+        return is_srgb
+
+    def get_transform(
+        self, icc_profile: bytes, mode: str
+    ) -> Optional[ImageCms.ImageCmsTransform]:
+        """
+        获取(必要时构建并缓存)配置文件到sRGB的变换
+
+        Args:
+            icc_profile: ICC配置文件字节
+            mode: 输入颜色模式
+
+        Returns:
+            ImageCmsTransform;配置文件已是sRGB、无法解析或与颜色模式不匹配时返回None
+        """
+        key = (hashlib.sha1(icc_profile).hexdigest(), mode)
+        with self._lock:
+            if key in self._transforms:
+                self.hits += 1
+                return self._transforms[key]
+            self.misses += 1
+
+        transform = self._build_transform(icc_profile, mode)
+        with self._lock:
+            self._transforms.setdefault(key, transform)
+            return self._transforms[key]
+
+    def _build_transform(
+        self, icc_profile: bytes, mode: str
+    ) -> Optional[ImageCms.ImageCmsTransform]:
+        try:
+            source = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+        except (OSError, ImageCms.PyCMSError):
+            return None
+        if mode != 'CMYK' and self._is_srgb(source):
+            return None
+        try:
+            return ImageCms.buildTransform(
+                source, self._srgb, mode, self.OUTPUT_MODES[mode],
+                renderingIntent=self.INTENT, flags=self.FLAGS
+            )
+        except ImageCms.PyCMSError:
+            # 配置文件的色彩空间与图片模式不匹配(如RGB图片附带LAB/CMYK配置文件)
+            return None
+
+    def _is_srgb(self, profile: ImageCms.ImageCmsProfile) -> bool:
+        """按配置文件描述判断是否已是sRGB(如"sRGB IEC61966-2.1")"""
+        description = ImageCms.getProfileDescription(profile) or ''
+        return description.strip().lower().startswith('srgb')
+
+    def cache_info(self) -> dict:
+        """返回变换缓存统计"""
+        with self._lock:
+            return {
+                'transforms': len(self._transforms),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,173 @@
+"""
+内容分类服务
+
+在缩小后的图片上快速提取颜色数、平坦区域比例、边缘密度和透明通道特征,
+将图片分为照片/截图/图形三类,并路由到有损、近无损或无损WebP编码:
+    图形   颜色少(或硬边透明的抠图)且不是抖动/噪声纹理 → 无损
+    截图   大面积平坦区域 + 锐利的文字/线条边缘 → 颜色不多时无损,
+           内嵌照片等颜色过多时近无损(高质量有损)
+    照片   其余 → 有损
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from PIL import Image, ImageFilter
+
+from src.services.alpha_optimizer import AlphaOptimizer, AlphaProfile
+
+
+class ContentClass(Enum):
+    """图片内容类别"""
+    PHOTO = "照片"
+    SCREENSHOT = "截图"
+    GRAPHIC = "图形"
+
+
+class EncodingMode(Enum):
+    """WebP编码方式"""
+    LOSSY = "有损"
+    NEAR_LOSSLESS = "近无损"
+    LOSSLESS = "无损"
+
+
+@dataclass
+class ContentAnalysis:
+    """内容分析结果"""
+    content_class: ContentClass
+    encoding_mode: EncodingMode
+    unique_colors: int
+    flat_ratio: float
+    edge_density: float
+    alpha_profile: str
+
+    def to_dict(self) -> dict:
+        """返回可序列化的分析结果"""
+        return {
+            'content_class': self.content_class.name,
+            'encoding_mode': self.encoding_mode.name,
+            'unique_colors': self.unique_colors,
+            'flat_ratio': round(self.flat_ratio, 4),
+            'edge_density': round(self.edge_density, 4),
+            'alpha_profile': self.alpha_profile,
+        }
+
+
+class ContentClassifier:
+    """基于统计特征的快速内容分类器"""
+
+    # 分析使用的缩略图最长边
+    SAMPLE_SIZE = 256
+    # 颜色数不超过该值视为图形(可无损调色板编码)
+    GRAPHIC_MAX_COLORS = 256
+    # 截图允许无损编码的最大颜色数(抗锯齿文字会产生少量过渡色);
+    # 透明通道只有0/255的抠图在该颜色数内同样视为图形
+    SCREENSHOT_MAX_COLORS = 4096
+    # 相邻像素完全相同的比例达到该值视为大面积平坦区域
+    SCREENSHOT_MIN_FLAT_RATIO = 0.6
+    # 截图至少包含的强边缘比例(文字、控件边框)
+    SCREENSHOT_MIN_EDGE_DENSITY = 0.02
+    # 强边缘比例超过该值视为抖动或噪声纹理,无损编码收益低,按照片处理
+    LOSSLESS_MAX_EDGE_DENSITY = 0.25
+    # 边缘检测中视为"强边缘"的梯度阈值
+    EDGE_THRESHOLD = 32
+
+    # 无损编码的压缩努力程度(Pillow在lossless模式下用quality表示)
+    LOSSLESS_EFFORT = 80
+    # 近无损(高质量有损)编码的最低quality
+    NEAR_LOSSLESS_QUALITY = 90
+
+    def __init__(self):
+        self.alpha_optimizer = AlphaOptimizer()
+
+    def analyze(self, img: Image.Image) -> ContentAnalysis:
+        """
+        分析图片内容
+
+        Args:
+            img: 已解码的Pillow图片对象(任意模式)
+
+        Returns:
+            ContentAnalysis分析结果
+        """
+        sample = self._downsample(img)
+        rgb = sample.convert('RGB')
+
+        colors = rgb.getcolors(maxcolors=self.SCREENSHOT_MAX_COLORS)
+        unique_colors = len(colors) if colors is not None else self.SCREENSHOT_MAX_COLORS + 1
+
+        edges = rgb.convert('L').filter(ImageFilter.FIND_EDGES).histogram()
+        pixel_count = sum(edges) or 1
+        flat_ratio = edges[0] / pixel_count
+        edge_density = sum(edges[self.EDGE_THRESHOLD:]) / pixel_count
+
+        alpha_profile = self.alpha_optimizer.analyze(sample)
+
+        # 抖动/噪声纹理的颜色数可能很少(如256色抖动照片),但无损编码效果差
+        textured = edge_density > self.LOSSLESS_MAX_EDGE_DENSITY
+        hard_cutout = (
+            alpha_profile == AlphaProfile.BINARY
+            and unique_colors <= self.SCREENSHOT_MAX_COLORS
+        )
+
+        if not textured and (unique_colors <= self.GRAPHIC_MAX_COLORS or hard_cutout):
+            content_class = ContentClass.GRAPHIC
+            encoding_mode = EncodingMode.LOSSLESS
+        elif (
+            not textured
+            and flat_ratio >= self.SCREENSHOT_MIN_FLAT_RATIO
+            and edge_density >= self.SCREENSHOT_MIN_EDGE_DENSITY
+        ):
+            content_class = ContentClass.SCREENSHOT
+            encoding_mode = (
+                EncodingMode.LOSSLESS if unique_colors <= self.SCREENSHOT_MAX_COLORS
+                else EncodingMode.NEAR_LOSSLESS
+            )
+        else:
+            content_class = ContentClass.PHOTO
+            encoding_mode = EncodingMode.LOSSY
+
+        return ContentAnalysis(
+            content_class=content_class,
+            encoding_mode=encoding_mode,
+            unique_colors=unique_colors,
+            flat_ratio=flat_ratio,
+            edge_density=edge_density,
+            alpha_profile=alpha_profile.value,
+        )
+
+    def apply(
+        self,
+        img: Image.Image,
+        analysis: ContentAnalysis,
+        save_params: dict
+    ) -> tuple[Image.Image, dict]:
+        """
+        按分析结果调整待编码图片和保存参数
+
+        近无损模式: Pillow未开放libwebp的near_lossless参数,这里用不低于
+        NEAR_LOSSLESS_QUALITY的有损编码代替(不做调色板量化,避免可见的色彩损失)。
+
+        Args:
+            img: 已准备好的图片对象
+            analysis: analyze()的结果
+            save_params: 有损编码的保存参数
+
+        Returns:
+            (待编码图片, 新的保存参数)
+        """
+        if analysis.encoding_mode == EncodingMode.LOSSY:
+            return img, save_params
+
+        if analysis.encoding_mode == EncodingMode.NEAR_LOSSLESS:
+            quality = max(save_params.get('quality', 0), self.NEAR_LOSSLESS_QUALITY)
+            return img, {**save_params, 'quality': quality}
+
+        return img, {**save_params, 'lossless': True, 'quality': self.LOSSLESS_EFFORT}
+
+    def _downsample(self, img: Image.Image) -> Image.Image:
+        """最近邻缩小,保留原始颜色值(不产生插值色)"""
+        scale = self.SAMPLE_SIZE / max(img.size)
+        if scale >= 1:
+            return img
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        return img.resize(size, Image.Resampling.NEAREST)
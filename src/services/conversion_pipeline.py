@@ -0,0 +1,279 @@
+"""
+分阶段转换流水线
+
+将批量转换拆成 读取 → 解码/编码 → 写入 三个阶段: I/O线程预读输入文件、写出
+WebP,CPU线程只做解码和编码。阶段之间用有界队列连接,下游处理不过来时上游
+在put处阻塞(背压),预读的数据量因此有上限。每个阶段记录忙碌时间、等待输入
+时间和被下游阻塞的时间,每个队列记录深度采样,用于判断瓶颈所在。
+"""
+
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+from src.models.conversion_task import ConversionTask
+
+if TYPE_CHECKING:
+    from src.services.converter_service import ConversionResult
+
+
+# 队列结束标记
+_DONE = object()
+
+
+@dataclass
+class QueueMetrics:
+    """队列深度统计"""
+    capacity: int
+    samples: int = 0
+    depth_total: int = 0
+    max_depth: int = 0
+
+    def record(self, depth: int) -> None:
+        """记录一次深度采样"""
+        self.samples += 1
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    @property
+    def mean_depth(self) -> float:
+        """平均深度"""
+        return self.depth_total / self.samples if self.samples else 0.0
+
+    def to_dict(self) -> dict:
+        """返回可序列化的统计"""
+        return {
+            'capacity': self.capacity,
+            'mean_depth': round(self.mean_depth, 3),
+            'max_depth': self.max_depth,
+        }
+
+
+@dataclass
+class StageMetrics:
+    """阶段耗时统计(各线程累加)"""
+    workers: int
+    items: int = 0
+    busy: float = 0.0
+    # 等待上游队列有数据的时间(阶段饥饿)
+    starved: float = 0.0
+    # 等待下游队列有空位的时间(被背压阻塞)
+    blocked: float = 0.0
+
+    def to_dict(self) -> dict:
+        """返回可序列化的统计"""
+        return {
+            'workers': self.workers,
+            'items': self.items,
+            'busy': round(self.busy, 6),
+            'starved': round(self.starved, 6),
+            'blocked': round(self.blocked, 6),
+        }
+
+
+@dataclass
+class PipelineMetrics:
+    """流水线运行统计"""
+    stages: dict[str, StageMetrics] = field(default_factory=dict)
+    queues: dict[str, QueueMetrics] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    @property
+    def bottleneck(self) -> Optional[str]:
+        """单线程平均忙碌时间最长的阶段"""
+        if not self.stages:
+            return None
+        return max(
+            self.stages,
+            key=lambda name: self.stages[name].busy / self.stages[name].workers
+        )
+
+    def get_summary(self) -> dict:
+        """返回统计摘要"""
+        return {
+            'wall_time': round(self.wall_time, 3),
+            'bottleneck': self.bottleneck,
+            'stages': {name: stage.to_dict() for name, stage in self.stages.items()},
+            'queues': {name: q.to_dict() for name, q in self.queues.items()},
+        }
+
+
+class ConversionPipeline:
+    """读取/转换/写入三阶段流水线"""
+
+    def __init__(
+        self,
+        cpu_workers: int = 3,
+        io_workers: int = 2,
+        queue_size: int = 4,
+        max_prefetch_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        初始化流水线
+
+        Args:
+            cpu_workers: 解码/编码线程数
+            io_workers: 读取线程数与写入线程数(各io_workers个)
+            queue_size: 阶段之间队列的容量
+            max_prefetch_bytes: 单个文件预读的上限,更大的文件(通常需要分块
+                流式处理)由转换阶段直接从磁盘打开
+        """
+        self.cpu_workers = max(1, cpu_workers)
+        self.io_workers = max(1, io_workers)
+        self.queue_size = max(1, queue_size)
+        self.max_prefetch_bytes = max_prefetch_bytes
+        self.metrics = PipelineMetrics()
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        items: list[tuple[int, ConversionTask]],
+        convert: Callable[[int, ConversionTask, Optional[bytes]], "ConversionResult"],
+        on_result: Callable[[int, "ConversionResult"], None],
+        stop_event: Optional[threading.Event] = None
+    ) -> None:
+        """
+        运行流水线
+
+        Args:
+            items: (任务索引, 任务)列表,按此顺序读取
+            convert: 转换函数(索引, 任务, 预读的文件内容或None),
+                应以defer_write=True调用convert_image
+            on_result: 结果回调(索引, 结果),在输出写盘后调用
+            stop_event: 取消标志,设置后不再读取新任务
+        """
+        start = time.perf_counter()
+        self.metrics = PipelineMetrics(
+            stages={
+                'read': StageMetrics(self.io_workers),
+                'convert': StageMetrics(self.cpu_workers),
+                'write': StageMetrics(self.io_workers),
+            },
+            queues={
+                'read': QueueMetrics(self.queue_size),
+                'write': QueueMetrics(self.queue_size),
+            },
+        )
+        pending = iter(items)
+        read_queue = queue.Queue(self.queue_size)
+        write_queue = queue.Queue(self.queue_size)
+
+        def next_item():
+            with self._lock:
+                if stop_event and stop_event.is_set():
+                    return None
+                return next(pending, None)
+
+        def reader():
+            while (item := next_item()) is not None:
+                index, task = item
+                busy_start = time.perf_counter()
+                data = self._prefetch(task.input_file.file_path, task.input_file.file_size)
+                self._account('read', busy=time.perf_counter() - busy_start, counted=True)
+                self._put(read_queue, 'read', (index, task, data))
+
+        def converter():
+            while (item := self._get(read_queue, 'read', 'convert')) is not _DONE:
+                index, task, data = item
+                busy_start = time.perf_counter()
+                try:
+                    result = convert(index, task, data)
+                except Exception as e:
+                    # 转换线程不能退出,否则上游队列满后读取线程永久阻塞
+                    from src.services.converter_service import ConversionResult
+                    result = ConversionResult(success=False, error_message=f"转换失败: {e}")
+                self._account('convert', busy=time.perf_counter() - busy_start)
+                self._put(write_queue, 'convert', (index, result))
+
+        def writer():
+            while (item := self._get(write_queue, 'write', 'write')) is not _DONE:
+                index, result = item
+                busy_start = time.perf_counter()
+                try:
+                    result = self._write(result)
+                except Exception as e:
+                    # 写入线程同样不能退出,否则转换线程在写队列满后永久阻塞
+                    result = replace(
+                        result, success=False, output_data=None, error_message=f"写入输出失败: {e}"
+                    )
+                self._account('write', busy=time.perf_counter() - busy_start)
+                try:
+                    on_result(index, result)
+                except Exception as e:
+                    print(f"[PIPELINE] 处理结果失败: {e}", file=sys.stderr)
+
+        readers = self._start(reader, self.io_workers)
+        converters = self._start(converter, self.cpu_workers)
+        writers = self._start(writer, self.io_workers)
+
+        self._join(readers)
+        for _ in converters:
+            read_queue.put(_DONE)
+        self._join(converters)
+        for _ in writers:
+            write_queue.put(_DONE)
+        self._join(writers)
+        self.metrics.wall_time = time.perf_counter() - start
+
+    def _prefetch(self, file_path: Path, file_size: int) -> Optional[bytes]:
+        """读入整个输入文件;超过预读上限或读取失败时返回None(由转换阶段处理)"""
+        if file_size > self.max_prefetch_bytes:
+            return None
+        try:
+            return Path(file_path).read_bytes()
+        except OSError:
+            return None
+
+    def _write(self, result):
+        """写出延迟写入的WebP字节,写盘失败时返回失败结果"""
+        if result.output_data is None:
+            return result
+        write_start = time.perf_counter()
+        try:
+            with open(result.output_path, 'wb') as f:
+                f.write(result.output_data)
+        except OSError as e:
+            return replace(
+                result, success=False, output_data=None, error_message=f"写入输出失败: {e}"
+            )
+        stage_timings = {
+            **(result.stage_timings or {}),
+            'write': round(time.perf_counter() - write_start, 6),
+        }
+        return replace(result, output_data=None, stage_timings=stage_timings)
+
+    def _put(self, target: queue.Queue, stage: str, item) -> None:
+        wait_start = time.perf_counter()
+        target.put(item)
+        self._account(stage, blocked=time.perf_counter() - wait_start)
+
+    def _get(self, source: queue.Queue, queue_name: str, stage: str):
+        with self._lock:
+            self.metrics.queues[queue_name].record(source.qsize())
+        wait_start = time.perf_counter()
+        item = source.get()
+        self._account(stage, starved=time.perf_counter() - wait_start, counted=item is not _DONE)
+        return item
+
+    def _account(self, stage: str, busy=0.0, starved=0.0, blocked=0.0, counted=False) -> None:
+        with self._lock:
+            metrics = self.metrics.stages[stage]
+            metrics.busy += busy
+            metrics.starved += starved
+            metrics.blocked += blocked
+            if counted:
+                metrics.items += 1
+
+    def _start(self, target: Callable, count: int) -> list[threading.Thread]:
+        threads = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _join(self, threads: list[threading.Thread]) -> None:
+        for thread in threads:
+            thread.join()
@@ -4,17 +4,43 @@ WebP转换服务
 提供图片到WebP格式的转换功能,支持质量控制、元数据保留和取消机制。
 """
 
+import io
 import time
 import threading
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from typing import Optional, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image, UnidentifiedImageError
 
 from src.models.image_file import ImageFile
 from src.models.conversion_task import ConversionTask, TaskStatus
+from src.models.encoder_profile import EncoderProfile
+from src.models.output_policy import OutputPolicy, OutputOutcome, FallbackAction
+from src.models.alpha_policy import AlphaPolicy
+from src.models.animation_policy import AnimationPolicy
+from src.models.tiling_policy import TilingPolicy, TileMode
+from src.models.metadata_policy import MetadataPolicy
+from src.models.io_policy import IOPolicy
+from src.models.scheduling_policy import SchedulingPolicy
+from src.services.file_service import FileService
 from src.services.metadata_service import MetadataService
+from src.services.content_classifier import ContentClassifier, ContentClass
+from src.services.alpha_optimizer import AlphaOptimizer, AlphaProfile
+from src.services.animation_encoder import AnimationEncoder
+from src.services.tiled_converter import TiledConverter
+from src.services.color_manager import ColorManager
+from src.services.dedup_service import DedupService
+from src.services.pixel_cache import PixelCache
+from src.services.conversion_pipeline import ConversionPipeline, PipelineMetrics
+from src.services.decode_guard import DecodeGuard, DecodeVerdict, MemoryBudget
+from src.services.deadline_controller import DeadlineController
+from src.services.task_scheduler import TaskScheduler
+from src.services.cost_model import CostModel
+from src.utils.image_open import open_image
+from src.utils.exif_ifd import get_orientation
+from src.utils.file_access import map_file, prefetch, release
+from src.utils.raw_bitmap import map_raw_image
 
 
 @dataclass
@@ -26,13 +52,48 @@ class ConversionResult:
     compression_ratio: Optional[float] = None
     duration: float = 0.0
     error_message: Optional[str] = None
+    encode_params: Optional[dict] = None
+    outcome: Optional[OutputOutcome] = None
+    stage_timings: Optional[dict] = None
+    savings: Optional[dict] = None
+    # defer_write时尚未写盘的WebP字节
+    output_data: Optional[bytes] = field(default=None, repr=False)
 
 
 class ConverterService:
     """WebP转换服务"""
 
+    # 调色板实际使用颜色数不超过该值时优先无损编码(图标、线条图);
+    # 用满调色板的图片多为抖动到256色的照片,按quality有损编码
+    PALETTE_LOSSLESS_MAX_COLORS = 64
+
+    # 需要缩放到8位的高位深模式(直接交给编码器会被截断到0-255)
+    HIGH_BIT_DEPTH_MODES = ('I;16', 'I;16B', 'I;16L', 'I', 'F')
+
+    # EXIF方向值 -> 转正所需的无损变换(与ImageOps.exif_transpose一致)
+    ORIENTATION_TRANSPOSES = {
+        2: Image.Transpose.FLIP_LEFT_RIGHT,
+        3: Image.Transpose.ROTATE_180,
+        4: Image.Transpose.FLIP_TOP_BOTTOM,
+        5: Image.Transpose.TRANSPOSE,
+        6: Image.Transpose.ROTATE_270,
+        7: Image.Transpose.TRANSVERSE,
+        8: Image.Transpose.ROTATE_90,
+    }
+
     def __init__(self):
         self.metadata_service = MetadataService()
+        self.file_service = FileService()
+        self.content_classifier = ContentClassifier()
+        self.alpha_optimizer = AlphaOptimizer()
+        self.animation_encoder = AnimationEncoder()
+        self.tiled_converter = TiledConverter()
+        self.decode_guard = DecodeGuard()
+        self.color_manager = ColorManager()
+        self.dedup_service = DedupService()
+        self.task_scheduler = TaskScheduler()
+        # 最近一次流水线模式批量转换的统计
+        self.pipeline_metrics: Optional[PipelineMetrics] = None
 
     def convert_image(
         self,
@@ -40,7 +101,22 @@ class ConverterService:
         output_path: Path,
         quality: int,
         preserve_metadata: bool = True,
-        stop_event: Optional[threading.Event] = None
+        stop_event: Optional[threading.Event] = None,
+        encoder_profile: EncoderProfile = EncoderProfile.BALANCED,
+        time_budget: Optional[float] = None,
+        method: Optional[int] = None,
+        output_policy: Optional[OutputPolicy] = None,
+        content_routing: bool = False,
+        alpha_policy: Optional[AlphaPolicy] = None,
+        animation_policy: Optional[AnimationPolicy] = None,
+        tiling_policy: Optional[TilingPolicy] = None,
+        metadata_policy: MetadataPolicy = MetadataPolicy.KEEP_ALL,
+        normalize_orientation: bool = False,
+        convert_to_srgb: bool = False,
+        pixel_cache: Optional[PixelCache] = None,
+        source: Optional[bytes] = None,
+        defer_write: bool = False,
+        io_policy: Optional[IOPolicy] = None
     ) -> ConversionResult:
         """
         将单张图片转换为WebP格式
@@ -51,11 +127,45 @@ class ConverterService:
             quality: 质量参数 (0-100)
             preserve_metadata: 是否保留元数据
             stop_event: 取消标志
+            encoder_profile: 编码器速度档位,AUTO按像素数自动选择method
+            time_budget: AUTO档位的单图编码时间预算(秒)
+            method: 显式指定method(0-6),优先于encoder_profile
+            output_policy: 输出策略,WebP不够小时尝试无损或保留/链接原图;
+                所有候选均在内存中编码,只写一次磁盘
+            content_routing: 按内容分类自动选择编码方式
+                (照片→有损, 截图→无损或高质量有损, 图形→无损);
+                未启用时调色板图片(颜色数不超过PALETTE_LOSSLESS_MAX_COLORS)默认无损
+            alpha_policy: 透明通道策略,默认丢弃全不透明的透明通道
+            animation_policy: 动画策略,默认将多帧图片逐帧流式编码为动画WebP
+                并丢弃重复帧
+            tiling_policy: 分块策略,超出WebP尺寸上限(或像素上限)的图片按条带
+                读取并拆分为分块或缩小,不再整张解码后在保存时失败;
+                解码成本超出decode_guard上限的图片按文件头拒绝或强制分块
+            metadata_policy: 保留元数据时的过滤策略(在EXIF IFD层面去除缩略图、
+                GPS等),节省的字节数记录在savings['metadata']
+            normalize_orientation: 按EXIF方向标签转正像素并将标签重置为1
+                (方向为1时不做任何处理;动画和分块输出不处理)
+            convert_to_srgb: 按内嵌ICC配置文件将像素转换到sRGB并丢弃配置文件,
+                变换按(配置文件哈希, 颜色模式)在服务实例内缓存复用
+            pixel_cache: 像素内容缓存。像素和编码参数相同的图片跳过编码,
+                只重写元数据块(动画不使用缓存)
+            source: 已预读的输入文件内容,提供时从内存解码而不再读盘
+            defer_write: 不写输出文件,WebP字节放在结果的output_data中
+                (由流水线的I/O阶段写盘;链接原图等非WebP输出仍直接处理)
+            io_policy: 输入读取策略。大文件用mmap映射后解码,处理完后按策略
+                释放输入文件的页缓存
 
         Returns:
-            ConversionResult对象
+            ConversionResult对象,encode_params记录实际使用的编码参数,
+            outcome记录输出结果类型,stage_timings记录各阶段耗时
         """
         start_time = time.time()
+        if alpha_policy is None:
+            alpha_policy = AlphaPolicy()
+        if animation_policy is None:
+            animation_policy = AnimationPolicy()
+        if tiling_policy is None:
+            tiling_policy = TilingPolicy()
 
         # 检查取消标志
         if stop_event and stop_event.is_set():
@@ -82,12 +192,36 @@ class ConverterService:
                 duration=time.time() - start_time
             )
 
+        mapped = None
         try:
             import sys
+            # 读取像素前按文件头检查解码成本
+            decode_check = self.decode_guard.check(input_file.file_path)
+            if decode_check.verdict == DecodeVerdict.REJECT:
+                return ConversionResult(
+                    success=False,
+                    error_message=decode_check.message,
+                    duration=time.time() - start_time
+                )
+            if decode_check.verdict == DecodeVerdict.TILE:
+                tiling_policy = replace(tiling_policy, max_pixels=decode_check.pixel_limit)
+
             print(f"[CONVERT] 打开图片: {input_file.file_path}", file=sys.stderr)
 
+            # 大文件用mmap映射后解码(需要分块流式读取的图片仍按路径打开)
+            header = decode_check.header
+            if (
+                source is None
+                and io_policy is not None
+                and io_policy.use_mmap(input_file.file_size)
+                and not (header and tiling_policy.requires_tiling(header.width, header.height))
+            ):
+                mapped = map_file(input_file.file_path)
+                source = mapped
+
             # 打开图片
-            with Image.open(input_file.file_path) as img:
+            stage_timings = {}
+            with open_image(input_file.file_path, source) as img:
                 print(f"[CONVERT] 图片已打开: {img.mode}, {img.size}", file=sys.stderr)
 
                 # 检查取消标志
@@ -98,33 +232,153 @@ class ConverterService:
                         duration=time.time() - start_time
                     )
 
-                # 提取元数据
+                # 超出尺寸/像素上限时按条带分块处理(此时尚未解码像素)
+                if tiling_policy.requires_tiling(img.width, img.height):
+                    return self._convert_tiled(
+                        img, input_file, output_path, quality, preserve_metadata,
+                        encoder_profile, time_budget, method, tiling_policy, start_time,
+                        metadata_policy
+                    )
+
+                # 解码像素数据(mmap打开的未压缩BMP直接从映射构造,跳过解码器)
+                stage_start = time.perf_counter()
+                pixels = None
+                if mapped is not None and img.format == 'BMP':
+                    pixels = map_raw_image(img, mapped)
+                if pixels is not None:
+                    img = pixels
+                else:
+                    img.load()
+                source_mode = img.mode
+                stage_timings['decode'] = time.perf_counter() - stage_start
+
+                # 提取元数据并按策略过滤
                 metadata = None
+                savings = {}
                 if preserve_metadata:
                     print(f"[CONVERT] 提取元数据...", file=sys.stderr)
                     metadata = self.metadata_service.extract_metadata(img)
                     print(f"[CONVERT] 元数据提取完成", file=sys.stderr)
+                    if metadata_policy != MetadataPolicy.KEEP_ALL:
+                        stage_start = time.perf_counter()
+                        filtered = self.metadata_service.apply_policy(metadata, metadata_policy)
+                        stage_timings['metadata'] = time.perf_counter() - stage_start
+                        saved = metadata.byte_size - filtered.byte_size
+                        if saved:
+                            savings['metadata'] = {'bytes': saved}
+                        metadata = filtered
+
+                # 多帧图片保留源对象,编码时逐帧读取
+                animated = getattr(img, 'is_animated', False) and animation_policy.animate
+                frames = img
+
+                # 按EXIF方向转正像素(方向为1时跳过)
+                orientation = 1
+                if normalize_orientation and not animated:
+                    orientation = get_orientation(img.info.get('exif'))
+                    if orientation != 1:
+                        stage_start = time.perf_counter()
+                        img = self.apply_orientation(img, orientation)
+                        if metadata is not None:
+                            metadata = self.metadata_service.reset_orientation(metadata)
+                        stage_timings['orientation'] = time.perf_counter() - stage_start
+
+                # 低色数调色板图片优先无损编码
+                palette_lossless = (
+                    source_mode == 'P'
+                    and not content_routing
+                    and self._palette_usage(img)[0] <= self.PALETTE_LOSSLESS_MAX_COLORS
+                )
+
+                # 转换为WebP编码器支持的颜色模式
+                icc_profile = img.info.get('icc_profile')
+                img = self.prepare_image(img)
+
+                # CMYK配置文件已在prepare_image中用于转换,不能再附加到RGB输出上
+                if source_mode == 'CMYK' and icc_profile:
+                    icc_profile = None
+                    if metadata is not None and metadata.icc_profile:
+                        metadata = replace(metadata, icc_profile=None)
 
-                # 转换为RGB模式(WebP不支持P模式)
-                if img.mode in ('P', 'RGBA', 'LA'):
-                    print(f"[CONVERT] 转换颜色模式: {img.mode}", file=sys.stderr)
-                    if img.mode == 'P':
-                        img = img.convert('RGB')
-                    elif img.mode in ('RGBA', 'LA'):
-                        # 保留透明度
-                        pass
+                # ICC配置文件转换到sRGB后丢弃配置文件
+                color_converted = False
+                if convert_to_srgb and icc_profile and not animated:
+                    stage_start = time.perf_counter()
+                    converted = self.color_manager.to_srgb(img, icc_profile)
+                    stage_timings['color'] = time.perf_counter() - stage_start
+                    color_converted = converted is not img
+                    img = converted
+                    # 只有像素已转换到sRGB(或本来就是sRGB)时才能丢弃配置文件;
+                    # 模式不支持或配置文件无法使用时保留,像素仍在源色彩空间中
+                    droppable = color_converted or self.color_manager.is_srgb(icc_profile)
+                    if droppable and metadata is not None and metadata.icc_profile:
+                        savings['color'] = {'bytes': len(metadata.icc_profile)}
+                        metadata = replace(metadata, icc_profile=None)
 
                 # 准备保存参数
-                # method=4是质量和速度的平衡点（0-6，6最慢但质量最好）
-                # 对于大文件使用method=4避免过长等待时间
+                # method由编码档位决定(0-6,6最慢但文件最小)
+                if method is None:
+                    method = encoder_profile.resolve_method(
+                        input_file.width * input_file.height, time_budget
+                    )
                 save_params = {
-                    'format': 'WEBP',
                     'quality': quality,
-                    'method': 4  # 平衡质量和速度
+                    'method': method
+                }
+                encode_params = {
+                    'profile': encoder_profile.name,
+                    'quality': quality,
+                    'method': method,
                 }
+                if orientation != 1:
+                    encode_params['orientation'] = orientation
+                if color_converted:
+                    encode_params['color_space'] = 'sRGB'
+                if palette_lossless:
+                    save_params.update({
+                        'lossless': True,
+                        'quality': self.content_classifier.LOSSLESS_EFFORT,
+                    })
+                    encode_params.update({'lossless': True, 'quality': save_params['quality']})
                 print(f"[CONVERT] 保存参数: {save_params}", file=sys.stderr)
 
+                # 透明通道快速路径(动画各帧透明度不同,不做单帧优化)
+                alpha_source = img
+                alpha_dropped = False
+                if not animated:
+                    stage_start = time.perf_counter()
+                    img, alpha_profile, alpha_params = self.alpha_optimizer.optimize(
+                        img, alpha_policy
+                    )
+                    alpha_dropped = img is not alpha_source
+                    save_params.update(alpha_params)
+                    if alpha_profile != AlphaProfile.NONE:
+                        stage_timings['alpha'] = time.perf_counter() - stage_start
+                        encode_params['alpha_profile'] = alpha_profile.value
+                        encode_params['alpha_dropped'] = alpha_dropped
+                        encode_params.update(alpha_params)
+
+                # 确定动画保留帧
+                if animated:
+                    stage_start = time.perf_counter()
+                    animation_plan = self.animation_encoder.plan(frames, animation_policy)
+                    stage_timings['frames'] = time.perf_counter() - stage_start
+                    encode_params.update(animation_plan.to_dict())
+
+                # 按内容类型选择有损/近无损/无损编码
+                if content_routing and not animated:
+                    analysis = self.content_classifier.analyze(img)
+                    img, save_params = self.content_classifier.apply(img, analysis, save_params)
+                    encode_params.update({
+                        'quality': save_params['quality'],
+                        'lossless': save_params.get('lossless', False),
+                        'content_class': analysis.content_class.name,
+                        'encoding_mode': analysis.encoding_mode.name,
+                    })
+                    print(f"[CONVERT] 内容分类: {analysis.to_dict()}", file=sys.stderr)
+
                 # 嵌入元数据
+                metadata_params = {}
                 if preserve_metadata and metadata and metadata.has_metadata:
                     print(f"[CONVERT] 嵌入元数据...", file=sys.stderr)
                     metadata_params = self.metadata_service.embed_metadata(metadata)
@@ -138,13 +392,81 @@ class ConverterService:
                         duration=time.time() - start_time
                     )
 
-                # 保存为WebP
+                # 像素内容缓存: 命中时跳过编码,只写入当前图片的元数据块
+                cache_key = None
+                data = None
+                if pixel_cache is not None and not animated:
+                    stage_start = time.perf_counter()
+                    cache_key = pixel_cache.key(img, save_params)
+                    data = pixel_cache.lookup(cache_key, metadata_params)
+                    stage_timings['cache'] = time.perf_counter() - stage_start
+                    encode_params['pixel_cache'] = 'miss' if data is None else 'hit'
+
+                # 在内存中编码WebP
+                stage_start = time.perf_counter()
+                if animated:
+                    def encode(**params) -> bytes:
+                        return self.animation_encoder.encode(frames, animation_plan, **params)
+                else:
+                    def encode(**params) -> bytes:
+                        return self.encode_to_bytes(img, **params)
+                if data is None:
+                    data = encode(**save_params)
+                    if cache_key is not None:
+                        pixel_cache.put(cache_key, data)
+                outcome = (
+                    OutputOutcome.WEBP_LOSSLESS if save_params.get('lossless')
+                    else OutputOutcome.WEBP_LOSSY
+                )
+                encode_time = time.perf_counter() - stage_start
+                encoded_size = len(data)
+
+                # 应用输出策略
+                if output_policy and not output_policy.accepts(len(data), input_file.file_size):
+                    data, outcome = self._apply_output_policy(
+                        img, data, save_params, input_file, source_mode, output_policy,
+                        encode=encode
+                    )
+                    encode_params['lossless'] = outcome == OutputOutcome.WEBP_LOSSLESS
+                stage_timings['encode'] = time.perf_counter() - stage_start
+
+                # 测量丢弃透明通道节省的字节数和编码时间(不计入encode阶段)
+                if alpha_policy.measure_savings and alpha_dropped:
+                    baseline_start = time.perf_counter()
+                    baseline = self.encode_to_bytes(alpha_source, **save_params)
+                    savings['alpha'] = {
+                        'bytes': len(baseline) - encoded_size,
+                        'seconds': round(time.perf_counter() - baseline_start - encode_time, 6),
+                    }
+
+            # 写入输出(延迟写入时由调用方的I/O阶段写盘)
+            stage_start = time.perf_counter()
+            output_data = None
+            if data is not None and defer_write:
+                output_data = data
+                output_size = len(data)
+            elif data is not None:
                 print(f"[CONVERT] 开始保存WebP: {output_path}", file=sys.stderr)
-                img.save(output_path, **save_params)
+                with open(output_path, 'wb') as f:
+                    f.write(data)
                 print(f"[CONVERT] WebP保存完成", file=sys.stderr)
+                output_size = len(data)
+            elif outcome == OutputOutcome.ORIGINAL_LINKED:
+                # 输出目录即输入目录时目标就是原图本身,按保留原图处理;
+                # 同名的其他文件不覆盖,自动重命名
+                output_path, link_method = self.file_service.link_or_copy_unique(
+                    input_file.file_path, output_path.with_suffix(input_file.file_path.suffix)
+                )
+                if link_method == "same":
+                    outcome = OutputOutcome.ORIGINAL_KEPT
+                output_size = input_file.file_size
+            else:
+                output_path = input_file.file_path
+                output_size = input_file.file_size
+            if output_data is None:
+                stage_timings['write'] = time.perf_counter() - stage_start
 
-            # 计算输出文件大小和压缩比
-            output_size = output_path.stat().st_size
+            # 计算压缩比
             compression_ratio = (1 - output_size / input_file.file_size) * 100
 
             duration = time.time() - start_time
@@ -154,7 +476,12 @@ class ConverterService:
                 output_path=output_path,
                 output_size=output_size,
                 compression_ratio=round(compression_ratio, 2),
-                duration=duration
+                duration=duration,
+                encode_params=encode_params,
+                outcome=outcome,
+                stage_timings={k: round(v, 6) for k, v in stage_timings.items()},
+                savings=savings or None,
+                output_data=output_data
             )
 
         except FileNotFoundError:
@@ -199,13 +526,333 @@ class ConverterService:
                 error_message=f"转换失败: {str(e)}",
                 duration=time.time() - start_time
             )
+        finally:
+            if mapped is not None:
+                try:
+                    mapped.close()
+                except BufferError:
+                    # 零复制图片仍引用映射内存,函数返回后随图片一起释放
+                    pass
+            if io_policy is not None and io_policy.drop_cache:
+                release(input_file.file_path)
+
+    def _convert_tiled(
+        self,
+        img: Image.Image,
+        input_file: ImageFile,
+        output_path: Path,
+        quality: int,
+        preserve_metadata: bool,
+        encoder_profile: EncoderProfile,
+        time_budget: Optional[float],
+        method: Optional[int],
+        tiling_policy: TilingPolicy,
+        start_time: float,
+        metadata_policy: MetadataPolicy = MetadataPolicy.KEEP_ALL
+    ) -> ConversionResult:
+        """
+        分块转换超出尺寸/像素上限的图片
+
+        Args:
+            img: 已打开但尚未解码的图片对象
+            input_file: 输入图片文件对象
+            output_path: 输出WebP文件路径
+            quality: 质量参数
+            preserve_metadata: 是否在每个分块中保留元数据
+            encoder_profile: 编码器速度档位
+            time_budget: AUTO档位的时间预算
+            method: 显式指定的method
+            tiling_policy: 分块策略
+            start_time: 转换开始时间
+            metadata_policy: 元数据过滤策略
+
+        Returns:
+            ConversionResult,SPLIT模式的output_path为分块清单文件
+        """
+        import sys
+        print(f"[CONVERT] 分块处理: {img.size}, {tiling_policy.mode.name}", file=sys.stderr)
+
+        if method is None:
+            method = encoder_profile.resolve_method(img.width * img.height, time_budget)
+        save_params = {'quality': quality, 'method': method}
+        if preserve_metadata:
+            metadata = self.metadata_service.apply_policy(
+                self.metadata_service.extract_metadata(img), metadata_policy
+            )
+            if metadata and metadata.has_metadata:
+                save_params.update(self.metadata_service.embed_metadata(metadata))
+
+        stage_start = time.perf_counter()
+        tiled = self.tiled_converter.convert(img, output_path, tiling_policy, **save_params)
+        tile_time = time.perf_counter() - stage_start
+
+        return ConversionResult(
+            success=True,
+            output_path=tiled.output_path,
+            output_size=tiled.output_size,
+            compression_ratio=round((1 - tiled.output_size / input_file.file_size) * 100, 2),
+            duration=time.time() - start_time,
+            encode_params={
+                'profile': encoder_profile.name,
+                'quality': quality,
+                'method': method,
+                'tile_mode': tiled.mode.name,
+                'tiles': len(tiled.tiles),
+                'streamed': tiled.streamed,
+                'output_width': tiled.output_width,
+                'output_height': tiled.output_height,
+            },
+            outcome=OutputOutcome.WEBP_LOSSY,
+            stage_timings={'tiles': round(tile_time, 6)}
+        )
+
+    def prepare_image(self, img: Image.Image) -> Image.Image:
+        """
+        将图片转换为WebP编码器支持的颜色模式
+
+        调色板图片只在透明色确实被像素使用时转换为RGBA,否则直接转换为RGB,
+        避免先转RGBA再由透明通道快速路径丢弃透明通道的二次整帧复制。
+        CMYK图片有内嵌ICC配置文件时按配置文件转换到sRGB;
+        16位/32位整数和浮点灰度图按取值范围缩放到8位,而不是截断到255。
+
+        Args:
+            img: 已打开的Pillow图片对象
+
+        Returns:
+            可直接编码的图片对象(可能为原对象)
+        """
+        import sys
+        if img.mode == 'P':
+            _, has_transparency = self._palette_usage(img)
+            target_mode = 'RGBA' if has_transparency else 'RGB'
+            print(f"[CONVERT] 转换颜色模式: P -> {target_mode}", file=sys.stderr)
+            img = img.convert(target_mode)
+        elif img.mode == 'CMYK':
+            print(f"[CONVERT] 转换颜色模式: CMYK -> RGB", file=sys.stderr)
+            img = self._convert_cmyk(img)
+        elif img.mode in self.HIGH_BIT_DEPTH_MODES:
+            print(f"[CONVERT] 转换颜色模式: {img.mode} -> L", file=sys.stderr)
+            img = self._scale_to_8bit(img)
+        # RGB/RGBA/LA等模式由编码器直接处理,保留透明度
+        return img
+
+    def _convert_cmyk(self, img: Image.Image) -> Image.Image:
+        """
+        CMYK转RGB: 有可用的CMYK配置文件时走色彩管理(变换缓存复用);没有配置文件、
+        配置文件不是CMYK(如sRGB)或无法构建变换时用Pillow的朴素公式
+        """
+        icc_profile = img.info.get('icc_profile')
+        if icc_profile:
+            converted = self.color_manager.to_srgb(img, icc_profile)
+            if converted is not img:
+                return converted
+        return img.convert('RGB')
+
+    def _scale_to_8bit(self, img: Image.Image) -> Image.Image:
+        """
+        将高位深灰度图缩放为8位L模式
+
+        I;16按v/257查表缩放(Pillow对I;16的point使用65536项查找表);
+        I模式取值在0-255内直接转换,在0-65535内按16位缩放,否则按实际范围拉伸;
+        F模式取值在0-1内视为归一化数据乘以255,否则同样按范围处理。
+
+        Args:
+            img: I;16/I;16B/I;16L/I/F模式图片
+
+        Returns:
+            L模式图片
+        """
+        if img.mode == 'I;16':
+            return img.point(lambda v: v / 257).convert('L')
+        if img.mode != 'F':
+            img = img.convert('I')
+
+        low, high = img.getextrema()
+        if img.mode == 'F' and 0 <= low and high <= 1:
+            scale, offset = 255.0, 0.0
+        elif 0 <= low and high <= 255:
+            return img.convert('L')
+        elif 0 <= low and high <= 65535:
+            scale, offset = 1 / 257, 0.0
+        else:
+            scale = 255 / (high - low) if high > low else 0.0
+            offset = -low * scale
+        return img.point(lambda v: v * scale + offset).convert('L')
+
+    def apply_orientation(self, img: Image.Image, orientation: int) -> Image.Image:
+        """
+        按EXIF方向值无损转正图片
+
+        Args:
+            img: 已解码的Pillow图片对象
+            orientation: EXIF方向值(1-8)
+
+        Returns:
+            转正后的图片对象(方向为1或无效值时返回原对象)
+        """
+        transpose = self.ORIENTATION_TRANSPOSES.get(orientation)
+        if transpose is None:
+            return img
+        return img.transpose(transpose)
+
+    def _palette_usage(self, img: Image.Image) -> tuple[int, bool]:
+        """
+        统计调色板图片实际使用的颜色数,以及透明色是否被使用
+
+        Args:
+            img: P模式图片对象
+
+        Returns:
+            (使用的颜色数, 是否存在透明像素)
+        """
+        histogram = img.histogram()[:256]
+        used_colors = sum(1 for count in histogram if count)
+
+        transparency = img.info.get('transparency')
+        if transparency is None:
+            return used_colors, False
+        if isinstance(transparency, int):
+            return used_colors, histogram[transparency] > 0
+        # PNG调色板可为每个索引指定透明度
+        return used_colors, any(
+            count and alpha < 255 for count, alpha in zip(histogram, transparency)
+        )
+
+    def encode_to_bytes(
+        self,
+        img: Image.Image,
+        quality: int,
+        method: int = 4,
+        **params
+    ) -> bytes:
+        """
+        在内存中将图片编码为WebP,不写入磁盘
+
+        Args:
+            img: 已通过prepare_image处理的图片对象
+            quality: 质量参数 (0-100)
+            method: 编码器努力程度 (0-6)
+            **params: 其他Pillow WebP保存参数(如lossless、exif)
+
+        Returns:
+            WebP文件字节
+        """
+        buffer = io.BytesIO()
+        img.save(buffer, format='WEBP', quality=quality, method=method, **params)
+        return buffer.getvalue()
+
+    def _apply_output_policy(
+        self,
+        img: Image.Image,
+        lossy_data: bytes,
+        save_params: dict,
+        input_file: ImageFile,
+        source_mode: str,
+        policy: OutputPolicy,
+        encode: Optional[Callable[..., bytes]] = None
+    ) -> tuple[Optional[bytes], OutputOutcome]:
+        """
+        有损结果不满足输出策略时选择替代输出
+
+        Args:
+            img: 已准备好的图片对象
+            lossy_data: 有损编码结果
+            save_params: 有损编码使用的保存参数
+            input_file: 输入图片文件对象
+            source_mode: 源图片解码后的颜色模式
+            policy: 输出策略
+            encode: 按保存参数编码的函数,默认编码img(动画传入逐帧编码函数)
+
+        Returns:
+            (要写入的WebP字节或None, 输出结果类型)
+        """
+        if encode is None:
+            def encode(**params) -> bytes:
+                return self.encode_to_bytes(img, **params)
+
+        is_graphic = (
+            source_mode == 'P'
+            or self.content_classifier.analyze(img).content_class != ContentClass.PHOTO
+        )
+        if policy.try_lossless and is_graphic and not save_params.get('lossless'):
+            lossless_data = encode(**{
+                **save_params,
+                'lossless': True,
+                'quality': self.content_classifier.LOSSLESS_EFFORT,
+            })
+            if policy.accepts(len(lossless_data), input_file.file_size):
+                return lossless_data, OutputOutcome.WEBP_LOSSLESS
+
+        if policy.fallback == FallbackAction.LINK_ORIGINAL:
+            return None, OutputOutcome.ORIGINAL_LINKED
+        return None, OutputOutcome.ORIGINAL_KEPT
+
+    def _materialize_duplicate(
+        self,
+        task: ConversionTask,
+        primary_result: ConversionResult
+    ) -> ConversionResult:
+        """
+        为重复任务生成输出: 链接或复制主任务的输出,不重新解码/编码
+
+        Args:
+            task: 重复任务
+            primary_result: 内容相同的主任务的转换结果
+
+        Returns:
+            重复任务的ConversionResult,savings['dedup']记录节省的时间和磁盘字节数
+        """
+        if not primary_result.success:
+            return replace(primary_result, output_path=None, duration=0.0)
+
+        start = time.perf_counter()
+        outcome = primary_result.outcome
+        method = None
+        if outcome == OutputOutcome.ORIGINAL_KEPT:
+            output_path = task.input_file.file_path
+        elif outcome == OutputOutcome.ORIGINAL_LINKED:
+            # 与convert_image相同: 目标即重复任务的输入本身时保留原图,同名文件不覆盖
+            output_path, method = self.file_service.link_or_copy_unique(
+                task.input_file.file_path,
+                task.output_path.with_suffix(task.input_file.file_path.suffix)
+            )
+            if method == "same":
+                outcome, method = OutputOutcome.ORIGINAL_KEPT, None
+        else:
+            output_path = task.output_path
+            method = self.file_service.link_or_copy(
+                primary_result.output_path, output_path, overwrite=True
+            )
+        duration = time.perf_counter() - start
+
+        shared_bytes = primary_result.output_size if method in ('hardlink', 'reflink') else 0
+        return replace(
+            primary_result,
+            output_path=output_path,
+            outcome=outcome,
+            duration=duration,
+            encode_params={**(primary_result.encode_params or {}), 'dedup': method or 'none'},
+            stage_timings={'write': duration},
+            savings={'dedup': {
+                'seconds': round(max(0.0, primary_result.duration - duration), 6),
+                'bytes': shared_bytes or 0,
+            }},
+        )
 
     def batch_convert(
         self,
         tasks: list[ConversionTask],
         max_workers: int = 3,
         progress_callback: Optional[Callable[[int, int], None]] = None,
-        stop_event: Optional[threading.Event] = None
+        stop_event: Optional[threading.Event] = None,
+        deadline: Optional[float] = None,
+        memory_budget: Optional[int] = None,
+        dedup: bool = False,
+        pixel_cache: Optional[PixelCache] = None,
+        io_workers: Optional[int] = None,
+        io_policy: Optional[IOPolicy] = None,
+        scheduling: Optional[SchedulingPolicy] = None,
+        cost_model: Optional[CostModel] = None
     ) -> list[ConversionResult]:
         """
         批量转换多张图片
@@ -215,6 +862,22 @@ class ConverterService:
             max_workers: 最大并发数
             progress_callback: 进度回调函数 (completed_count, total_count)
             stop_event: 取消标志
+            deadline: 截止时间模式,批次可用的墙钟时间(秒)。设置后根据实测
+                吞吐量动态调整剩余任务的method,覆盖各任务的编码档位
+            memory_budget: 并发解码的内存预算(字节)。设置后按文件头估算的
+                解码内存调度任务,预算不足的任务等待其他任务完成
+            dedup: 去重模式。内容和转换参数都相同的输入只转换一次,其余任务的
+                输出用硬链接/reflink/复制得到,节省的时间记录在savings['dedup']
+            pixel_cache: 批次共享的像素内容缓存,见convert_image
+            io_workers: 流水线模式。设置后用io_workers个线程预读输入和写出输出,
+                max_workers个线程只做解码/编码,阶段之间用有界队列背压;
+                各阶段统计保存在pipeline_metrics中
+            io_policy: 输入读取策略,见convert_image;readahead>0时每个任务开始前
+                对其后readahead个任务的输入发出WILLNEED预读
+            scheduling: 调度策略,决定任务的提交顺序(默认按调用顺序);
+                SJF让首批结果更早出现,LPT避免最后提交的大图拖长整批耗时
+            cost_model: 成本模型,每个任务完成后记录其结果并增量更新拟合;
+                可同时用作scheduling的cost_estimator
 
         Returns:
             转换结果列表,与tasks顺序对应
@@ -222,65 +885,190 @@ class ConverterService:
         if not tasks:
             return []
 
+        budget = MemoryBudget(memory_budget) if memory_budget else None
+
         total_count = len(tasks)
         results = [None] * total_count  # 预分配结果列表
+
+        # 去重模式下只提交每组内容相同任务中的第一个
+        dedup_plan = None
+        pending = range(total_count)
+        if dedup:
+            import sys
+            dedup_plan = self.dedup_service.plan(tasks)
+            pending = dedup_plan.primaries
+            print(
+                f"[CONVERT] 去重: {dedup_plan.duplicate_count}/{total_count} 个重复任务,"
+                f"哈希耗时 {dedup_plan.hash_time:.3f}s",
+                file=sys.stderr
+            )
+        if scheduling is not None:
+            pending = self.task_scheduler.order(tasks, pending, scheduling)
+
+        # 截止时间按实际要编码的任务估算(重复任务只链接/复制主任务的输出)
+        deadline_controller = None
+        if deadline is not None:
+            deadline_controller = DeadlineController(
+                deadline_seconds=deadline,
+                total_pixels=sum(
+                    tasks[i].input_file.width * tasks[i].input_file.height for i in pending
+                ),
+                workers=max_workers,
+                initial_method=EncoderProfile.BALANCED.method_value
+            )
         completed_count = 0
         lock = threading.Lock()
 
-        def convert_single_task(index: int, task: ConversionTask) -> tuple[int, ConversionResult]:
-            """转换单个任务并返回索引和结果"""
+        def report_progress() -> None:
+            """完成计数加一并回调进度"""
             nonlocal completed_count
+            with lock:
+                completed_count += 1
+                if progress_callback:
+                    progress_callback(completed_count, total_count)
 
+        def run_task(
+            task: ConversionTask,
+            source: Optional[bytes] = None,
+            defer_write: bool = False
+        ) -> ConversionResult:
+            """转换单个任务(不更新进度)"""
             # 检查取消标志
             if stop_event and stop_event.is_set():
-                result = ConversionResult(
+                return ConversionResult(
                     success=False,
                     error_message="转换已取消",
                     duration=0.0
                 )
+
+            # 截止时间模式下由控制器决定method
+            method = deadline_controller.next_method() if deadline_controller else None
+
+            # 执行转换(有内存预算时先预留估计的解码内存)
+            def convert() -> ConversionResult:
+                return self.convert_image(
+                    input_file=task.input_file,
+                    output_path=task.output_path,
+                    quality=task.quality,
+                    preserve_metadata=task.preserve_metadata,
+                    stop_event=stop_event,
+                    encoder_profile=task.encoder_profile,
+                    time_budget=task.time_budget,
+                    method=method,
+                    output_policy=task.output_policy,
+                    content_routing=task.content_routing,
+                    alpha_policy=task.alpha_policy,
+                    animation_policy=task.animation_policy,
+                    tiling_policy=task.tiling_policy,
+                    metadata_policy=task.metadata_policy,
+                    normalize_orientation=task.normalize_orientation,
+                    convert_to_srgb=task.convert_to_srgb,
+                    pixel_cache=pixel_cache,
+                    source=source,
+                    defer_write=defer_write,
+                    io_policy=io_policy
+                )
+
+            if budget:
+                with budget.reserve(task.input_file.decode_bytes):
+                    result = convert()
+            else:
+                result = convert()
+
+            if deadline_controller:
+                deadline_controller.record(
+                    task.input_file.width * task.input_file.height,
+                    result.duration,
+                    method
+                )
+            return result
+
+        # 预读后续任务的输入(每个文件只提示一次)
+        order = list(pending)
+        positions = {index: position for position, index in enumerate(order)}
+        prefetched = set()
+
+        def readahead(index: int) -> None:
+            position = positions[index]
+            for upcoming in order[position + 1:position + 1 + io_policy.readahead]:
                 with lock:
-                    completed_count += 1
-                    if progress_callback:
-                        progress_callback(completed_count, total_count)
-                return index, result
-
-            # 执行转换
-            result = self.convert_image(
-                input_file=task.input_file,
-                output_path=task.output_path,
-                quality=task.quality,
-                preserve_metadata=task.preserve_metadata,
-                stop_event=stop_event
-            )
+                    if upcoming in prefetched:
+                        continue
+                    prefetched.add(upcoming)
+                prefetch(tasks[upcoming].input_file.file_path)
 
-            # 更新进度
-            with lock:
-                completed_count += 1
-                if progress_callback:
-                    progress_callback(completed_count, total_count)
+        def record_cost(task: ConversionTask, result: ConversionResult) -> None:
+            """把结果记录到成本模型(尽力而为,出错不影响批次)"""
+            if cost_model is None:
+                return
+            try:
+                cost_model.record(task, result)
+            except Exception as e:
+                import sys
+                print(f"[CONVERT] 记录转换成本失败: {e}", file=sys.stderr)
 
+        def convert_single_task(index: int, task: ConversionTask) -> tuple[int, ConversionResult]:
+            """转换单个任务并返回索引和结果"""
+            if io_policy is not None and io_policy.readahead:
+                readahead(index)
+            result = run_task(task)
+            record_cost(task, result)
+            report_progress()
             return index, result
 
-        # 使用线程池并发执行
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 提交所有任务
-            futures = {
-                executor.submit(convert_single_task, i, task): i
-                for i, task in enumerate(tasks)
-            }
-
-            # 收集结果
-            for future in as_completed(futures):
-                index, result = future.result()
+        if io_workers:
+            # 流水线模式: I/O线程预读/写出,max_workers个CPU线程解码编码
+            import sys
+            pipeline = ConversionPipeline(cpu_workers=max_workers, io_workers=io_workers)
+
+            def on_result(index: int, result: ConversionResult) -> None:
                 results[index] = result
+                record_cost(tasks[index], result)
+                report_progress()
 
-                # 如果设置了取消标志,取消后续任务
-                if stop_event and stop_event.is_set():
-                    # 取消未完成的任务
-                    for f in futures:
-                        if not f.done():
-                            f.cancel()
-                    break
+            pipeline.run(
+                [(i, tasks[i]) for i in pending],
+                convert=lambda index, task, data: run_task(task, data, defer_write=True),
+                on_result=on_result,
+                stop_event=stop_event
+            )
+            self.pipeline_metrics = pipeline.metrics
+            print(f"[CONVERT] 流水线统计: {pipeline.metrics.get_summary()}", file=sys.stderr)
+        else:
+            # 使用线程池并发执行
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # 提交所有任务
+                futures = {
+                    executor.submit(convert_single_task, i, tasks[i]): i
+                    for i in pending
+                }
+
+                # 收集结果
+                for future in as_completed(futures):
+                    index, result = future.result()
+                    results[index] = result
+
+                    # 如果设置了取消标志,取消后续任务
+                    if stop_event and stop_event.is_set():
+                        # 取消未完成的任务
+                        for f in futures:
+                            if not f.done():
+                                f.cancel()
+                        break
+
+        # 重复任务复用主任务的输出
+        if dedup_plan:
+            for index, primary in dedup_plan.duplicates.items():
+                if results[primary] is None or (stop_event and stop_event.is_set()):
+                    continue
+                primary_params = results[primary].encode_params or {}
+                if results[primary].success and primary_params.get('tile_mode') == TileMode.SPLIT.name:
+                    # 分块输出是分块目录和清单,不能链接为单个WebP文件,重复任务单独转换
+                    results[index] = run_task(tasks[index])
+                    record_cost(tasks[index], results[index])
+                else:
+                    results[index] = self._materialize_duplicate(tasks[index], results[primary])
+                report_progress()
 
         # 填充被取消的任务结果
         for i, result in enumerate(results):
@@ -0,0 +1,301 @@
+"""
+转换成本模型
+
+从历史转换结果学习单张图片的耗时和输出大小: 每个成功的ConversionResult记录
+(格式, 宽, 高, 颜色模式, quality, method, 输入字节数) → (各阶段耗时, 输出字节数),
+追加到本地JSONL文件。按格式维护最小二乘的正规方程累加量,每条新记录只做
+O(特征数²)的更新,预测时才重新求解,因此拟合随记录增量刷新。
+样本不足的格式退回全部格式的合并拟合,仍不足时退回按像素数和格式的静态估计。
+"""
+
+import json
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from src.models.conversion_task import ConversionTask
+
+
+# 合并全部格式的拟合键
+_ALL_FORMATS = '*'
+
+
+@dataclass
+class CostSample:
+    """一次转换的输入特征和实测成本"""
+    format: str
+    width: int
+    height: int
+    mode: Optional[str]
+    quality: int
+    method: int
+    input_bytes: int
+    # 阶段名 -> 耗时(秒)
+    stages: dict[str, float] = field(default_factory=dict)
+    output_size: int = 0
+
+    @property
+    def seconds(self) -> float:
+        """各阶段耗时之和"""
+        return sum(self.stages.values())
+
+    def to_dict(self) -> dict:
+        """返回可序列化的记录"""
+        return {
+            'format': self.format,
+            'width': self.width,
+            'height': self.height,
+            'mode': self.mode,
+            'quality': self.quality,
+            'method': self.method,
+            'input_bytes': self.input_bytes,
+            'stages': self.stages,
+            'output_size': self.output_size,
+        }
+
+
+@dataclass
+class CostPrediction:
+    """单任务的成本预测"""
+    # 预计总耗时(秒)
+    seconds: float
+    # 预计输出字节数;没有可用拟合时为None
+    output_size: Optional[int] = None
+    # 阶段名 -> 预计耗时(秒)
+    stages: dict[str, float] = field(default_factory=dict)
+    # 拟合所用的样本数
+    samples: int = 0
+    # 预测来源: 'format'(该格式的拟合)、'all'(全部格式的拟合)或'static'(静态估计)
+    basis: str = 'static'
+
+
+class _LeastSquares:
+    """多目标线性最小二乘的正规方程累加量"""
+
+    # 岭回归系数(相对于对角元),避免特征共线时矩阵奇异
+    RIDGE = 1e-6
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.xtx = [[0.0] * size for _ in range(size)]
+        self.xty: dict[str, list[float]] = {}
+        self._coefficients: Optional[dict[str, list[float]]] = None
+
+    def add(self, x: list[float], targets: dict[str, float]) -> None:
+        """加入一个样本,使已求解的系数失效"""
+        self.count += 1
+        for i in range(self.size):
+            row = self.xtx[i]
+            for j in range(self.size):
+                row[j] += x[i] * x[j]
+        for name, y in targets.items():
+            vector = self.xty.setdefault(name, [0.0] * self.size)
+            for i in range(self.size):
+                vector[i] += x[i] * y
+        self._coefficients = None
+
+    def predict(self, x: list[float]) -> dict[str, float]:
+        """按当前累加量预测各目标值"""
+        if self._coefficients is None:
+            self._coefficients = {
+                name: _solve(self._regularized(), vector) for name, vector in self.xty.items()
+            }
+        return {
+            name: sum(c * v for c, v in zip(coefficients, x))
+            for name, coefficients in self._coefficients.items()
+        }
+
+    def _regularized(self) -> list[list[float]]:
+        matrix = [row[:] for row in self.xtx]
+        for i in range(self.size):
+            matrix[i][i] += self.RIDGE * matrix[i][i] + 1e-12
+        return matrix
+
+
+def _solve(matrix: list[list[float]], vector: list[float]) -> list[float]:
+    """部分主元高斯消元求解 matrix · x = vector(会修改matrix)"""
+    size = len(vector)
+    rhs = vector[:]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(matrix[r][col]))
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+        rhs[col], rhs[pivot] = rhs[pivot], rhs[col]
+        if matrix[col][col] == 0:
+            continue
+        for row in range(col + 1, size):
+            factor = matrix[row][col] / matrix[col][col]
+            if factor:
+                for k in range(col, size):
+                    matrix[row][k] -= factor * matrix[col][k]
+                rhs[row] -= factor * rhs[col]
+
+    result = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        if matrix[row][row] == 0:
+            continue
+        total = rhs[row] - sum(matrix[row][k] * result[k] for k in range(row + 1, size))
+        result[row] = total / matrix[row][row]
+    return result
+
+
+class CostModel:
+    """按格式增量拟合的转换耗时/输出大小模型(线程安全)"""
+
+    # 带透明通道的颜色模式
+    ALPHA_MODES = ('RGBA', 'LA', 'PA', 'RGBa', 'La')
+    # 特征数: 常数项、百万像素、百万像素×method、百万像素×quality、
+    # 百万像素×透明通道、输入MB
+    FEATURES = 6
+    # 使用某个拟合所需的最少样本数
+    MIN_SAMPLES = FEATURES + 2
+
+    def __init__(self, store_path: Optional[Path] = None):
+        """
+        初始化模型,从已有记录恢复拟合
+
+        Args:
+            store_path: JSONL记录文件路径,None表示只在内存中学习
+        """
+        self.store_path = Path(store_path) if store_path else None
+        self._lock = threading.Lock()
+        self._fits: dict[str, _LeastSquares] = {}
+
+        if self.store_path and self.store_path.exists():
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        sample = CostSample(**json.loads(line))
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+                    self._add(sample)
+
+    @property
+    def sample_count(self) -> int:
+        """已学习的样本数"""
+        with self._lock:
+            fit = self._fits.get(_ALL_FORMATS)
+            return fit.count if fit else 0
+
+    def record(self, task: ConversionTask, result) -> Optional[CostSample]:
+        """
+        记录一次转换结果并增量更新拟合
+
+        Args:
+            task: 转换任务
+            result: 该任务的ConversionResult
+
+        Returns:
+            记录的样本;结果未经实际编码(失败、缓存命中、去重、分块等)时返回None。
+            记录文件写入失败只打印警告,样本仍计入内存中的拟合
+        """
+        stages = result.stage_timings or {}
+        params = result.encode_params or {}
+        if (
+            not result.success or 'encode' not in stages or 'method' not in params
+            or params.get('pixel_cache') == 'hit' or result.output_size is None
+        ):
+            return None
+
+        input_file = task.input_file
+        sample = CostSample(
+            format=(input_file.format or 'UNKNOWN').upper(),
+            width=input_file.width,
+            height=input_file.height,
+            mode=input_file.mode,
+            quality=params.get('quality', task.quality),
+            method=params['method'],
+            input_bytes=input_file.file_size,
+            stages=dict(stages),
+            output_size=result.output_size
+        )
+        with self._lock:
+            self._add(sample)
+            if self.store_path:
+                # 记录文件只是历史缓存,写入失败时保留内存中的拟合,不影响转换
+                try:
+                    self.store_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.store_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(sample.to_dict(), ensure_ascii=False) + '\n')
+                except OSError as e:
+                    print(f"[COST] 写入成本记录失败: {e}", file=sys.stderr)
+        return sample
+
+    def predict(self, task: ConversionTask) -> CostPrediction:
+        """
+        预测任务的耗时和输出大小
+
+        Args:
+            task: 转换任务
+
+        Returns:
+            CostPrediction;样本不足时basis为'static',只有静态耗时估计
+        """
+        input_file = task.input_file
+        pixel_count = input_file.width * input_file.height
+        method = task.encoder_profile.resolve_method(pixel_count, task.time_budget)
+        x = self._features(pixel_count, method, task.quality, input_file.mode, input_file.file_size)
+
+        with self._lock:
+            for key, basis in (((input_file.format or 'UNKNOWN').upper(), 'format'),
+                               (_ALL_FORMATS, 'all')):
+                fit = self._fits.get(key)
+                if fit and fit.count >= self.MIN_SAMPLES:
+                    values = {name: max(0.0, value) for name, value in fit.predict(x).items()}
+                    stages = {
+                        name[len('stage:'):]: round(value, 6)
+                        for name, value in values.items() if name.startswith('stage:')
+                    }
+                    return CostPrediction(
+                        seconds=values['seconds'],
+                        output_size=round(values['output_size']),
+                        stages=stages,
+                        samples=fit.count,
+                        basis=basis
+                    )
+
+        from src.services.task_scheduler import TaskScheduler
+        return CostPrediction(seconds=TaskScheduler().estimate_cost(task))
+
+    def estimate_seconds(self, task: ConversionTask) -> float:
+        """
+        预测任务耗时,可直接作为SchedulingPolicy.cost_estimator
+
+        Args:
+            task: 转换任务
+
+        Returns:
+            预计耗时(秒)
+        """
+        return self.predict(task).seconds
+
+    def get_summary(self) -> dict:
+        """返回各格式的样本数"""
+        with self._lock:
+            return {key: fit.count for key, fit in self._fits.items()}
+
+    def _add(self, sample: CostSample) -> None:
+        """把样本计入该格式和全部格式的拟合(调用方持有锁或处于初始化中)"""
+        x = self._features(
+            sample.width * sample.height, sample.method, sample.quality,
+            sample.mode, sample.input_bytes
+        )
+        targets = {'seconds': sample.seconds, 'output_size': float(sample.output_size)}
+        targets.update({f'stage:{name}': value for name, value in sample.stages.items()})
+        for key in (sample.format, _ALL_FORMATS):
+            self._fits.setdefault(key, _LeastSquares(self.FEATURES)).add(x, targets)
+
+    def _features(
+        self, pixel_count: int, method: int, quality: int, mode: Optional[str], input_bytes: int
+    ) -> list[float]:
+        megapixels = pixel_count / 1_000_000
+        return [
+            1.0,
+            megapixels,
+            megapixels * method,
+            megapixels * quality / 100,
+            megapixels if mode in self.ALPHA_MODES else 0.0,
+            input_bytes / (1024 * 1024),
+        ]
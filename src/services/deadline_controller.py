@@ -0,0 +1,164 @@
+"""
+截止时间控制器
+
+在批量转换中持续监测吞吐量(百万像素/秒),根据预计完成时间动态调整
+剩余任务的编码器method: 预计超时则降低method,时间充裕时再逐级提高。
+"""
+
+import time
+import threading
+
+from src.models.encoder_profile import METHOD_THROUGHPUT_MPPS
+
+
+class DeadlineController:
+    """截止时间驱动的编码努力程度控制器"""
+
+    # 吞吐量指数滑动平均系数
+    EMA_ALPHA = 0.3
+
+    def __init__(
+        self,
+        deadline_seconds: float,
+        total_pixels: int,
+        workers: int = 1,
+        initial_method: int = 4,
+        min_method: int = 0,
+        max_method: int = 6,
+        slack_ratio: float = 0.8
+    ):
+        """
+        初始化控制器
+
+        Args:
+            deadline_seconds: 从现在起的可用时间(秒)
+            total_pixels: 批次全部任务的像素总数
+            workers: 并发工作线程数
+            initial_method: 初始method
+            min_method: 允许的最低method
+            max_method: 允许的最高method
+            slack_ratio: 提高method时要求的时间余量比例(越小越保守)
+        """
+        self.deadline_seconds = deadline_seconds
+        self.total_pixels = total_pixels
+        self.workers = max(1, workers)
+        self.min_method = min_method
+        self.max_method = max_method
+        self.slack_ratio = slack_ratio
+        self.current_method = max(min_method, min(max_method, initial_method))
+
+        self._start_time = time.monotonic()
+        self._completed_pixels = 0
+        self._observed_mpps: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        """已用时间(秒)"""
+        return time.monotonic() - self._start_time
+
+    @property
+    def remaining_time(self) -> float:
+        """距截止时间的剩余秒数(可能为负)"""
+        return self.deadline_seconds - self.elapsed
+
+    @property
+    def throughput_mpps(self) -> float:
+        """批次整体实测吞吐量(百万像素/秒)"""
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return self._completed_pixels / 1_000_000 / elapsed
+
+    def estimate_mpps(self, method: int) -> float:
+        """
+        估计单个工作线程在指定method下的吞吐量
+
+        优先使用该method的实测值;没有实测值时,用其他method的
+        实测值/经验值比例校准经验吞吐量表。
+
+        Args:
+            method: WebP编码器method参数
+
+        Returns:
+            单线程吞吐量(百万像素/秒)
+        """
+        if method in self._observed_mpps:
+            return self._observed_mpps[method]
+
+        if self._observed_mpps:
+            ratios = [
+                observed / METHOD_THROUGHPUT_MPPS[m]
+                for m, observed in self._observed_mpps.items()
+            ]
+            return METHOD_THROUGHPUT_MPPS[method] * sum(ratios) / len(ratios)
+
+        return METHOD_THROUGHPUT_MPPS[method]
+
+    def projected_duration(self, method: int) -> float:
+        """按指定method处理剩余像素的预计耗时(秒)"""
+        remaining_mp = max(0, self.total_pixels - self._completed_pixels) / 1_000_000
+        return remaining_mp / (self.estimate_mpps(method) * self.workers)
+
+    def next_method(self) -> int:
+        """
+        返回下一个任务应使用的method
+
+        预计完成时间超出截止时间时,降到能赶上的最高method(都赶不上则取最低);
+        时间充裕(按slack_ratio留出余量)时,每次最多提高一级,避免来回震荡。
+
+        Returns:
+            WebP编码器method参数
+        """
+        with self._lock:
+            remaining_time = self.remaining_time
+            method = self.current_method
+
+            if self.projected_duration(method) > remaining_time:
+                method = self.min_method
+                for candidate in range(self.current_method - 1, self.min_method - 1, -1):
+                    if self.projected_duration(candidate) <= remaining_time:
+                        method = candidate
+                        break
+            elif (
+                method < self.max_method
+                and self.projected_duration(method + 1) <= remaining_time * self.slack_ratio
+            ):
+                method += 1
+
+            self.current_method = method
+            return method
+
+    def record(self, pixel_count: int, duration: float, method: int) -> None:
+        """
+        记录一个已完成任务的实测耗时
+
+        Args:
+            pixel_count: 任务像素数
+            duration: 任务耗时(秒)
+            method: 任务使用的method
+        """
+        with self._lock:
+            self._completed_pixels += pixel_count
+            if duration <= 0:
+                return
+
+            mpps = pixel_count / 1_000_000 / duration
+            previous = self._observed_mpps.get(method)
+            if previous is None:
+                self._observed_mpps[method] = mpps
+            else:
+                self._observed_mpps[method] = (
+                    self.EMA_ALPHA * mpps + (1 - self.EMA_ALPHA) * previous
+                )
+
+    def get_summary(self) -> dict:
+        """返回控制器状态摘要"""
+        return {
+            'deadline_seconds': self.deadline_seconds,
+            'elapsed': round(self.elapsed, 3),
+            'throughput_mpps': round(self.throughput_mpps, 3),
+            'current_method': self.current_method,
+            'completed_pixels': self._completed_pixels,
+            'total_pixels': self.total_pixels,
+        }
@@ -0,0 +1,164 @@
+"""
+解码防护服务
+
+在读取任何像素数据之前,根据文件头中的尺寸估算解码内存,
+拒绝解压炸弹或将超限图片交给分块转换,并为批量转换提供内存预算调度。
+"""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Optional
+from PIL import Image
+
+from src.utils.image_header import ImageHeader, read_image_header
+from src.utils.error_messages import ErrorMessages, ErrorCode
+
+
+class DecodeVerdict(Enum):
+    """解码检查结论"""
+    ALLOW = "允许解码"
+    TILE = "按条带分块处理"
+    REJECT = "拒绝处理"
+
+
+@dataclass
+class DecodeCheck:
+    """解码检查结果"""
+    verdict: DecodeVerdict
+    header: Optional[ImageHeader] = None
+    # 该图片允许整张解码的最大像素数
+    pixel_limit: Optional[int] = None
+    message: str = ""
+
+    @property
+    def decode_bytes(self) -> int:
+        """估计解码内存(字节),文件头无法解析时为0"""
+        return self.header.decode_bytes if self.header else 0
+
+
+class DecodeGuard:
+    """解码成本防护"""
+
+    def __init__(
+        self,
+        max_pixels: Optional[int] = None,
+        max_decode_bytes: Optional[int] = None,
+        allow_tiling: bool = True
+    ):
+        """
+        初始化防护
+
+        Args:
+            max_pixels: 允许整张解码的最大像素数,默认取Pillow的硬上限
+                (2倍MAX_IMAGE_PIXELS): 介于MAX_IMAGE_PIXELS和硬上限之间的图片
+                Pillow只发出警告,仍按原行为整张解码
+            max_decode_bytes: 允许整张解码的最大内存(字节),None表示不限制
+            allow_tiling: 超限但可按条带读取的图片改为分块处理,否则直接拒绝
+        """
+        if max_pixels is None:
+            max_pixels = Image.MAX_IMAGE_PIXELS and 2 * Image.MAX_IMAGE_PIXELS
+        self.max_pixels = max_pixels
+        self.max_decode_bytes = max_decode_bytes
+        self.allow_tiling = allow_tiling
+
+    def check(self, file_path: Path) -> DecodeCheck:
+        """
+        读取文件头并检查解码成本
+
+        Args:
+            file_path: 图片文件路径
+
+        Returns:
+            DecodeCheck
+        """
+        return self.check_header(read_image_header(file_path))
+
+    def check_header(self, header: Optional[ImageHeader]) -> DecodeCheck:
+        """
+        按已解析的文件头检查解码成本
+
+        文件头无法解析时交给Pillow处理(Pillow自身仍有解压炸弹检查)。
+        超出Pillow硬上限(2倍MAX_IMAGE_PIXELS)的图片无法打开,始终拒绝。
+
+        Args:
+            header: read_image_header的结果
+
+        Returns:
+            DecodeCheck
+        """
+        if header is None:
+            return DecodeCheck(verdict=DecodeVerdict.ALLOW)
+
+        pixel_limit = self._pixel_limit(header)
+        if pixel_limit is None or header.pixel_count <= pixel_limit:
+            return DecodeCheck(verdict=DecodeVerdict.ALLOW, header=header, pixel_limit=pixel_limit)
+
+        hard_limit = Image.MAX_IMAGE_PIXELS and 2 * Image.MAX_IMAGE_PIXELS
+        if (
+            self.allow_tiling
+            and header.streamable
+            and (not hard_limit or header.pixel_count <= hard_limit)
+        ):
+            return DecodeCheck(verdict=DecodeVerdict.TILE, header=header, pixel_limit=pixel_limit)
+
+        return DecodeCheck(
+            verdict=DecodeVerdict.REJECT,
+            header=header,
+            pixel_limit=pixel_limit,
+            message=ErrorMessages.get(
+                ErrorCode.DECODE_LIMIT_EXCEEDED,
+                width=header.width,
+                height=header.height,
+                megabytes=round(header.decode_bytes / (1024 * 1024)),
+            ),
+        )
+
+    def _pixel_limit(self, header: ImageHeader) -> Optional[int]:
+        """合并像素上限和内存上限,换算为该图片的最大像素数"""
+        limits = []
+        if self.max_pixels:
+            limits.append(self.max_pixels)
+        if self.max_decode_bytes:
+            limits.append(self.max_decode_bytes // (header.bands * header.bytes_per_sample))
+        return min(limits) if limits else None
+
+
+class MemoryBudget:
+    """
+    批量转换的解码内存预算
+
+    每个任务开始前按估计解码内存预留额度,额度不足时等待其他任务释放;
+    单个任务超出总预算时按总预算预留,即独占执行。
+    """
+
+    def __init__(self, limit_bytes: int):
+        self.limit_bytes = limit_bytes
+        self.in_use = 0
+        self.peak_bytes = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, nbytes: int) -> Iterator[int]:
+        """
+        预留内存额度,退出上下文时释放
+
+        Args:
+            nbytes: 估计解码内存(字节)
+
+        Yields:
+            实际预留的字节数
+        """
+        granted = min(max(0, nbytes), self.limit_bytes)
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_use + granted <= self.limit_bytes)
+            self.in_use += granted
+            self.peak_bytes = max(self.peak_bytes, self.in_use)
+        try:
+            yield granted
+        finally:
+            with self._condition:
+                self.in_use -= granted
+                self._condition.notify_all()
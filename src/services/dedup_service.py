@@ -0,0 +1,128 @@
+"""
+批次去重服务
+
+在批量转换前找出内容完全相同、转换参数也相同的输入文件: 先按文件大小分组,
+大小相同的再比较前64KB的哈希,仍相同的才计算整个文件的哈希。
+每组只转换一次,其余任务的输出由主任务的输出链接或复制得到。
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Optional
+
+from src.models.conversion_task import ConversionTask
+
+
+@dataclass
+class DedupPlan:
+    """去重计划"""
+
+    # 需要实际转换的任务索引(每组内容相同的任务中的第一个)
+    primaries: list[int] = field(default_factory=list)
+    # 重复任务索引 -> 主任务索引
+    duplicates: dict[int, int] = field(default_factory=dict)
+    # 计算哈希的耗时(秒)
+    hash_time: float = 0.0
+
+    @property
+    def duplicate_count(self) -> int:
+        """重复任务数"""
+        return len(self.duplicates)
+
+    def ratio(self, total_count: int) -> float:
+        """重复任务占全部任务的比例"""
+        return self.duplicate_count / total_count if total_count else 0.0
+
+
+class DedupService:
+    """内容相同输入的分组服务"""
+
+    # 大小相同时先比较的文件头字节数
+    HEAD_BYTES = 64 * 1024
+    # 读取整个文件时的块大小
+    CHUNK_SIZE = 1024 * 1024
+
+    # 不影响转换输出的任务字段(其余字段都参与分组)
+    _IGNORED_FIELDS = {
+        'input_file', 'output_path', 'status', 'task_id', 'output_file_size',
+        'compression_ratio', 'duration_seconds', 'error_message',
+        'created_at', 'started_at', 'finished_at',
+    }
+
+    def plan(self, tasks: list[ConversionTask]) -> DedupPlan:
+        """
+        找出内容和转换参数都相同的任务
+
+        Args:
+            tasks: 转换任务列表
+
+        Returns:
+            DedupPlan,primaries保持tasks中的原始顺序
+        """
+        start = time.perf_counter()
+        by_size: dict[tuple, list[int]] = {}
+        for index, task in enumerate(tasks):
+            key = (task.input_file.file_size, self._task_key(task))
+            by_size.setdefault(key, []).append(index)
+
+        plan = DedupPlan()
+        for candidates in by_size.values():
+            if len(candidates) == 1:
+                continue
+            for group in self._split_by_hash(tasks, candidates):
+                primary = group[0]
+                for index in group[1:]:
+                    plan.duplicates[index] = primary
+
+        plan.primaries = [index for index in range(len(tasks)) if index not in plan.duplicates]
+        plan.hash_time = time.perf_counter() - start
+        return plan
+
+    def content_hash(self, path: Path, limit: Optional[int] = None) -> Optional[bytes]:
+        """
+        计算文件内容的BLAKE2b哈希
+
+        Args:
+            path: 文件路径
+            limit: 只读取前limit字节,None表示整个文件
+
+        Returns:
+            哈希摘要;文件无法读取时返回None
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(path, 'rb') as f:
+                if limit is not None:
+                    digest.update(f.read(limit))
+                else:
+                    while chunk := f.read(self.CHUNK_SIZE):
+                        digest.update(chunk)
+        except OSError:
+            return None
+        return digest.digest()
+
+    def _split_by_hash(self, tasks: list[ConversionTask], candidates: list[int]) -> list[list[int]]:
+        """先按文件头哈希、再按全文哈希细分大小相同的候选任务"""
+        groups = [candidates]
+        size = tasks[candidates[0]].input_file.file_size
+        limits = [self.HEAD_BYTES, None] if size > self.HEAD_BYTES else [None]
+
+        for limit in limits:
+            refined = []
+            for group in groups:
+                by_hash: dict[bytes, list[int]] = {}
+                for index in group:
+                    digest = self.content_hash(tasks[index].input_file.file_path, limit)
+                    if digest is not None:
+                        by_hash.setdefault(digest, []).append(index)
+                refined.extend(same for same in by_hash.values() if len(same) > 1)
+            groups = refined
+        return groups
+
+    def _task_key(self, task: ConversionTask) -> str:
+        """影响输出的转换参数(策略对象可能不可哈希,用repr比较)"""
+        return repr([
+            getattr(task, f.name) for f in fields(task) if f.name not in self._IGNORED_FIELDS
+        ])
@@ -8,11 +8,17 @@ from pathlib import Path
 import shutil
 import os
 import re
+import threading
+
+from src.utils.path_utils import resolve_output_path
 
 
 class FileService:
     """文件路径处理服务"""
 
+    # Linux ioctl: 克隆整个文件(_IOW(0x94, 9, int))
+    FICLONE = 0x40049409
+
     def resolve_output_path(
         self,
         input_path: Path,
@@ -114,6 +120,108 @@ class FileService:
 
         return True, "文件有效"
 
+    def link_or_copy(self, source_path: Path, target_path: Path, overwrite: bool = False) -> str:
+        """
+        在目标路径创建源文件的硬链接,不支持时依次退回reflink(写时复制克隆)和复制。
+
+        目标已是源文件本身(同一inode)时不做任何操作。其他已存在的目标文件
+        默认不覆盖;overwrite=True时先在同目录创建临时文件再原子替换目标,
+        目标路径上的旧文件只被解除这一个链接。
+
+        参数:
+            source_path: 源文件路径
+            target_path: 目标文件路径
+            overwrite: 目标已存在(且不是源文件)时是否替换
+
+        返回:
+            实际使用的方式: "same"(目标即源文件)、"hardlink"、"reflink" 或 "copy"
+
+        异常:
+            FileExistsError: 目标已存在且overwrite=False
+        """
+        if target_path.exists() and os.path.samefile(source_path, target_path):
+            return "same"
+        if not overwrite:
+            return self._create_link_or_copy(source_path, target_path)
+
+        temp_path = target_path.with_name(
+            f'{target_path.name}.{os.getpid()}.{threading.get_ident()}.tmp'
+        )
+        try:
+            method = self._create_link_or_copy(source_path, temp_path)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return method
+
+    def link_or_copy_unique(self, source_path: Path, target_path: Path) -> tuple[Path, str]:
+        """
+        链接或复制源文件到目标路径,目标已被其他文件占用时自动重命名(不覆盖)。
+
+        参数:
+            source_path: 源文件路径
+            target_path: 期望的目标文件路径
+
+        返回:
+            (实际路径, 方式);目标即源文件本身时返回(source_path, "same")
+        """
+        if target_path.exists() and os.path.samefile(source_path, target_path):
+            return source_path, "same"
+        while True:
+            candidate = resolve_output_path(target_path)
+            try:
+                return candidate, self._create_link_or_copy(source_path, candidate)
+            except FileExistsError:
+                # 并发任务抢先占用了同一名称,重新选择
+                continue
+
+    def _create_link_or_copy(self, source_path: Path, target_path: Path) -> str:
+        """在不存在的目标路径创建硬链接/reflink/副本,目标已存在时抛出FileExistsError"""
+        try:
+            os.link(source_path, target_path)
+            return "hardlink"
+        except FileExistsError:
+            raise
+        except OSError:
+            pass
+
+        if self._reflink(source_path, target_path):
+            return "reflink"
+
+        with open(source_path, 'rb') as source, open(target_path, 'xb') as target:
+            shutil.copyfileobj(source, target)
+        return "copy"
+
+    def _reflink(self, source_path: Path, target_path: Path) -> bool:
+        """
+        用Linux FICLONE ioctl克隆文件(Btrfs/XFS等支持写时复制的文件系统)。
+
+        参数:
+            source_path: 源文件路径
+            target_path: 目标文件路径(不存在)
+
+        返回:
+            克隆成功返回True;平台或文件系统不支持时返回False且不留下目标文件
+
+        异常:
+            FileExistsError: 目标已存在(不会删除已有文件)
+        """
+        try:
+            import fcntl
+        except ImportError:
+            return False
+
+        with open(source_path, 'rb') as source, open(target_path, 'xb') as target:
+            try:
+                fcntl.ioctl(target.fileno(), self.FICLONE, source.fileno())
+                return True
+            except OSError:
+                pass
+        # 只删除本方法刚创建的空文件
+        target_path.unlink(missing_ok=True)
+        return False
+
     def get_safe_filename(self, filename: str) -> str:
         """
         清理文件名中的非法字符,确保跨平台兼容性。
@@ -4,11 +4,19 @@
 提供EXIF/XMP/ICC元数据的提取、嵌入和验证功能。
 """
 
+import re
 from pathlib import Path
 from typing import Tuple
 from PIL import Image
 
 from src.models.image_metadata import ImageMetadata
+from src.models.metadata_policy import MetadataPolicy
+from src.utils.image_open import open_image
+from src.utils.raw_metadata import read_raw_metadata, EXIF_PREFIX
+from src.utils.exif_ifd import filter_exif, set_orientation, TAG_ORIENTATION
+from src.utils.webp_chunks import (
+    read_metadata_chunks, write_webp_metadata, EXIF, XMP, ICCP
+)
 
 
 class MetadataService:
@@ -26,6 +34,98 @@ class MetadataService:
         """
         return ImageMetadata.from_pil_image(pil_image)
 
+    def read_file_metadata(self, file_path: Path) -> ImageMetadata:
+        """
+        不打开解码器,直接从文件读取元数据
+
+        JPEG/PNG读取原始标记段和块,遇到扫描数据/IDAT即停止;
+        其他格式或结构无法解析时回退到Pillow(只解析文件头,不解码像素)。
+
+        Args:
+            file_path: 图片文件路径
+
+        Returns:
+            ImageMetadata对象
+        """
+        metadata = read_raw_metadata(file_path)
+        if metadata is not None:
+            return metadata
+        with open_image(file_path) as img:
+            return self.extract_metadata(img)
+
+    def read_file_metadata_batch(self, file_paths: list[Path]) -> dict[Path, ImageMetadata]:
+        """
+        批量读取元数据(用于目录编制和转换前预检)
+
+        Args:
+            file_paths: 图片文件路径列表
+
+        Returns:
+            {文件路径: ImageMetadata},无法读取的文件不包含在结果中
+        """
+        results = {}
+        for file_path in file_paths:
+            try:
+                results[file_path] = self.read_file_metadata(file_path)
+            except (OSError, ValueError):
+                continue
+        return results
+
+    def apply_policy(self, metadata: ImageMetadata, policy: MetadataPolicy) -> ImageMetadata:
+        """
+        按策略过滤元数据
+
+        EXIF在IFD层面过滤(只重排目录项,不解码标签值);KEEP_ALL直接返回原对象。
+
+        Args:
+            metadata: 原始元数据
+            policy: 元数据策略
+
+        Returns:
+            过滤后的ImageMetadata
+        """
+        if policy == MetadataPolicy.KEEP_ALL:
+            return metadata
+        if policy == MetadataPolicy.STRIP_ALL:
+            return ImageMetadata()
+
+        exif = metadata.exif
+        xmp = metadata.xmp
+        if exif:
+            if policy == MetadataPolicy.STRIP_THUMBNAIL:
+                exif = filter_exif(exif, strip_thumbnail=True)
+            elif policy == MetadataPolicy.STRIP_GPS:
+                exif = filter_exif(exif, strip_gps=True)
+            elif policy == MetadataPolicy.KEEP_ORIENTATION_AND_ICC:
+                exif = filter_exif(exif, keep_tags={TAG_ORIENTATION})
+        if policy == MetadataPolicy.KEEP_ORIENTATION_AND_ICC:
+            xmp = None
+
+        return ImageMetadata(exif=exif, xmp=xmp, icc_profile=metadata.icc_profile)
+
+    def reset_orientation(self, metadata: ImageMetadata) -> ImageMetadata:
+        """
+        将元数据中的方向标记重置为1(像素已按方向转正后调用)
+
+        EXIF方向标签原位改写;XMP中的tiff:Orientation(属性或元素形式)同步改为1。
+
+        Args:
+            metadata: 原始元数据
+
+        Returns:
+            方向已重置的ImageMetadata
+        """
+        exif = set_orientation(metadata.exif, 1) if metadata.exif else metadata.exif
+        xmp = metadata.xmp
+        if xmp:
+            xmp = re.sub(rb'tiff:Orientation="[0-9]"', b'tiff:Orientation="1"', xmp)
+            xmp = re.sub(
+                rb'<tiff:Orientation>[0-9]</tiff:Orientation>',
+                b'<tiff:Orientation>1</tiff:Orientation>',
+                xmp
+            )
+        return ImageMetadata(exif=exif, xmp=xmp, icc_profile=metadata.icc_profile)
+
     def embed_metadata(self, metadata: ImageMetadata) -> dict:
         """
         将元数据转换为Pillow保存参数字典
@@ -57,38 +157,74 @@ class MetadataService:
             return False, "输出文件不存在"
 
         try:
-            with Image.open(output_file_path) as output_img:
-                output_metadata = self.extract_metadata(output_img)
-
-                # 检查EXIF
-                if original_metadata.exif:
-                    if not output_metadata.exif:
-                        return False, "EXIF元数据丢失"
-                    if original_metadata.exif != output_metadata.exif:
-                        # 注意: WebP可能会轻微修改EXIF格式,这里允许部分差异
-                        # 实际应用中可能需要更精细的比较
-                        pass
-
-                # 检查XMP
-                if original_metadata.xmp:
-                    if not output_metadata.xmp:
-                        return False, "XMP元数据丢失"
-                    if original_metadata.xmp != output_metadata.xmp:
-                        pass
-
-                # 检查ICC Profile
-                if original_metadata.icc_profile:
-                    if not output_metadata.icc_profile:
-                        return False, "ICC配置文件丢失"
-                    if original_metadata.icc_profile != output_metadata.icc_profile:
-                        pass
-
-                # 如果原始图片没有元数据,验证也算成功
-                if not original_metadata.has_metadata:
-                    return True, "原图无元数据,无需保留"
-
-                # 如果有元数据且都保留了,验证成功
-                return True, "元数据保留成功"
+            # WebP输出只读取RIFF块,无需打开解码器
+            try:
+                chunks = read_metadata_chunks(output_file_path)
+            except ValueError:
+                chunks = None
+
+            if chunks is not None:
+                output_metadata = ImageMetadata(
+                    exif=chunks.get(EXIF),
+                    xmp=chunks.get(XMP),
+                    icc_profile=chunks.get(ICCP),
+                )
+            else:
+                with open_image(output_file_path) as output_img:
+                    output_metadata = self.extract_metadata(output_img)
+
+            checks = (
+                ("EXIF元数据", original_metadata.exif, output_metadata.exif),
+                ("XMP元数据", original_metadata.xmp, output_metadata.xmp),
+                ("ICC配置文件", original_metadata.icc_profile, output_metadata.icc_profile),
+            )
+            for name, original, output in checks:
+                if not original:
+                    continue
+                if not output:
+                    return False, f"{name}丢失"
+                # EXIF在JPEG/PNG中带"Exif\0\0"前缀,WebP的EXIF块中不带
+                if _strip_exif_prefix(original) != _strip_exif_prefix(output):
+                    return False, f"{name}内容不一致"
+
+            # 如果原始图片没有元数据,验证也算成功
+            if not original_metadata.has_metadata:
+                return True, "原图无元数据,无需保留"
+
+            # 如果有元数据且都保留了,验证成功
+            return True, "元数据保留成功"
 
         except Exception as e:
             return False, f"验证失败: {str(e)}"
+
+    def replace_webp_metadata(
+        self,
+        webp_path: Path,
+        metadata: ImageMetadata,
+        output_path: Path = None
+    ) -> int:
+        """
+        用给定元数据替换WebP文件的EXIF/XMP/ICC块,不重新编码图像
+
+        metadata中为None的项会从文件中删除;传入空的ImageMetadata即去除全部元数据。
+
+        Args:
+            webp_path: WebP文件路径
+            metadata: 要写入的元数据
+            output_path: 输出路径,None表示原地改写
+
+        Returns:
+            写入的文件字节数
+        """
+        return write_webp_metadata(
+            webp_path,
+            output_path,
+            exif=metadata.exif,
+            xmp=metadata.xmp,
+            icc_profile=metadata.icc_profile,
+        )
+
+
+def _strip_exif_prefix(data: bytes) -> bytes:
+    """去掉EXIF数据的"Exif\0\0"前缀(如有)"""
+    return data[len(EXIF_PREFIX):] if data.startswith(EXIF_PREFIX) else data
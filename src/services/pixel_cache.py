@@ -0,0 +1,179 @@
+"""
+像素内容缓存
+
+按"解码后的像素数据 + 编码参数"的哈希缓存不含元数据的WebP码流。只有EXIF等
+元数据不同、像素完全相同的图片命中缓存后跳过WebP编码,只把元数据块重新写入
+缓存的码流。缓存目录的总大小有上限,超出时按最近最少使用淘汰。
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from PIL import Image
+
+from src.utils.webp_chunks import rewrite_webp_metadata
+
+
+class PixelCache:
+    """按像素内容寻址的WebP码流磁盘缓存(线程安全)"""
+
+    # 缓存文件扩展名
+    SUFFIX = '.webp'
+    # 不参与缓存键的保存参数(元数据在命中后重新写入)
+    METADATA_PARAMS = ('exif', 'xmp', 'icc_profile')
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 1024 * 1024):
+        """
+        初始化缓存,按修改时间恢复已有条目的LRU顺序
+
+        Args:
+            cache_dir: 缓存目录(不存在时创建)
+            max_bytes: 缓存目录总大小上限(字节)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        existing = sorted(
+            (entry.stat().st_mtime, entry.stem, entry.stat().st_size)
+            for entry in self.cache_dir.glob(f'*{self.SUFFIX}')
+        )
+        for _, key, size in existing:
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        """缓存目录当前总字节数"""
+        return self._total_bytes
+
+    def key(self, img: Image.Image, save_params: dict) -> str:
+        """
+        计算缓存键
+
+        Args:
+            img: 即将编码的图片对象
+            save_params: WebP保存参数(元数据参数被忽略)
+
+        Returns:
+            十六进制缓存键
+        """
+        params = sorted(
+            (name, value) for name, value in save_params.items()
+            if name not in self.METADATA_PARAMS
+        )
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((img.mode, img.size, params)).encode())
+        if img.mode == 'P':
+            digest.update(bytes(img.getpalette() or []))
+            digest.update(repr(img.info.get('transparency')).encode())
+        digest.update(img.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        读取缓存的码流(不含元数据),命中时更新LRU顺序
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            WebP字节;未命中时返回None
+        """
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        写入缓存,先去掉元数据块;超出大小上限时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            data: 编码得到的WebP字节(可含元数据)
+        """
+        data = rewrite_webp_metadata(data, exif=None, xmp=None, icc_profile=None)
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        temp_path = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+        try:
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def lookup(self, key: str, metadata_params: dict) -> Optional[bytes]:
+        """
+        读取缓存码流并写入当前图片的元数据块
+
+        Args:
+            key: 缓存键
+            metadata_params: 元数据保存参数(exif/xmp/icc_profile,可为空)
+
+        Returns:
+            含元数据的WebP字节;未命中时返回None
+        """
+        data = self.get(key)
+        if data is None or not metadata_params:
+            return data
+        return rewrite_webp_metadata(
+            data,
+            exif=metadata_params.get('exif'),
+            xmp=metadata_params.get('xmp'),
+            icc_profile=metadata_params.get('icc_profile')
+        )
+
+    def get_summary(self) -> dict:
+        """返回缓存统计"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}{self.SUFFIX}'
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目直到总大小不超过上限(调用方持有锁)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            self._path(key).unlink(missing_ok=True)
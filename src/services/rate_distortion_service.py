@@ -0,0 +1,312 @@
+"""
+率失真扫描服务
+
+对一组图片按质量×method网格编码,记录输出大小、编码耗时和PSNR/SSIM,
+用于根据数据而非经验选择QualityPreset的质量值。
+"""
+
+import csv
+import io
+import json
+import time
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+from src.models.quality_preset import QualityPreset
+from src.services.converter_service import ConverterService
+from src.services.content_classifier import ContentClassifier
+from src.utils.image_metrics import compute_psnr, compute_ssim
+from src.utils.image_open import open_image
+
+
+@dataclass
+class RateDistortionPoint:
+    """单个网格点的测量结果"""
+    file_name: str
+    content_type: str
+    width: int
+    height: int
+    input_size: int
+    quality: int
+    method: int
+    output_size: int
+    encode_time: float
+    psnr: float
+    ssim: float
+
+    @property
+    def bits_per_pixel(self) -> float:
+        """每像素比特数"""
+        return self.output_size * 8 / (self.width * self.height)
+
+
+class RateDistortionService:
+    """率失真扫描服务"""
+
+    # 默认质量网格,包含所有预设质量值
+    DEFAULT_QUALITIES = tuple(sorted(
+        {30, 40, 50, 70, 75, 85, 90} | {preset.quality_value for preset in QualityPreset}
+    ))
+    DEFAULT_METHODS = (0, 2, 4, 6)
+
+    CSV_FIELDS = [
+        'file_name', 'content_type', 'width', 'height', 'input_size',
+        'quality', 'method', 'output_size', 'bits_per_pixel',
+        'encode_time', 'psnr', 'ssim',
+    ]
+
+    def __init__(self, converter_service: Optional[ConverterService] = None):
+        self.converter_service = converter_service or ConverterService()
+        self.content_classifier = ContentClassifier()
+
+    def sweep(
+        self,
+        image_paths: Iterable[Path],
+        qualities: Optional[Iterable[int]] = None,
+        methods: Optional[Iterable[int]] = None,
+        max_workers: int = 4,
+        content_type_fn: Optional[Callable[[Image.Image], str]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> list[RateDistortionPoint]:
+        """
+        对图片集合执行率失真扫描
+
+        每张图片只解码一次,随后在线程池中并行完成该图片的全部网格编码。
+
+        Args:
+            image_paths: 图片路径集合
+            qualities: 质量网格,默认DEFAULT_QUALITIES
+            methods: method网格,默认DEFAULT_METHODS
+            max_workers: 并行编码线程数
+            content_type_fn: 内容类型分类函数,默认使用ContentClassifier的内容类别
+            progress_callback: 进度回调 (completed_images, total_images)
+            stop_event: 取消标志
+
+        Returns:
+            全部网格点的测量结果
+        """
+        image_paths = [Path(path) for path in image_paths]
+        qualities = list(qualities) if qualities is not None else list(self.DEFAULT_QUALITIES)
+        methods = list(methods) if methods is not None else list(self.DEFAULT_METHODS)
+        content_type_fn = content_type_fn or self._default_content_type
+
+        points: list[RateDistortionPoint] = []
+        total = len(image_paths)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, image_path in enumerate(image_paths, 1):
+                if stop_event and stop_event.is_set():
+                    break
+
+                # 解码一次,所有网格点共享同一份像素数据
+                with open_image(image_path) as source:
+                    content_type = content_type_fn(source)
+                    source.load()
+                    prepared = self.converter_service.prepare_image(source)
+                    reference = prepared.convert('RGB')
+                    input_size = image_path.stat().st_size
+
+                    futures = [
+                        executor.submit(
+                            self._measure_point, prepared, reference, image_path.name,
+                            input_size, content_type, quality, method
+                        )
+                        for quality in qualities
+                        for method in methods
+                    ]
+                    points.extend(future.result() for future in futures)
+
+                if progress_callback:
+                    progress_callback(index, total)
+
+        return points
+
+    def _measure_point(
+        self,
+        prepared: Image.Image,
+        reference: Image.Image,
+        file_name: str,
+        input_size: int,
+        content_type: str,
+        quality: int,
+        method: int
+    ) -> RateDistortionPoint:
+        """编码单个网格点并计算失真"""
+        start_time = time.perf_counter()
+        data = self.converter_service.encode_to_bytes(prepared, quality=quality, method=method)
+        encode_time = time.perf_counter() - start_time
+
+        with Image.open(io.BytesIO(data)) as decoded:
+            decoded = decoded.convert('RGB')
+            psnr = compute_psnr(reference, decoded)
+            ssim = compute_ssim(reference, decoded)
+
+        return RateDistortionPoint(
+            file_name=file_name,
+            content_type=content_type,
+            width=reference.width,
+            height=reference.height,
+            input_size=input_size,
+            quality=quality,
+            method=method,
+            output_size=len(data),
+            encode_time=round(encode_time, 6),
+            psnr=round(psnr, 4),
+            ssim=round(ssim, 6),
+        )
+
+    def _default_content_type(self, img: Image.Image) -> str:
+        """默认内容类型: 内容分类器给出的类别(PHOTO/SCREENSHOT/GRAPHIC)"""
+        return self.content_classifier.analyze(img).content_class.name
+
+    def summarize(self, points: list[RateDistortionPoint]) -> dict:
+        """
+        汇总扫描结果,按内容类型和method求拐点及预设表现
+
+        拐点定义为归一化(bpp, PSNR)曲线上距首尾连线最远的质量值,
+        即再提高质量带来的PSNR收益开始明显低于字节开销的位置。
+
+        Args:
+            points: sweep()返回的测量结果
+
+        Returns:
+            {content_type: {'image_count', 'methods': {method: {...}}, 'presets': {...}}}
+        """
+        grouped = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        files = defaultdict(set)
+        for point in points:
+            grouped[point.content_type][point.method][point.quality].append(point)
+            files[point.content_type].add(point.file_name)
+
+        summary = {}
+        for content_type, by_method in grouped.items():
+            method_summaries = {}
+            for method, by_quality in sorted(by_method.items()):
+                curve = [
+                    {
+                        'quality': quality,
+                        'bits_per_pixel': round(_mean(p.bits_per_pixel for p in group), 4),
+                        'psnr': round(_mean(p.psnr for p in group), 4),
+                        'ssim': round(_mean(p.ssim for p in group), 6),
+                        'encode_time': round(_mean(p.encode_time for p in group), 6),
+                    }
+                    for quality, group in sorted(by_quality.items())
+                ]
+                method_summaries[method] = {
+                    'knee_quality': _find_knee(curve),
+                    'curve': curve,
+                }
+
+            summary[content_type] = {
+                'image_count': len(files[content_type]),
+                'methods': method_summaries,
+                'presets': self._summarize_presets(method_summaries),
+            }
+
+        return summary
+
+    @staticmethod
+    def _summarize_presets(method_summaries: dict) -> dict:
+        """列出各预设质量值在每个method下的测量结果"""
+        presets = {}
+        for preset in QualityPreset:
+            presets[preset.name] = {
+                method: next(
+                    (row for row in info['curve'] if row['quality'] == preset.quality_value),
+                    None
+                )
+                for method, info in method_summaries.items()
+            }
+        return presets
+
+    def write_csv(self, points: list[RateDistortionPoint], output_path: Path) -> Path:
+        """
+        将测量结果写入CSV
+
+        Args:
+            points: 测量结果
+            output_path: CSV文件路径
+
+        Returns:
+            写入的文件路径
+        """
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
+            writer.writeheader()
+            for point in points:
+                row = asdict(point)
+                row['bits_per_pixel'] = round(point.bits_per_pixel, 4)
+                writer.writerow(row)
+        return output_path
+
+    def write_json(
+        self,
+        points: list[RateDistortionPoint],
+        output_path: Path,
+        summary: Optional[dict] = None
+    ) -> Path:
+        """
+        将测量结果和汇总写入JSON
+
+        Args:
+            points: 测量结果
+            output_path: JSON文件路径
+            summary: summarize()的结果,为None时自动计算
+
+        Returns:
+            写入的文件路径
+        """
+        if summary is None:
+            summary = self.summarize(points)
+
+        report = {
+            'summary': summary,
+            'points': [
+                {**asdict(point), 'bits_per_pixel': round(point.bits_per_pixel, 4)}
+                for point in points
+            ],
+        }
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return output_path
+
+
+def _mean(values: Iterable[float]) -> float:
+    """计算平均值"""
+    values = list(values)
+    return sum(values) / len(values) if values else 0.0
+
+
+def _find_knee(curve: list[dict]) -> Optional[int]:
+    """
+    在(bpp, PSNR)曲线上寻找拐点质量值
+
+    Args:
+        curve: 按质量升序排列的曲线点
+
+    Returns:
+        拐点质量值,点数不足时返回None
+    """
+    if len(curve) < 3:
+        return curve[-1]['quality'] if curve else None
+
+    xs = [row['bits_per_pixel'] for row in curve]
+    ys = [row['psnr'] for row in curve]
+    x_span = (max(xs) - min(xs)) or 1.0
+    y_span = (max(ys) - min(ys)) or 1.0
+    norm_x = [(x - xs[0]) / x_span for x in xs]
+    norm_y = [(y - ys[0]) / y_span for y in ys]
+
+    # 首尾连线方向,取各点到连线的有符号距离(曲线在连线上方为正)
+    dx, dy = norm_x[-1], norm_y[-1]
+    length = (dx * dx + dy * dy) ** 0.5 or 1.0
+    distances = [(dx * y - dy * x) / length for x, y in zip(norm_x, norm_y)]
+
+    best = max(range(len(curve)), key=lambda i: distances[i])
+    return curve[best]['quality']
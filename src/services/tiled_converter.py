@@ -0,0 +1,228 @@
+"""
+分块转换服务
+
+按条带读取超大图片并输出为WebP分块(附manifest.json清单)或缩小后的单张WebP。
+
+未压缩的单一raw块图片(如BMP)直接按偏移读取每个条带的行数据,不解码整张图,
+峰值内存与条带高度成正比;PNG/JPEG等压缩格式无法从中间开始解码,
+只能整张解码一次后按条带裁剪(缩小时JPEG先用draft在DCT域降采样)。
+"""
+
+import io
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+from PIL import Image
+
+from src.models.tiling_policy import TilingPolicy, TileMode
+from src.utils.raw_bitmap import raw_layout
+
+
+@dataclass
+class TiledOutput:
+    """分块转换输出"""
+    output_path: Path
+    output_size: int
+    mode: TileMode
+    tiles: list[dict] = field(default_factory=list)
+    streamed: bool = False
+    output_width: int = 0
+    output_height: int = 0
+
+
+class TiledConverter:
+    """超大图片分块转换器"""
+
+    MANIFEST_NAME = "manifest.json"
+
+    def convert(
+        self,
+        img: Image.Image,
+        output_path: Path,
+        policy: TilingPolicy,
+        **save_params
+    ) -> TiledOutput:
+        """
+        分块转换已打开(尚未解码)的图片
+
+        Args:
+            img: Image.open返回的图片对象,不要预先调用load()
+            output_path: 原定的WebP输出路径;SPLIT模式在同目录创建
+                "<文件名>_tiles"目录存放分块和清单
+            policy: 分块策略
+            **save_params: WebP保存参数
+
+        Returns:
+            TiledOutput,SPLIT模式的output_path为清单文件路径
+        """
+        if policy.mode == TileMode.DOWNSCALE:
+            return self._downscale(img, output_path, policy, save_params)
+        return self._split(img, output_path, policy, save_params)
+
+    def iter_strips(
+        self,
+        img: Image.Image,
+        strip_height: int
+    ) -> Iterator[tuple[int, Image.Image]]:
+        """
+        按条带依次产出图片内容
+
+        Args:
+            img: Image.open返回的图片对象
+            strip_height: 条带行数
+
+        Yields:
+            (条带起始行, 条带图片)
+        """
+        layout = self._raw_layout(img)
+        if layout is None:
+            img.load()
+
+        for top in range(0, img.height, strip_height):
+            bottom = min(top + strip_height, img.height)
+            if layout is None:
+                yield top, img.crop((0, top, img.width, bottom))
+            else:
+                yield top, self._read_raw_strip(img, layout, top, bottom)
+
+    def is_streamable(self, img: Image.Image) -> bool:
+        """图片能否不整张解码、按条带直接读取"""
+        return self._raw_layout(img) is not None
+
+    def _split(
+        self,
+        img: Image.Image,
+        output_path: Path,
+        policy: TilingPolicy,
+        save_params: dict
+    ) -> TiledOutput:
+        """拆分为不超过tile_size的WebP分块,并写入清单"""
+        tile_size = min(policy.tile_size, policy.max_dimension)
+        tile_dir = output_path.parent / f"{output_path.stem}_tiles"
+        tile_dir.mkdir(parents=True, exist_ok=True)
+
+        tiles = []
+        output_size = 0
+        for top, strip in self.iter_strips(img, tile_size):
+            row = top // tile_size
+            for left in range(0, img.width, tile_size):
+                right = min(left + tile_size, img.width)
+                tile = strip.crop((left, 0, right, strip.height))
+                data = self._encode(tile, save_params)
+                tile_name = f"r{row:03d}_c{left // tile_size:03d}.webp"
+                (tile_dir / tile_name).write_bytes(data)
+                output_size += len(data)
+                tiles.append({
+                    'file': tile_name,
+                    'x': left,
+                    'y': top,
+                    'width': right - left,
+                    'height': strip.height,
+                })
+            del strip
+
+        manifest_path = tile_dir / self.MANIFEST_NAME
+        manifest_path.write_text(json.dumps({
+            'source': Path(img.filename).name if getattr(img, 'filename', None) else None,
+            'width': img.width,
+            'height': img.height,
+            'tile_size': tile_size,
+            'tiles': tiles,
+        }, ensure_ascii=False, indent=2), encoding='utf-8')
+
+        return TiledOutput(
+            output_path=manifest_path,
+            output_size=output_size,
+            mode=TileMode.SPLIT,
+            tiles=tiles,
+            streamed=self.is_streamable(img),
+            output_width=img.width,
+            output_height=img.height,
+        )
+
+    def _downscale(
+        self,
+        img: Image.Image,
+        output_path: Path,
+        policy: TilingPolicy,
+        save_params: dict
+    ) -> TiledOutput:
+        """逐条带缩小后拼接为一张不超过尺寸上限的WebP"""
+        scale = min(1.0, policy.max_dimension / max(img.size))
+        if policy.max_pixels is not None:
+            scale = min(scale, math.sqrt(policy.max_pixels / (img.width * img.height)))
+        target_size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        streamed = self.is_streamable(img)
+
+        # 压缩格式只能整张解码,JPEG可在DCT域先降采样
+        if not streamed and img.format == 'JPEG':
+            img.draft('RGB', target_size)
+        scale_y = target_size[1] / img.height
+
+        canvas = None
+        for top, strip in self.iter_strips(img, policy.strip_height):
+            if strip.mode not in ('RGB', 'RGBA'):
+                strip = strip.convert('RGBA' if strip.has_transparency_data else 'RGB')
+            if canvas is None:
+                canvas = Image.new(strip.mode, target_size)
+            target_top = round(top * scale_y)
+            target_bottom = round((top + strip.height) * scale_y)
+            if target_bottom > target_top:
+                canvas.paste(
+                    strip.resize(
+                        (target_size[0], target_bottom - target_top),
+                        Image.Resampling.LANCZOS
+                    ),
+                    (0, target_top)
+                )
+            del strip
+
+        data = self._encode(canvas, save_params)
+        output_path.write_bytes(data)
+
+        return TiledOutput(
+            output_path=output_path,
+            output_size=len(data),
+            mode=TileMode.DOWNSCALE,
+            streamed=streamed,
+            output_width=target_size[0],
+            output_height=target_size[1],
+        )
+
+    def _raw_layout(self, img: Image.Image):
+        """
+        返回未压缩raw块的(偏移, rawmode, 行跨度, 行方向),不可直接读取时返回None
+        """
+        if not getattr(img, 'filename', None):
+            return None
+        return raw_layout(img)
+
+    def _read_raw_strip(
+        self,
+        img: Image.Image,
+        layout: tuple,
+        top: int,
+        bottom: int
+    ) -> Image.Image:
+        """按偏移读取[top, bottom)行的原始数据并构造条带图片"""
+        offset, rawmode, stride, orientation = layout
+        # 自下而上存储时,条带在文件中的起始行是倒数第bottom行
+        first_row = top if orientation > 0 else img.height - bottom
+        with open(img.filename, 'rb') as fp:
+            fp.seek(offset + first_row * stride)
+            data = fp.read((bottom - top) * stride)
+
+        strip = Image.frombytes(
+            img.mode, (img.width, bottom - top), data, 'raw', rawmode, stride, orientation
+        )
+        if img.mode == 'P':
+            strip.putpalette(img.getpalette())
+        return strip
+
+    def _encode(self, img: Image.Image, save_params: dict) -> bytes:
+        """在内存中编码一个分块"""
+        buffer = io.BytesIO()
+        img.save(buffer, format='WEBP', **save_params)
+        return buffer.getvalue()
@@ -42,6 +42,7 @@ class ErrorCode(Enum):
     # 系统错误
     WEBP_NOT_SUPPORTED = "webp_not_supported"
     MEMORY_INSUFFICIENT = "memory_insufficient"
+    DECODE_LIMIT_EXCEEDED = "decode_limit_exceeded"
     UNKNOWN_ERROR = "unknown_error"
 
 
@@ -75,6 +76,7 @@ class ErrorMessages:
 
         ErrorCode.WEBP_NOT_SUPPORTED: "系统不支持WebP格式,请重新安装Pillow库",
         ErrorCode.MEMORY_INSUFFICIENT: "内存不足,无法处理此图片",
+        ErrorCode.DECODE_LIMIT_EXCEEDED: "图片尺寸过大({width}x{height}),解码约需{megabytes}MB内存,超出安全上限",
         ErrorCode.UNKNOWN_ERROR: "发生未知错误,请稍后重试",
     }
 
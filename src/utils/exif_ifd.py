@@ -0,0 +1,279 @@
+"""
+EXIF IFD工具
+
+在TIFF/IFD层面过滤EXIF数据: 只解析IFD目录项,按需删除缩略图(IFD1)、
+GPS子IFD或除指定标签外的全部内容,再紧凑地重新排布写出;
+并提供方向标签的读取和原位改写。
+标签值按原始字节复制,不做解码/编码。
+
+注意: MakerNote按原样复制;部分厂商MakerNote内部使用相对TIFF头的偏移,
+重新排布后可能失效(与Pillow的Exif.tobytes行为相同)。
+"""
+
+import struct
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+EXIF_PREFIX = b'Exif\x00\x00'
+
+TAG_ORIENTATION = 0x0112
+TAG_EXIF_IFD = 0x8769
+TAG_GPS_IFD = 0x8825
+TAG_INTEROP_IFD = 0xA005
+TAG_THUMBNAIL_OFFSET = 0x0201
+TAG_THUMBNAIL_LENGTH = 0x0202
+
+# 指向子IFD的标签
+POINTER_TAGS = (TAG_EXIF_IFD, TAG_GPS_IFD, TAG_INTEROP_IFD)
+
+# TIFF数据类型 -> 单个值的字节数
+TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 13: 4}
+
+# 子IFD最大嵌套深度,防止损坏数据造成循环
+_MAX_DEPTH = 4
+
+
+@dataclass
+class _Entry:
+    tag: int
+    type: int
+    count: int
+    value: bytes
+    sub: Optional["_Ifd"] = None
+
+
+@dataclass
+class _Ifd:
+    entries: list[_Entry] = field(default_factory=list)
+    offset: int = 0
+
+
+def filter_exif(
+    data: bytes,
+    strip_thumbnail: bool = False,
+    strip_gps: bool = False,
+    keep_tags: Optional[set[int]] = None
+) -> Optional[bytes]:
+    """
+    在IFD层面过滤EXIF
+
+    参数:
+        data: EXIF字节(可带"Exif\\0\\0"前缀,输出保持相同形式)
+        strip_thumbnail: 删除IFD1缩略图
+        strip_gps: 删除GPS子IFD
+        keep_tags: 只保留IFD0中的这些标签(同时删除全部子IFD和缩略图)
+
+    返回:
+        过滤后的EXIF字节;过滤后不剩任何标签时返回None;
+        无法解析时原样返回data
+    """
+    prefix = EXIF_PREFIX if data.startswith(EXIF_PREFIX) else b''
+    tiff = data[len(prefix):]
+
+    try:
+        endian = _endian(tiff)
+        ifd0_offset = struct.unpack(endian + 'I', tiff[4:8])[0]
+        ifd0, ifd1_offset = _read_ifd(tiff, ifd0_offset, endian, 0)
+        ifd1, thumbnail = None, None
+        if ifd1_offset and not (strip_thumbnail or keep_tags is not None):
+            ifd1, _ = _read_ifd(tiff, ifd1_offset, endian, _MAX_DEPTH)
+            thumbnail = _read_thumbnail(tiff, ifd1, endian)
+    except (ValueError, struct.error, IndexError):
+        return data
+
+    if keep_tags is not None:
+        ifd0.entries = [
+            entry for entry in ifd0.entries
+            if entry.tag in keep_tags and entry.sub is None
+        ]
+    elif strip_gps:
+        ifd0.entries = [entry for entry in ifd0.entries if entry.tag != TAG_GPS_IFD]
+
+    if not ifd0.entries and ifd1 is None:
+        return None
+    return prefix + _write_tiff(ifd0, ifd1, thumbnail, endian)
+
+
+def get_orientation(data: Optional[bytes]) -> int:
+    """
+    读取IFD0中的方向标签(只扫描IFD0目录,不解析子IFD)
+
+    参数:
+        data: EXIF字节(可带"Exif\\0\\0"前缀),可为None
+
+    返回:
+        方向值1-8;没有方向标签或无法解析时返回1
+    """
+    if not data:
+        return 1
+    tiff = data[len(EXIF_PREFIX):] if data.startswith(EXIF_PREFIX) else data
+    try:
+        endian, position = _find_ifd0_entry(tiff, TAG_ORIENTATION)
+    except (ValueError, struct.error, IndexError):
+        return 1
+    if position is None:
+        return 1
+    (orientation,) = struct.unpack(endian + 'H', tiff[position + 8:position + 10])
+    return orientation if 1 <= orientation <= 8 else 1
+
+
+def set_orientation(data: bytes, orientation: int) -> bytes:
+    """
+    原位改写IFD0中的方向标签值,不重新排布EXIF
+
+    参数:
+        data: EXIF字节(可带"Exif\\0\\0"前缀)
+        orientation: 新的方向值
+
+    返回:
+        改写后的EXIF字节;没有方向标签或无法解析时原样返回data
+    """
+    offset = len(EXIF_PREFIX) if data.startswith(EXIF_PREFIX) else 0
+    tiff = data[offset:]
+    try:
+        endian, position = _find_ifd0_entry(tiff, TAG_ORIENTATION)
+    except (ValueError, struct.error, IndexError):
+        return data
+    if position is None:
+        return data
+    out = bytearray(data)
+    struct.pack_into(endian + 'H', out, offset + position + 8, orientation)
+    return bytes(out)
+
+
+def _find_ifd0_entry(tiff: bytes, tag: int) -> tuple[str, Optional[int]]:
+    """返回(字节序, IFD0中SHORT类型标签目录项的偏移);找不到时偏移为None"""
+    endian = _endian(tiff)
+    (offset,) = struct.unpack(endian + 'I', tiff[4:8])
+    (count,) = struct.unpack(endian + 'H', tiff[offset:offset + 2])
+    for index in range(count):
+        position = offset + 2 + 12 * index
+        entry_tag, value_type = struct.unpack(endian + 'HH', tiff[position:position + 4])
+        if entry_tag == tag and value_type == 3:
+            if position + 12 > len(tiff):
+                raise ValueError("标签数据越界")
+            return endian, position
+    return endian, None
+
+
+def _endian(tiff: bytes) -> str:
+    if tiff[:4] == b'II*\x00':
+        return '<'
+    if tiff[:4] == b'MM\x00*':
+        return '>'
+    raise ValueError("不是有效的TIFF头")
+
+
+def _read_ifd(tiff: bytes, offset: int, endian: str, depth: int) -> tuple[_Ifd, int]:
+    """读取一个IFD,返回(IFD, 下一个IFD偏移)"""
+    (count,) = struct.unpack(endian + 'H', tiff[offset:offset + 2])
+    ifd = _Ifd()
+    position = offset + 2
+    for _ in range(count):
+        tag, value_type, value_count, raw = struct.unpack(
+            endian + 'HHI4s', tiff[position:position + 12]
+        )
+        position += 12
+        size = TYPE_SIZES.get(value_type, 1) * value_count
+        if size <= 4:
+            value = raw[:size]
+        else:
+            (value_offset,) = struct.unpack(endian + 'I', raw)
+            value = tiff[value_offset:value_offset + size]
+            if len(value) != size:
+                raise ValueError("标签数据越界")
+
+        entry = _Entry(tag, value_type, value_count, value)
+        if tag in POINTER_TAGS and depth < _MAX_DEPTH:
+            (sub_offset,) = struct.unpack(endian + 'I', raw)
+            entry.sub, _ = _read_ifd(tiff, sub_offset, endian, depth + 1)
+        ifd.entries.append(entry)
+
+    (next_offset,) = struct.unpack(endian + 'I', tiff[position:position + 4])
+    return ifd, next_offset
+
+
+def _read_thumbnail(tiff: bytes, ifd1: _Ifd, endian: str) -> Optional[bytes]:
+    values = {entry.tag: entry for entry in ifd1.entries}
+    if TAG_THUMBNAIL_OFFSET not in values or TAG_THUMBNAIL_LENGTH not in values:
+        return None
+    offset = _int_value(values[TAG_THUMBNAIL_OFFSET], endian)
+    length = _int_value(values[TAG_THUMBNAIL_LENGTH], endian)
+    return tiff[offset:offset + length]
+
+
+def _int_value(entry: _Entry, endian: str) -> int:
+    code = 'H' if entry.type == 3 else 'I'
+    return struct.unpack(endian + code, entry.value[:struct.calcsize(code)])[0]
+
+
+def _pad(size: int) -> int:
+    return size + (size & 1)
+
+
+def _ifd_size(ifd: _Ifd) -> int:
+    data_size = sum(_pad(len(entry.value)) for entry in ifd.entries if len(entry.value) > 4)
+    return 2 + 12 * len(ifd.entries) + 4 + data_size
+
+
+def _layout(ifd: _Ifd, offset: int) -> int:
+    """为IFD及其子IFD分配偏移,返回下一个空闲偏移"""
+    ifd.offset = offset
+    offset += _ifd_size(ifd)
+    for entry in ifd.entries:
+        if entry.sub is not None:
+            offset = _layout(entry.sub, offset)
+    return offset
+
+
+def _write_tiff(
+    ifd0: _Ifd,
+    ifd1: Optional[_Ifd],
+    thumbnail: Optional[bytes],
+    endian: str
+) -> bytes:
+    header = (b'II*\x00' if endian == '<' else b'MM\x00*') + struct.pack(endian + 'I', 8)
+    end = _layout(ifd0, 8)
+    thumbnail_offset = 0
+    if ifd1 is not None:
+        end = _layout(ifd1, end)
+        if thumbnail:
+            thumbnail_offset = end
+            end += len(thumbnail)
+
+    out = bytearray(end)
+    out[:8] = header
+    _write_ifd(out, ifd0, endian, ifd1.offset if ifd1 is not None else 0, thumbnail_offset)
+    if ifd1 is not None:
+        _write_ifd(out, ifd1, endian, 0, thumbnail_offset)
+        if thumbnail:
+            out[thumbnail_offset:thumbnail_offset + len(thumbnail)] = thumbnail
+    return bytes(out)
+
+
+def _write_ifd(out: bytearray, ifd: _Ifd, endian: str, next_offset: int, thumbnail_offset: int):
+    entries = sorted(ifd.entries, key=lambda entry: entry.tag)
+    position = ifd.offset
+    data_offset = ifd.offset + 2 + 12 * len(entries) + 4
+
+    struct.pack_into(endian + 'H', out, position, len(entries))
+    position += 2
+    for entry in entries:
+        if entry.sub is not None:
+            raw = struct.pack(endian + 'I', entry.sub.offset)
+        elif entry.tag == TAG_THUMBNAIL_OFFSET and thumbnail_offset:
+            raw = struct.pack(endian + 'I', thumbnail_offset)
+        elif len(entry.value) > 4:
+            raw = struct.pack(endian + 'I', data_offset)
+            out[data_offset:data_offset + len(entry.value)] = entry.value
+            data_offset += _pad(len(entry.value))
+        else:
+            raw = entry.value.ljust(4, b'\x00')
+        struct.pack_into(endian + 'HHI4s', out, position, entry.tag, entry.type, entry.count, raw)
+        position += 12
+    struct.pack_into(endian + 'I', out, position, next_offset)
+
+    for entry in entries:
+        if entry.sub is not None:
+            _write_ifd(out, entry.sub, endian, 0, thumbnail_offset)
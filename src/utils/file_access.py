@@ -0,0 +1,79 @@
+"""
+文件访问工具
+
+大文件用只读mmap映射后交给Pillow,解码时直接从页缓存复制,而不是发出大量小read();
+并封装posix_fadvise: 预读即将处理的文件(SEQUENTIAL+WILLNEED),处理完后释放其页缓存
+(DONTNEED),避免多GB批次挤掉系统中其他进程的缓存。
+不支持的平台(如Windows没有posix_fadvise)上这些函数不做任何事。
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def map_file(file_path: str | Path) -> Optional[mmap.mmap]:
+    """
+    只读映射整个文件
+
+    参数:
+        file_path: 文件路径
+
+    返回:
+        mmap对象(支持read/seek/tell,可直接传给Image.open;用完需close);
+        空文件或映射失败时返回None
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return mapped
+
+
+def prefetch(file_path: str | Path) -> bool:
+    """
+    提示内核顺序读取并提前把文件读入页缓存(异步,不阻塞)
+
+    参数:
+        file_path: 文件路径
+
+    返回:
+        是否成功发出提示
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    return _fadvise(file_path, os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED)
+
+
+def release(file_path: str | Path) -> bool:
+    """
+    提示内核丢弃文件在页缓存中的干净页
+
+    参数:
+        file_path: 文件路径
+
+    返回:
+        是否成功发出提示
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    return _fadvise(file_path, os.POSIX_FADV_DONTNEED)
+
+
+def _fadvise(file_path: str | Path, *advices: int) -> bool:
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        for advice in advices:
+            os.posix_fadvise(fd, 0, 0, advice)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
@@ -0,0 +1,150 @@
+"""
+图片头解析工具
+
+只读取文件头部字节解析PNG/GIF/BMP/JPEG/WebP的尺寸和通道数,
+在任何像素数据被读取之前估算解码所需内存。
+"""
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+
+@dataclass
+class ImageHeader:
+    """图片头信息"""
+    format: str
+    width: int
+    height: int
+    # 解码后每像素的通道数
+    bands: int
+    # 每个通道的字节数(16位PNG为2)
+    bytes_per_sample: int = 1
+    # 像素数据未压缩、可按偏移直接读取条带(如BI_RGB的BMP)
+    streamable: bool = False
+
+    @property
+    def pixel_count(self) -> int:
+        """像素总数"""
+        return self.width * self.height
+
+    @property
+    def decode_bytes(self) -> int:
+        """解码整张图片所需的估计内存(字节)"""
+        return self.pixel_count * self.bands * self.bytes_per_sample
+
+
+# PNG颜色类型 -> 通道数
+_PNG_BANDS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# JPEG中不带长度字段的独立标记
+_JPEG_STANDALONE = {0x01} | set(range(0xD0, 0xDA))
+# JPEG帧头(SOFn)标记,不含DHT(C4)、JPG(C8)和DAC(CC)
+_JPEG_SOF = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# BMP未压缩编码: BI_RGB和BI_BITFIELDS
+_BMP_RAW_COMPRESSION = (0, 3)
+
+
+def read_image_header(file_path: str | Path) -> Optional[ImageHeader]:
+    """
+    解析图片文件头
+
+    参数:
+        file_path: 图片文件路径
+
+    返回:
+        ImageHeader,格式不识别或文件头不完整时返回None
+    """
+    try:
+        with open(file_path, 'rb') as fp:
+            head = fp.read(32)
+            if head.startswith(b'\x89PNG\r\n\x1a\n'):
+                return _parse_png(head)
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                return _parse_gif(head)
+            if head.startswith(b'BM'):
+                return _parse_bmp(head + fp.read(32))
+            if head.startswith(b'\xff\xd8'):
+                return _parse_jpeg(fp)
+            if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                return _parse_webp(head)
+    except (OSError, struct.error):
+        return None
+    return None
+
+
+def _parse_png(head: bytes) -> Optional[ImageHeader]:
+    if head[12:16] != b'IHDR':
+        return None
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', head[16:26])
+    return ImageHeader(
+        format='PNG',
+        width=width,
+        height=height,
+        bands=_PNG_BANDS.get(color_type, 4),
+        bytes_per_sample=2 if bit_depth == 16 else 1,
+    )
+
+
+def _parse_gif(head: bytes) -> ImageHeader:
+    width, height = struct.unpack('<HH', head[6:10])
+    return ImageHeader(format='GIF', width=width, height=height, bands=1)
+
+
+def _parse_bmp(head: bytes) -> ImageHeader:
+    header_size = struct.unpack('<I', head[14:18])[0]
+    if header_size == 12:
+        # OS/2 BITMAPCOREHEADER
+        width, height, _, bits = struct.unpack('<HHHH', head[18:26])
+        compression = 0
+    else:
+        width, height, _, bits, compression = struct.unpack('<iiHHI', head[18:34])
+    return ImageHeader(
+        format='BMP',
+        width=abs(width),
+        height=abs(height),
+        bands=4 if bits == 32 else (3 if bits > 8 else 1),
+        streamable=compression in _BMP_RAW_COMPRESSION,
+    )
+
+
+def _parse_jpeg(fp: BinaryIO) -> Optional[ImageHeader]:
+    """依次跳过各段直到帧头(SOFn),不读取压缩数据"""
+    fp.seek(2)
+    while True:
+        marker = fp.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:
+            # 填充字节
+            fp.seek(-1, 1)
+            continue
+        if code in _JPEG_STANDALONE:
+            continue
+        if code == 0xDA:
+            # 扫描数据开始仍未找到帧头
+            return None
+        length = struct.unpack('>H', fp.read(2))[0]
+        if code in _JPEG_SOF:
+            _, height, width, components = struct.unpack('>BHHB', fp.read(6))
+            return ImageHeader(format='JPEG', width=width, height=height, bands=components)
+        fp.seek(length - 2, 1)
+
+
+def _parse_webp(head: bytes) -> Optional[ImageHeader]:
+    chunk = head[12:16]
+    if chunk == b'VP8X':
+        flags = head[20]
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return ImageHeader(format='WEBP', width=width, height=height, bands=4 if flags & 0x10 else 3)
+    if chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        return ImageHeader(format='WEBP', width=width, height=height, bands=4 if bits >> 28 & 1 else 3)
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', head[26:30])
+        return ImageHeader(format='WEBP', width=width & 0x3FFF, height=height & 0x3FFF, bands=3)
+    return None
@@ -0,0 +1,101 @@
+"""
+图片打开工具
+
+只预先注册支持的五种格式插件(JPEG/PNG/GIF/BMP/WEBP),并按扩展名向
+Image.open传入formats提示,避免Image.init()加载全部插件和逐个试探格式。
+扩展名与内容不符时才退回Pillow的完整格式扫描。
+"""
+
+import io
+import mmap
+import os
+import threading
+from pathlib import Path
+from PIL import Image, UnidentifiedImageError
+
+
+# 扩展名 -> Pillow格式名
+EXTENSION_FORMATS = {
+    '.jpg': 'JPEG',
+    '.jpeg': 'JPEG',
+    '.png': 'PNG',
+    '.gif': 'GIF',
+    '.bmp': 'BMP',
+    '.webp': 'WEBP',
+}
+
+SUPPORTED_FORMATS = ('JPEG', 'PNG', 'GIF', 'BMP', 'WEBP')
+
+_plugins_ready = False
+_plugins_lock = threading.Lock()
+
+
+def preinit_plugins() -> None:
+    """
+    只导入支持格式的Pillow插件
+
+    导入插件模块即会在Image.OPEN中注册格式;Image.preinit()不包含WebP,
+    而formats提示中的格式未注册时Pillow会调用init()加载全部插件。
+    """
+    global _plugins_ready
+    if _plugins_ready:
+        return
+    with _plugins_lock:
+        if not _plugins_ready:
+            from PIL import (  # noqa: F401
+                BmpImagePlugin,
+                GifImagePlugin,
+                JpegImagePlugin,
+                PngImagePlugin,
+                WebPImagePlugin,
+            )
+            _plugins_ready = True
+
+
+def format_hint(file_path: str | Path) -> str | None:
+    """
+    根据扩展名返回格式提示
+
+    参数:
+        file_path: 图片文件路径
+
+    返回:
+        Pillow格式名,扩展名不在支持列表中时返回None
+    """
+    return EXTENSION_FORMATS.get(os.path.splitext(file_path)[1].lower())
+
+
+def open_image(file_path: str | Path, data: bytes | mmap.mmap | None = None) -> Image.Image:
+    """
+    按扩展名提示打开图片
+
+    参数:
+        file_path: 图片文件路径
+        data: 已读入内存的文件内容或文件的mmap映射;提供时从内存打开,
+            file_path只用于格式提示
+
+    返回:
+        Image.open返回的图片对象(尚未解码像素)
+
+    异常:
+        与Image.open相同;提示格式无法识别时退回完整扫描后仍失败则抛出
+        UnidentifiedImageError
+    """
+    preinit_plugins()
+    hint = format_hint(file_path)
+    if hint is not None:
+        try:
+            return Image.open(_source(file_path, data), formats=[hint])
+        except UnidentifiedImageError:
+            # 扩展名与实际内容不符(如PNG内容的.jpg文件)
+            pass
+    return Image.open(_source(file_path, data))
+
+
+def _source(file_path: str | Path, data: bytes | mmap.mmap | None):
+    if data is None:
+        return file_path
+    if isinstance(data, mmap.mmap):
+        data.seek(0)
+        return data
+    return io.BytesIO(data)
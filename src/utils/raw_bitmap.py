@@ -0,0 +1,65 @@
+"""
+未压缩位图工具
+
+对Pillow识别为单个raw块的图片(如未压缩的24/32位BMP),直接用Image.frombuffer
+从文件的mmap映射构造像素图片,跳过Pillow解码器逐块read()再解包的过程。
+rawmode与图片模式相同(如8位L/P)时Pillow直接引用映射内存(零复制);
+BGR/BGRX等需要调整通道顺序的格式由frombuffer从映射页一次解包。
+行跨度和自下而上的行顺序由raw参数(stride, orientation)处理。
+"""
+
+import mmap
+from typing import Optional
+from PIL import Image
+
+
+def raw_layout(img: Image.Image) -> Optional[tuple[int, str, int, int]]:
+    """
+    返回未压缩raw块的布局
+
+    参数:
+        img: 已打开(未解码)的Pillow图片对象
+
+    返回:
+        (像素数据偏移, rawmode, 行跨度, 行方向);不是覆盖整张图片的单个raw块时返回None
+    """
+    if len(img.tile) != 1:
+        return None
+    codec, extents, offset, args = img.tile[0][:4]
+    if codec != 'raw' or tuple(extents) != (0, 0, img.width, img.height):
+        return None
+    if not isinstance(args, tuple) or len(args) != 3:
+        return None
+    rawmode, stride, orientation = args
+    if stride <= 0:
+        return None
+    return offset, rawmode, stride, orientation
+
+
+def map_raw_image(img: Image.Image, mapped: mmap.mmap) -> Optional[Image.Image]:
+    """
+    从文件映射直接构造像素图片,代替img.load()
+
+    返回的图片可能引用映射内存,映射必须在图片使用完毕后才能关闭。
+
+    参数:
+        img: 用该映射打开的Pillow图片对象(只使用其文件头信息)
+        mapped: 整个文件的只读mmap映射
+
+    返回:
+        与img.load()结果相同的图片对象;布局不适用或数据不完整时返回None
+    """
+    layout = raw_layout(img)
+    if layout is None:
+        return None
+    offset, rawmode, stride, orientation = layout
+    if offset + stride * img.height > len(mapped):
+        return None
+
+    pixels = Image.frombuffer(
+        img.mode, img.size, memoryview(mapped)[offset:], 'raw', rawmode, stride, orientation
+    )
+    if img.mode == 'P':
+        pixels.putpalette(img.getpalette())
+    pixels.info = dict(img.info)
+    return pixels
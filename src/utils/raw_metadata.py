@@ -0,0 +1,145 @@
+"""
+原始元数据读取工具
+
+直接从文件读取JPEG的APP1(EXIF/XMP)、APP2(ICC,可分多段)标记段和
+PNG的eXIf/iTXt/iCCP块,遇到第一个扫描段(SOS)或IDAT即停止,
+不创建Pillow图片对象也不初始化解码器,适合批量建立目录或预检。
+
+返回值与Pillow的info保持一致: exif带"Exif\\0\\0"前缀,xmp和icc_profile为原始字节。
+格式错误的iCCP/iTXt块(缺少NUL分隔符、压缩数据损坏)被跳过,其余字段照常返回。
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from src.models.image_metadata import ImageMetadata
+
+
+EXIF_PREFIX = b'Exif\x00\x00'
+XMP_PREFIX = b'http://ns.adobe.com/xap/1.0/\x00'
+ICC_PREFIX = b'ICC_PROFILE\x00'
+PNG_XMP_KEYWORD = b'XML:com.adobe.xmp'
+
+# JPEG中不带长度字段的独立标记
+_JPEG_STANDALONE = {0x01} | set(range(0xD0, 0xD8))
+
+
+def read_raw_metadata(file_path: str | Path) -> Optional[ImageMetadata]:
+    """
+    从JPEG/PNG文件头部读取元数据
+
+    参数:
+        file_path: 图片文件路径
+
+    返回:
+        ImageMetadata;单个元数据块格式错误时只缺少对应字段。
+        不是JPEG/PNG或文件结构损坏时返回None(调用方可回退到Pillow)
+    """
+    try:
+        with open(file_path, 'rb') as fp:
+            signature = fp.read(8)
+            if signature.startswith(b'\xff\xd8'):
+                fp.seek(2)
+                return _read_jpeg(fp)
+            if signature == b'\x89PNG\r\n\x1a\n':
+                return _read_png(fp)
+    except (OSError, struct.error, zlib.error, IndexError, ValueError):
+        return None
+    return None
+
+
+def _read_jpeg(fp: BinaryIO) -> Optional[ImageMetadata]:
+    exif = None
+    xmp = None
+    icc_segments: dict[int, bytes] = {}
+    icc_total = 0
+
+    while True:
+        marker = fp.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:
+            # 填充字节
+            fp.seek(-1, 1)
+            continue
+        if code in _JPEG_STANDALONE:
+            continue
+        if code in (0xDA, 0xD9):
+            # 扫描数据(或图像结束),元数据段都在此之前
+            break
+
+        length = struct.unpack('>H', fp.read(2))[0]
+        if code == 0xE1:
+            payload = fp.read(length - 2)
+            if payload.startswith(EXIF_PREFIX) and exif is None:
+                exif = payload
+            elif payload.startswith(XMP_PREFIX) and xmp is None:
+                xmp = payload[len(XMP_PREFIX):]
+        elif code == 0xE2:
+            payload = fp.read(length - 2)
+            if payload.startswith(ICC_PREFIX):
+                # 序号(从1开始)和总段数各占1字节
+                sequence, icc_total = payload[12], payload[13]
+                icc_segments[sequence] = payload[14:]
+        else:
+            fp.seek(length - 2, 1)
+
+    icc_profile = None
+    if icc_segments and len(icc_segments) == icc_total:
+        icc_profile = b''.join(icc_segments[index] for index in sorted(icc_segments))
+
+    return ImageMetadata(exif=exif, xmp=xmp, icc_profile=icc_profile)
+
+
+def _read_png(fp: BinaryIO) -> Optional[ImageMetadata]:
+    exif = None
+    xmp = None
+    icc_profile = None
+
+    while True:
+        header = fp.read(8)
+        if len(header) < 8:
+            return None
+        length, chunk_type = struct.unpack('>I4s', header)
+        if chunk_type in (b'IDAT', b'IEND'):
+            break
+
+        if chunk_type == b'eXIf':
+            exif = EXIF_PREFIX + fp.read(length)
+        elif chunk_type == b'iCCP':
+            icc_profile = _parse_iccp(fp.read(length)) or icc_profile
+        elif chunk_type == b'iTXt':
+            xmp = _parse_xmp_itxt(fp.read(length)) or xmp
+        else:
+            fp.seek(length, 1)
+        # CRC
+        fp.seek(4, 1)
+
+    return ImageMetadata(exif=exif, xmp=xmp, icc_profile=icc_profile)
+
+
+def _parse_iccp(data: bytes) -> Optional[bytes]:
+    """解析iCCP块,格式错误时返回None"""
+    try:
+        _, rest = data.split(b'\x00', 1)
+        # rest[0]为压缩方法(只定义了0=zlib)
+        return zlib.decompress(rest[1:])
+    except (ValueError, zlib.error):
+        return None
+
+
+def _parse_xmp_itxt(data: bytes) -> Optional[bytes]:
+    """解析iTXt块中的XMP,不是XMP或格式错误时返回None"""
+    try:
+        keyword, rest = data.split(b'\x00', 1)
+        if keyword != PNG_XMP_KEYWORD:
+            return None
+        compressed = rest[0]
+        # 跳过压缩方法、语言标签和翻译关键字
+        _, _, text = rest[2:].split(b'\x00', 2)
+        return zlib.decompress(text) if compressed else text
+    except (ValueError, IndexError, zlib.error):
+        return None
@@ -0,0 +1,247 @@
+"""
+WebP RIFF块读写工具
+
+只读取RIFF块头即可列出WebP文件中的VP8X/ICCP/EXIF/XMP等块,
+并能在不重新编码的前提下添加、替换或删除元数据块(图像码流原样复制)。
+
+块顺序遵循WebP容器规范: VP8X, ICCP, 图像数据(ANIM/ANMF或ALPH+VP8/VP8L), EXIF, XMP。
+"""
+
+import io
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+
+ICCP = b'ICCP'
+EXIF = b'EXIF'
+XMP = b'XMP '
+VP8X = b'VP8X'
+METADATA_CHUNKS = (ICCP, EXIF, XMP)
+
+# VP8X标志位
+FLAG_ICC = 0x20
+FLAG_ALPHA = 0x10
+FLAG_EXIF = 0x08
+FLAG_XMP = 0x04
+FLAG_ANIMATION = 0x02
+
+EXIF_PREFIX = b'Exif\x00\x00'
+
+# write_webp_metadata参数的哨兵值: 保留原有块
+KEEP = object()
+
+
+@dataclass
+class WebPChunk:
+    """RIFF块头信息"""
+    fourcc: bytes
+    # 块数据(不含8字节块头)在文件中的偏移
+    offset: int
+    size: int
+
+
+def read_chunks(file_path: str | Path) -> list[WebPChunk]:
+    """
+    列出WebP文件的全部块(只读取块头,跳过块数据)
+
+    参数:
+        file_path: WebP文件路径
+
+    返回:
+        WebPChunk列表
+
+    异常:
+        ValueError: 不是有效的WebP RIFF文件
+    """
+    with open(file_path, 'rb') as fp:
+        return _read_chunk_headers(fp)
+
+
+def read_chunk_data(file_path: str | Path, chunk: WebPChunk) -> bytes:
+    """
+    读取单个块的数据
+
+    参数:
+        file_path: WebP文件路径
+        chunk: read_chunks返回的块
+
+    返回:
+        块数据字节
+    """
+    with open(file_path, 'rb') as fp:
+        fp.seek(chunk.offset)
+        return fp.read(chunk.size)
+
+
+def read_metadata_chunks(file_path: str | Path) -> dict[bytes, bytes]:
+    """
+    读取ICCP/EXIF/XMP块数据
+
+    参数:
+        file_path: WebP文件路径
+
+    返回:
+        {块类型: 块数据},只包含存在的元数据块
+    """
+    with open(file_path, 'rb') as fp:
+        result = {}
+        for chunk in _read_chunk_headers(fp):
+            if chunk.fourcc in METADATA_CHUNKS and chunk.fourcc not in result:
+                fp.seek(chunk.offset)
+                result[chunk.fourcc] = fp.read(chunk.size)
+        return result
+
+
+def write_webp_metadata(
+    file_path: str | Path,
+    output_path: Optional[str | Path] = None,
+    *,
+    exif=KEEP,
+    xmp=KEEP,
+    icc_profile=KEEP
+) -> int:
+    """
+    添加、替换或删除WebP元数据块,图像码流原样复制
+
+    每个元数据参数: KEEP保留原块,None或b''删除,字节串替换为新数据。
+    exif可带或不带"Exif\\0\\0"前缀,写入时去掉前缀(与Pillow一致)。
+    先写入同目录的临时文件再替换目标: 中途失败不会留下半截文件,
+    目标是硬链接时也只替换这一个路径,不会改动链接到同一inode的其他文件。
+
+    参数:
+        file_path: 源WebP文件路径
+        output_path: 输出路径,None表示原地改写
+        exif: EXIF数据
+        xmp: XMP数据
+        icc_profile: ICC配置文件数据
+
+    返回:
+        写入的文件字节数
+    """
+    data = rewrite_webp_metadata(
+        Path(file_path).read_bytes(), exif=exif, xmp=xmp, icc_profile=icc_profile
+    )
+    target = Path(output_path or file_path)
+    temp_path = target.with_name(f'{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        temp_path.write_bytes(data)
+        os.replace(temp_path, target)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return len(data)
+
+
+def rewrite_webp_metadata(data: bytes, *, exif=KEEP, xmp=KEEP, icc_profile=KEEP) -> bytes:
+    """
+    在内存中添加、替换或删除WebP元数据块(参数含义同write_webp_metadata)
+
+    参数:
+        data: WebP文件字节
+        exif: EXIF数据
+        xmp: XMP数据
+        icc_profile: ICC配置文件数据
+
+    返回:
+        新的WebP文件字节
+    """
+    chunks = _read_chunk_headers(io.BytesIO(data))
+    payloads = [
+        (chunk.fourcc, data[chunk.offset:chunk.offset + chunk.size]) for chunk in chunks
+    ]
+
+    metadata = {fourcc: payload for fourcc, payload in payloads if fourcc in METADATA_CHUNKS}
+    for fourcc, value in ((EXIF, exif), (XMP, xmp), (ICCP, icc_profile)):
+        if value is KEEP:
+            continue
+        if value and fourcc == EXIF and value.startswith(EXIF_PREFIX):
+            value = value[len(EXIF_PREFIX):]
+        if value:
+            metadata[fourcc] = bytes(value)
+        else:
+            metadata.pop(fourcc, None)
+
+    vp8x = next((payload for fourcc, payload in payloads if fourcc == VP8X), None)
+    image_chunks = [
+        (fourcc, payload) for fourcc, payload in payloads
+        if fourcc != VP8X and fourcc not in METADATA_CHUNKS
+    ]
+
+    body = bytearray()
+    if metadata or _vp8x_required(image_chunks):
+        flags, canvas = _vp8x_fields(vp8x, image_chunks)
+        flags &= ~(FLAG_ICC | FLAG_EXIF | FLAG_XMP)
+        flags |= (
+            (FLAG_ICC if ICCP in metadata else 0)
+            | (FLAG_EXIF if EXIF in metadata else 0)
+            | (FLAG_XMP if XMP in metadata else 0)
+        )
+        body += _chunk(VP8X, bytes([flags, 0, 0, 0]) + canvas)
+        if ICCP in metadata:
+            body += _chunk(ICCP, metadata[ICCP])
+        for fourcc, payload in image_chunks:
+            body += _chunk(fourcc, payload)
+        for fourcc in (EXIF, XMP):
+            if fourcc in metadata:
+                body += _chunk(fourcc, metadata[fourcc])
+    else:
+        # 只剩单个VP8/VP8L块时使用简单格式(VP8L自带透明通道)
+        for fourcc, payload in image_chunks:
+            body += _chunk(fourcc, payload)
+
+    return b'RIFF' + struct.pack('<I', len(body) + 4) + b'WEBP' + bytes(body)
+
+
+def _read_chunk_headers(fp: BinaryIO) -> list[WebPChunk]:
+    header = fp.read(12)
+    if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WEBP':
+        raise ValueError("不是有效的WebP文件")
+    riff_end = 8 + struct.unpack('<I', header[4:8])[0]
+
+    chunks = []
+    position = 12
+    while position + 8 <= riff_end:
+        fp.seek(position)
+        chunk_header = fp.read(8)
+        if len(chunk_header) < 8:
+            break
+        fourcc, size = chunk_header[:4], struct.unpack('<I', chunk_header[4:])[0]
+        chunks.append(WebPChunk(fourcc=fourcc, offset=position + 8, size=size))
+        # 块数据按偶数字节对齐
+        position += 8 + size + (size & 1)
+    return chunks
+
+
+def _chunk(fourcc: bytes, data: bytes) -> bytes:
+    padding = b'\x00' if len(data) & 1 else b''
+    return fourcc + struct.pack('<I', len(data)) + data + padding
+
+
+def _vp8x_required(image_chunks: list) -> bool:
+    """去掉元数据后是否仍需要扩展格式(ALPH透明、动画或其他块)"""
+    return len(image_chunks) != 1 or image_chunks[0][0] not in (b'VP8 ', b'VP8L')
+
+
+def _vp8x_fields(vp8x: Optional[bytes], image_chunks: list) -> tuple[int, bytes]:
+    """返回(VP8X标志, 6字节画布尺寸);简单格式时从图像码流解析尺寸"""
+    if vp8x is not None:
+        return vp8x[0], vp8x[4:10]
+
+    fourcc, data = image_chunks[0]
+    flags = 0
+    if fourcc == b'VP8L':
+        bits = int.from_bytes(data[1:5], 'little')
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        if bits >> 28 & 1:
+            flags |= FLAG_ALPHA
+    else:
+        width, height = struct.unpack('<HH', data[6:10])
+        width &= 0x3FFF
+        height &= 0x3FFF
+    canvas = (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little')
+    return flags, canvas
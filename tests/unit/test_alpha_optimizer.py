@@ -0,0 +1,114 @@
+"""
+AlphaOptimizer单元测试
+
+测试透明通道特征分析、丢弃全不透明通道和透明通道编码参数选择。
+"""
+
+import pytest
+from PIL import Image
+
+from src.models.alpha_policy import AlphaPolicy
+from src.models.image_file import ImageFile
+from src.services.alpha_optimizer import AlphaOptimizer, AlphaProfile
+from src.services.converter_service import ConverterService
+
+
+def _rgba(alpha_values):
+    """创建左右两半透明度不同的RGBA图片"""
+    img = Image.new('RGBA', (64, 64), (200, 40, 40, alpha_values[0]))
+    img.paste((40, 200, 40, alpha_values[1]), (32, 0, 64, 64))
+    return img
+
+
+@pytest.mark.parametrize("img, expected", [
+    (Image.new('RGB', (16, 16)), AlphaProfile.NONE),
+    (_rgba((255, 255)), AlphaProfile.OPAQUE),
+    (_rgba((0, 255)), AlphaProfile.BINARY),
+    (_rgba((128, 255)), AlphaProfile.GRADED),
+])
+def test_analyze_alpha_profile(img, expected):
+    """测试透明通道特征分类"""
+    assert AlphaOptimizer().analyze(img) == expected
+
+
+def test_analyze_palette_transparency():
+    """测试带transparency的调色板图片按透明通道分析"""
+    img = _rgba((0, 255)).convert('P')
+    img.info['transparency'] = 0
+    assert AlphaOptimizer().analyze(img) != AlphaProfile.NONE
+
+
+def test_optimize_drops_opaque_alpha():
+    """测试全不透明透明通道被丢弃"""
+    img, profile, params = AlphaOptimizer().optimize(_rgba((255, 255)), AlphaPolicy())
+
+    assert profile == AlphaProfile.OPAQUE
+    assert img.mode == 'RGB'
+    assert params == {}
+
+
+def test_optimize_keeps_opaque_alpha_when_disabled():
+    """测试关闭drop_opaque_alpha时保留透明通道"""
+    source = _rgba((255, 255))
+    img, _, _ = AlphaOptimizer().optimize(source, AlphaPolicy(drop_opaque_alpha=False))
+    assert img is source
+
+
+def test_optimize_binary_uses_binary_alpha_quality():
+    """测试二值透明通道使用binary_alpha_quality"""
+    policy = AlphaPolicy(alpha_quality=80, binary_alpha_quality=100, exact=True)
+
+    _, _, binary_params = AlphaOptimizer().optimize(_rgba((0, 255)), policy)
+    _, _, graded_params = AlphaOptimizer().optimize(_rgba((128, 255)), policy)
+
+    assert binary_params == {'alpha_quality': 100, 'exact': True}
+    assert graded_params == {'alpha_quality': 80, 'exact': True}
+
+
+def test_default_policy_lowers_binary_alpha_quality():
+    """测试默认策略对二值透明通道使用更低的alpha_quality"""
+    _, _, binary_params = AlphaOptimizer().optimize(_rgba((0, 255)), AlphaPolicy())
+    _, _, graded_params = AlphaOptimizer().optimize(_rgba((128, 255)), AlphaPolicy())
+
+    assert binary_params['alpha_quality'] < graded_params['alpha_quality']
+    assert graded_params['alpha_quality'] == 100
+
+
+def test_convert_binary_alpha_stays_exact(tmp_path):
+    """测试默认策略下二值透明通道转换后逐像素一致"""
+    source = _rgba((0, 255))
+    input_path = tmp_path / "binary.png"
+    source.save(input_path)
+
+    result = ConverterService().convert_image(
+        ImageFile.from_path(input_path),
+        tmp_path / "binary.webp",
+        quality=80,
+        alpha_policy=AlphaPolicy(),
+    )
+
+    assert result.success is True
+    assert result.encode_params['alpha_quality'] == AlphaPolicy().binary_alpha_quality
+    with Image.open(tmp_path / "binary.webp") as out:
+        assert out.getchannel('A').tobytes() == source.getchannel('A').tobytes()
+
+
+def test_convert_opaque_rgba_records_savings(tmp_path):
+    """测试转换全不透明RGBA图片时记录丢弃透明通道及节省量"""
+    input_path = tmp_path / "opaque.png"
+    _rgba((255, 255)).save(input_path)
+
+    result = ConverterService().convert_image(
+        ImageFile.from_path(input_path),
+        tmp_path / "opaque.webp",
+        quality=80,
+        alpha_policy=AlphaPolicy(measure_savings=True),
+    )
+
+    assert result.success is True
+    assert result.encode_params['alpha_profile'] == 'opaque'
+    assert result.encode_params['alpha_dropped'] is True
+    assert 'alpha' in result.stage_timings
+    assert 'bytes' in result.savings['alpha']
+    with Image.open(tmp_path / "opaque.webp") as out:
+        assert out.mode == 'RGB'
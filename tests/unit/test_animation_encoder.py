@@ -0,0 +1,100 @@
+"""
+AnimationEncoder单元测试
+
+测试动画帧计划(重复帧丢弃、时长合并、循环次数)和动画WebP编码。
+"""
+
+from PIL import Image
+
+from src.models.animation_policy import AnimationPolicy
+from src.models.image_file import ImageFile
+from src.services.animation_encoder import AnimationEncoder
+from src.services.converter_service import ConverterService
+
+
+# 相邻帧仅相差1个色阶(GIF编码器会合并完全相同的帧)
+COLORS = [(255, 0, 0), (254, 0, 0), (0, 0, 255), (0, 0, 254), (0, 0, 253), (0, 128, 0)]
+
+
+def _create_gif(path, colors=COLORS, loop=0):
+    frames = [Image.new('RGB', (32, 32), color) for color in colors]
+    params = {'loop': loop} if loop is not None else {}
+    frames[0].save(
+        path, format='GIF', save_all=True, append_images=frames[1:],
+        duration=100, **params
+    )
+
+
+def test_plan_drops_duplicate_frames(tmp_path):
+    """测试近似重复帧被丢弃且时长并入上一保留帧"""
+    path = tmp_path / "anim.gif"
+    _create_gif(path)
+
+    with Image.open(path) as img:
+        plan = AnimationEncoder().plan(img, AnimationPolicy())
+
+    assert plan.source_frames == 6
+    assert plan.frame_indices == [0, 2, 5]
+    assert plan.durations == [200, 300, 100]
+    assert plan.dropped_frames == 3
+    assert plan.loop == 0
+
+
+def test_plan_keeps_all_frames_when_disabled(tmp_path):
+    """测试关闭近似重复帧丢弃时保留全部帧"""
+    path = tmp_path / "anim.gif"
+    _create_gif(path)
+
+    with Image.open(path) as img:
+        plan = AnimationEncoder().plan(img, AnimationPolicy(drop_duplicate_frames=False))
+
+    assert plan.frame_indices == list(range(6))
+    assert plan.durations == [100] * 6
+
+
+def test_plan_gif_without_loop_plays_once(tmp_path):
+    """测试没有循环信息的GIF只播放一次"""
+    path = tmp_path / "once.gif"
+    _create_gif(path, loop=None)
+
+    with Image.open(path) as img:
+        assert AnimationEncoder().plan(img, AnimationPolicy()).loop == 1
+
+
+def test_convert_animated_gif(tmp_path):
+    """测试动画GIF转换为动画WebP"""
+    input_path = tmp_path / "anim.gif"
+    _create_gif(input_path)
+    output_path = tmp_path / "anim.webp"
+
+    result = ConverterService().convert_image(
+        ImageFile.from_path(input_path), output_path, quality=80
+    )
+
+    assert result.success is True
+    assert result.encode_params['frames'] == 3
+    assert result.encode_params['dropped_frames'] == 3
+    assert 'frames' in result.stage_timings
+    with Image.open(output_path) as output_img:
+        assert output_img.n_frames == 3
+        assert output_img.info['loop'] == 0
+        output_img.seek(1)
+        output_img.load()
+        assert output_img.info['duration'] == 300
+        assert output_img.convert('RGB').getpixel((16, 16)) == (0, 0, 255)
+
+
+def test_convert_first_frame_only_when_disabled(tmp_path):
+    """测试关闭动画时只转换第一帧"""
+    input_path = tmp_path / "anim.gif"
+    _create_gif(input_path)
+    output_path = tmp_path / "still.webp"
+
+    result = ConverterService().convert_image(
+        ImageFile.from_path(input_path), output_path, quality=80,
+        animation_policy=AnimationPolicy(animate=False)
+    )
+
+    assert result.success is True
+    with Image.open(output_path) as output_img:
+        assert getattr(output_img, 'n_frames', 1) == 1
@@ -0,0 +1,84 @@
+"""
+BatchReport单元测试
+
+测试批量转换报告的计数和汇总。
+"""
+
+from pathlib import Path
+
+from src.models.output_policy import OutputOutcome
+from src.services.converter_service import ConversionResult
+from src.services.batch_report import BatchReport
+
+
+def _result(outcome, size, **kwargs):
+    return ConversionResult(
+        success=True,
+        output_path=Path("out.webp"),
+        output_size=size,
+        duration=0.5,
+        outcome=outcome,
+        stage_timings={'decode': 0.1, 'encode': 0.3, 'write': 0.1},
+        **kwargs
+    )
+
+
+def test_batch_report_counts_outcomes():
+    """测试按输出结果类型计数"""
+    results = [
+        _result(OutputOutcome.WEBP_LOSSY, 100),
+        _result(OutputOutcome.WEBP_LOSSY, 200),
+        _result(OutputOutcome.WEBP_LOSSLESS, 50),
+        _result(OutputOutcome.ORIGINAL_KEPT, 300),
+        ConversionResult(success=False, error_message="转换已取消"),
+        ConversionResult(success=False, error_message="不支持的文件格式"),
+    ]
+
+    report = BatchReport.from_results(results)
+
+    assert report.total_count == 6
+    assert report.success_count == 4
+    assert report.cancelled_count == 1
+    assert report.failed_count == 1
+    assert report.output_bytes == 650
+    assert report.outcome_counts == {
+        'WEBP_LOSSY': 2,
+        'WEBP_LOSSLESS': 1,
+        'ORIGINAL_KEPT': 1,
+    }
+
+
+def test_batch_report_sums_stage_timings():
+    """测试各阶段耗时累加"""
+    report = BatchReport.from_results([
+        _result(OutputOutcome.WEBP_LOSSY, 100),
+        _result(OutputOutcome.WEBP_LOSSY, 100),
+    ])
+
+    assert report.stage_timings['encode'] == 0.6
+    assert report.total_duration == 1.0
+
+    summary = report.get_summary()
+    assert summary['outcome_counts'] == {'WEBP_LOSSY': 2}
+    assert summary['stage_timings']['decode'] == 0.2
+
+
+def test_batch_report_empty():
+    """测试空结果列表"""
+    report = BatchReport.from_results([])
+    assert report.total_count == 0
+    assert report.outcome_counts == {}
+
+
+def test_batch_report_sums_savings():
+    """测试按优化类型汇总节省的字节数和时间"""
+    results = [
+        _result(OutputOutcome.WEBP_LOSSY, 100, savings={'alpha': {'bytes': 40, 'seconds': 0.02}}),
+        _result(OutputOutcome.WEBP_LOSSY, 100, savings={'alpha': {'bytes': 60, 'seconds': 0.03}}),
+        _result(OutputOutcome.WEBP_LOSSY, 100),
+    ]
+
+    report = BatchReport.from_results(results)
+
+    assert report.savings == {'alpha': {'bytes': 100, 'seconds': 0.05, 'count': 2}}
+    assert report.get_summary()['savings']['alpha']['bytes'] == 100
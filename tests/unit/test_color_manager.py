@@ -0,0 +1,89 @@
+"""
+ColorManager单元测试
+
+测试ICC到sRGB的转换、sRGB配置文件跳过以及变换缓存复用。
+"""
+
+import struct
+
+from PIL import Image, ImageCms
+
+from src.services.color_manager import ColorManager
+
+
+def _srgb_profile() -> bytes:
+    return ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+
+
+def _swapped_profile() -> bytes:
+    """红绿原色互换的非sRGB配置文件: 源图中的纯红在sRGB中应变为纯绿"""
+    data = bytearray(_srgb_profile().replace(
+        'sRGB'.encode('utf-16-be'), 'Swap'.encode('utf-16-be')
+    ))
+    (count,) = struct.unpack('>I', data[128:132])
+    for index in range(count):
+        position = 132 + 12 * index
+        signature = bytes(data[position:position + 4])
+        if signature == b'rXYZ':
+            data[position:position + 4] = b'gXYZ'
+        elif signature == b'gXYZ':
+            data[position:position + 4] = b'rXYZ'
+    return bytes(data)
+
+
+def test_converts_to_srgb():
+    """测试按配置文件转换像素,RGBA保留透明通道"""
+    manager = ColorManager()
+    profile = _swapped_profile()
+
+    rgb = manager.to_srgb(Image.new('RGB', (4, 4), (255, 0, 0)), profile)
+    rgba = manager.to_srgb(Image.new('RGBA', (4, 4), (255, 0, 0, 100)), profile)
+
+    assert rgb.mode == 'RGB'
+    assert rgb.getpixel((0, 0)) == (0, 255, 0)
+    assert rgba.mode == 'RGBA'
+    assert rgba.getpixel((0, 0)) == (0, 255, 0, 100)
+
+
+def test_srgb_and_missing_profiles_are_skipped():
+    """测试sRGB配置文件、无配置文件和不支持的模式返回原对象"""
+    manager = ColorManager()
+    img = Image.new('RGB', (4, 4), (255, 0, 0))
+
+    assert manager.to_srgb(img, _srgb_profile()) is img
+    assert manager.to_srgb(img, None) is img
+    assert manager.to_srgb(img, b'not an icc profile') is img
+    gray = Image.new('L', (4, 4))
+    assert manager.to_srgb(gray, _swapped_profile()) is gray
+
+
+def test_transforms_are_cached_by_profile_and_mode():
+    """测试同一配置文件和模式只构建一次变换"""
+    manager = ColorManager()
+    profile = _swapped_profile()
+
+    for _ in range(3):
+        manager.to_srgb(Image.new('RGB', (4, 4)), profile)
+    manager.to_srgb(Image.new('RGBA', (4, 4)), profile)
+
+    assert manager.cache_info() == {'transforms': 2, 'hits': 2, 'misses': 2}
+
+
+def test_mismatched_profile_passes_through():
+    """测试配置文件与颜色模式不匹配时返回原对象"""
+    manager = ColorManager()
+    lab = ImageCms.ImageCmsProfile(ImageCms.createProfile('LAB')).tobytes()
+    rgb = Image.new('RGB', (4, 4), (255, 0, 0))
+    cmyk = Image.new('CMYK', (4, 4))
+
+    assert manager.to_srgb(rgb, lab) is rgb
+    assert manager.to_srgb(cmyk, _srgb_profile()) is cmyk
+
+
+def test_is_srgb():
+    """测试按配置文件描述识别sRGB,无法解析的配置文件不视为sRGB"""
+    manager = ColorManager()
+
+    assert manager.is_srgb(_srgb_profile()) is True
+    assert manager.is_srgb(_swapped_profile()) is False
+    assert manager.is_srgb(b'not an icc profile') is False
@@ -0,0 +1,177 @@
+"""
+ContentClassifier单元测试
+
+测试照片/截图/图形分类、透明通道特征,以及convert_image中的编码路由。
+"""
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.models.image_file import ImageFile
+from src.services.content_classifier import ContentClassifier, ContentClass, EncodingMode
+
+
+def _photo(size=(400, 300)):
+    """噪声叠加渐变,模拟照片"""
+    return Image.merge('RGB', [
+        Image.effect_noise(size, 40),
+        Image.radial_gradient('L').resize(size),
+        Image.linear_gradient('L').resize(size),
+    ])
+
+
+def _screenshot(size=(600, 400)):
+    """渐变标题栏 + 大面积纯色背景 + 抗锯齿线条,模拟截图"""
+    canvas = Image.new('RGB', (size[0] * 2, size[1] * 2), 'white')
+    bar = Image.linear_gradient('L').rotate(90).resize((canvas.width, 80))
+    canvas.paste(Image.merge('RGB', [bar, Image.new('L', bar.size, 90), bar.point(lambda v: 255 - v)]))
+    draw = ImageDraw.Draw(canvas)
+    for y in range(140, canvas.height, 90):
+        draw.line((40, y, canvas.width - 40, y + 30), fill=(20, 20, 20), width=3)
+        draw.ellipse((60, y, 130, y + 50), outline=(200, 30, 30), width=3)
+    return canvas.resize(size, Image.Resampling.LANCZOS)
+
+
+def _screenshot_with_photo():
+    """截图中嵌入一张照片,颜色数超出无损范围"""
+    canvas = _screenshot()
+    canvas.paste(_photo((200, 150)), (300, 200))
+    return canvas
+
+
+def _dithered_photo():
+    """抖动到256色的照片: 颜色少但满是噪声边缘"""
+    return _photo().quantize(256, dither=Image.Dither.FLOYDSTEINBERG).convert('RGB')
+
+
+def _logo():
+    """透明背景上的纯色图形"""
+    img = Image.new('RGBA', (300, 300), (0, 0, 0, 0))
+    ImageDraw.Draw(img).ellipse((30, 30, 270, 270), fill=(255, 0, 0, 255))
+    return img
+
+
+class TestContentClassifier:
+    """内容分类测试"""
+
+    def test_photo_routes_to_lossy(self):
+        analysis = ContentClassifier().analyze(_photo())
+        assert analysis.content_class == ContentClass.PHOTO
+        assert analysis.encoding_mode == EncodingMode.LOSSY
+        assert analysis.alpha_profile == "none"
+
+    def test_screenshot_routes_to_lossless(self):
+        analysis = ContentClassifier().analyze(_screenshot())
+        assert analysis.content_class == ContentClass.SCREENSHOT
+        assert analysis.encoding_mode == EncodingMode.LOSSLESS
+        assert analysis.flat_ratio >= ContentClassifier.SCREENSHOT_MIN_FLAT_RATIO
+        assert analysis.edge_density >= ContentClassifier.SCREENSHOT_MIN_EDGE_DENSITY
+
+    def test_colorful_screenshot_routes_to_near_lossless(self):
+        analysis = ContentClassifier().analyze(_screenshot_with_photo())
+        assert analysis.content_class == ContentClass.SCREENSHOT
+        assert analysis.encoding_mode == EncodingMode.NEAR_LOSSLESS
+
+    def test_dithered_photo_routes_to_lossy(self):
+        """颜色数不超过256但边缘密度高的抖动图片不走无损"""
+        analysis = ContentClassifier().analyze(_dithered_photo())
+        assert analysis.unique_colors <= ContentClassifier.GRAPHIC_MAX_COLORS
+        assert analysis.edge_density > ContentClassifier.LOSSLESS_MAX_EDGE_DENSITY
+        assert analysis.content_class == ContentClass.PHOTO
+        assert analysis.encoding_mode == EncodingMode.LOSSY
+
+    def test_hard_cutout_routes_to_lossless(self):
+        """透明通道只有0/255、颜色数超过256的抠图按图形无损编码"""
+        img = _screenshot((120, 90)).convert('RGBA')
+        img.putalpha(Image.new('L', img.size, 255))
+        ImageDraw.Draw(img).rectangle((0, 0, 30, 30), fill=(0, 0, 0, 0))
+        analysis = ContentClassifier().analyze(img)
+        assert analysis.unique_colors > ContentClassifier.GRAPHIC_MAX_COLORS
+        assert analysis.alpha_profile == "binary"
+        assert analysis.content_class == ContentClass.GRAPHIC
+
+    def test_logo_routes_to_lossless(self):
+        analysis = ContentClassifier().analyze(_logo())
+        assert analysis.content_class == ContentClass.GRAPHIC
+        assert analysis.encoding_mode == EncodingMode.LOSSLESS
+        assert analysis.alpha_profile == "binary"
+
+    @pytest.mark.parametrize("alpha_values, expected", [
+        ((255,), "opaque"),
+        ((0, 255), "binary"),
+        ((0, 128, 255), "graded"),
+    ])
+    def test_alpha_profile(self, alpha_values, expected):
+        img = Image.new('RGBA', (30, 30), (10, 20, 30, 255))
+        for i, value in enumerate(alpha_values):
+            img.putpixel((i, 0), (10, 20, 30, value))
+        assert ContentClassifier().analyze(img).alpha_profile == expected
+
+    def test_apply_lossless(self):
+        classifier = ContentClassifier()
+        img = _screenshot()
+
+        prepared, params = classifier.apply(img, classifier.analyze(img), {'quality': 80, 'method': 4})
+        assert prepared is img
+        assert params['lossless'] is True
+        assert params['quality'] == ContentClassifier.LOSSLESS_EFFORT
+
+    def test_apply_near_lossless_raises_quality_without_quantizing(self):
+        classifier = ContentClassifier()
+        img = _screenshot_with_photo()
+
+        prepared, params = classifier.apply(img, classifier.analyze(img), {'quality': 80, 'method': 4})
+        assert prepared is img
+        assert 'lossless' not in params
+        assert params['quality'] == ContentClassifier.NEAR_LOSSLESS_QUALITY
+
+    def test_apply_lossy_keeps_params(self):
+        classifier = ContentClassifier()
+        img = _photo()
+        params = {'quality': 80, 'method': 4}
+        prepared, new_params = classifier.apply(img, classifier.analyze(img), params)
+        assert prepared is img
+        assert new_params == params
+
+
+class TestConvertImageContentRouting:
+    """convert_image内容路由测试"""
+
+    @pytest.mark.parametrize("factory, suffix, expected_mode", [
+        (_photo, ".jpg", "LOSSY"),
+        (_screenshot, ".png", "LOSSLESS"),
+        (_screenshot_with_photo, ".png", "NEAR_LOSSLESS"),
+        (lambda: _logo().convert('RGB'), ".png", "LOSSLESS"),
+    ])
+    def test_routes_by_content(self, tmp_path, factory, suffix, expected_mode):
+        from src.services.converter_service import ConverterService
+
+        input_path = tmp_path / f"input{suffix}"
+        factory().save(input_path)
+        output_path = tmp_path / "output.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=80,
+            content_routing=True
+        )
+
+        assert result.success is True
+        assert result.encode_params['encoding_mode'] == expected_mode
+        assert result.encode_params['lossless'] is (expected_mode == "LOSSLESS")
+        with Image.open(output_path) as output_img:
+            assert output_img.format == 'WEBP'
+
+    def test_lossless_route_is_pixel_exact(self, tmp_path):
+        from src.services.converter_service import ConverterService
+
+        source = _logo().convert('RGB')
+        input_path = tmp_path / "logo.png"
+        source.save(input_path)
+        output_path = tmp_path / "logo.webp"
+
+        ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=60,
+            content_routing=True
+        )
+        with Image.open(output_path) as output_img:
+            assert output_img.convert('RGB').tobytes() == source.tobytes()
@@ -0,0 +1,104 @@
+"""
+ConversionPipeline单元测试
+
+测试流水线模式的批量转换结果、有界队列背压以及写盘失败的处理。
+"""
+
+import time
+
+from PIL import Image
+
+from src.models.image_file import ImageFile
+from src.models.conversion_task import ConversionTask
+from src.services.conversion_pipeline import ConversionPipeline
+from src.services.converter_service import ConverterService, ConversionResult
+
+
+def _tasks(tmp_path, count):
+    tasks = []
+    for i in range(count):
+        input_path = tmp_path / f"input_{i}.png"
+        Image.new('RGB', (48, 48), (i * 20, 80, 160)).save(input_path)
+        tasks.append(ConversionTask(
+            input_file=ImageFile.from_path(input_path),
+            output_path=tmp_path / f"output_{i}.webp",
+            quality=80
+        ))
+    return tasks
+
+
+def test_pipeline_batch_matches_thread_pool(tmp_path):
+    """测试流水线模式的输出与线程池模式逐字节相同"""
+    tasks = _tasks(tmp_path, 6)
+    service = ConverterService()
+    progress = []
+
+    results = service.batch_convert(
+        tasks, max_workers=2, io_workers=2,
+        progress_callback=lambda done, total: progress.append(done)
+    )
+    pipelined = [result.output_path.read_bytes() for result in results]
+    reference = service.batch_convert(tasks, max_workers=2)
+
+    assert all(result.success for result in results)
+    assert all(result.output_data is None for result in results)
+    assert all('write' in result.stage_timings for result in results)
+    assert pipelined == [result.output_path.read_bytes() for result in reference]
+    assert sorted(progress) == list(range(1, 7))
+
+    summary = service.pipeline_metrics.get_summary()
+    assert {name: stage['items'] for name, stage in summary['stages'].items()} == {
+        'read': 6, 'convert': 6, 'write': 6
+    }
+    assert summary['bottleneck'] in ('read', 'convert', 'write')
+
+
+def test_bounded_queue_applies_backpressure(tmp_path):
+    """测试转换阶段较慢时队列深度不超过容量,读取阶段被阻塞"""
+    tasks = _tasks(tmp_path, 6)
+    pipeline = ConversionPipeline(cpu_workers=1, io_workers=1, queue_size=1)
+    seen = {}
+
+    def slow_convert(index, task, data):
+        assert data == task.input_file.file_path.read_bytes()
+        time.sleep(0.02)
+        return ConversionResult(success=True)
+
+    pipeline.run(
+        list(enumerate(tasks)), slow_convert,
+        on_result=lambda index, result: seen.setdefault(index, result)
+    )
+
+    assert sorted(seen) == list(range(6))
+    assert pipeline.metrics.queues['read'].max_depth <= 1
+    assert pipeline.metrics.stages['read'].blocked > 0
+    assert pipeline.metrics.bottleneck == 'convert'
+
+
+def test_write_failure_reported(tmp_path):
+    """测试写盘失败时结果标记为失败"""
+    task = _tasks(tmp_path, 1)[0]
+    task.output_path = tmp_path / "missing_dir" / "output.webp"
+
+    results = ConverterService().batch_convert([task], io_workers=1)
+
+    assert results[0].success is False
+    assert "写入输出失败" in results[0].error_message
+
+
+def test_result_handler_error_does_not_stall(tmp_path):
+    """测试结果回调出错时写入阶段继续处理队列,流水线正常结束"""
+    tasks = _tasks(tmp_path, 6)
+    pipeline = ConversionPipeline(cpu_workers=1, io_workers=1, queue_size=1)
+    seen = []
+
+    def on_result(index, result):
+        seen.append(index)
+        raise RuntimeError("boom")
+
+    pipeline.run(
+        list(enumerate(tasks)), lambda index, task, data: ConversionResult(success=True),
+        on_result=on_result
+    )
+
+    assert sorted(seen) == list(range(6))
@@ -225,6 +225,36 @@ class TestConverterService:
         # 注意:对于纯色小图片,WebP压缩可能导致文件大小差异不明显
         assert result_high.output_size >= result_low.output_size * 0.5  # 允许一定容差
 
+    def test_convert_image_records_encode_params(self, tmp_path):
+        """测试结果记录实际使用的编码档位和method"""
+        from src.services.converter_service import ConverterService
+        from src.models.encoder_profile import EncoderProfile
+
+        test_image_path = tmp_path / "thumb.png"
+        Image.new('RGB', (200, 150), color='blue').save(test_image_path, format='PNG')
+        image_file = ImageFile.from_path(test_image_path)
+
+        service = ConverterService()
+
+        # 默认平衡档位沿用method=4
+        result = service.convert_image(image_file, tmp_path / "balanced.webp", quality=80)
+        assert result.encode_params == {'profile': 'BALANCED', 'quality': 80, 'method': 4}
+
+        # 自动档位对缩略图选择method=6
+        result = service.convert_image(
+            image_file, tmp_path / "auto.webp", quality=80,
+            encoder_profile=EncoderProfile.AUTO
+        )
+        assert result.success is True
+        assert result.encode_params['profile'] == 'AUTO'
+        assert result.encode_params['method'] == 6
+
+        result = service.convert_image(
+            image_file, tmp_path / "fast.webp", quality=80,
+            encoder_profile=EncoderProfile.FASTEST
+        )
+        assert result.encode_params['method'] == 1
+
 
 class TestConverterServiceBatchConvert:
     """批量转换单元测试 (T077-T080)"""
@@ -406,6 +436,594 @@ class TestConverterServiceBatchConvert:
                 assert tasks[i].output_path.exists()
 
 
+class TestConverterServiceDedup:
+    """批次去重测试"""
+
+    def test_duplicates_converted_once(self, tmp_path):
+        """内容相同的输入只编码一次,其余输出链接得到"""
+        from src.services.converter_service import ConverterService
+        from src.services.batch_report import BatchReport
+        from src.models.conversion_task import ConversionTask
+
+        source = tmp_path / "photo.png"
+        Image.new('RGB', (64, 64), (200, 100, 50)).save(source)
+        inputs = [source]
+        for i in range(2):
+            copy = tmp_path / f"renamed_{i}.png"
+            copy.write_bytes(source.read_bytes())
+            inputs.append(copy)
+        tasks = [
+            ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=tmp_path / f"out_{i}.webp",
+                quality=80
+            )
+            for i, path in enumerate(inputs)
+        ]
+        progress = []
+
+        results = ConverterService().batch_convert(
+            tasks, max_workers=2, dedup=True,
+            progress_callback=lambda done, total: progress.append(done)
+        )
+
+        assert all(result.success for result in results)
+        assert 'encode' in results[0].stage_timings
+        for i, result in enumerate(results[1:], start=1):
+            assert result.output_path == tmp_path / f"out_{i}.webp"
+            assert result.output_path.read_bytes() == results[0].output_path.read_bytes()
+            assert 'encode' not in result.stage_timings
+            assert result.encode_params['dedup'] in ('hardlink', 'reflink', 'copy')
+        assert sorted(progress) == [1, 2, 3]
+
+        summary = BatchReport.from_results(results).get_summary()
+        assert summary['savings']['dedup']['count'] == 2
+        assert summary['dedup_ratio'] == round(2 / 3, 4)
+
+    def test_linked_duplicates_in_place_keep_inputs(self, tmp_path):
+        """输出目录即输入目录时,保留原图的重复任务不删除自己的输入"""
+        from src.services.converter_service import ConverterService
+        from src.models.conversion_task import ConversionTask
+        from src.models.output_policy import OutputPolicy, OutputOutcome, FallbackAction
+
+        source = tmp_path / "a.png"
+        Image.effect_noise((32, 32), 80).convert('RGB').save(source)
+        copy = tmp_path / "b.png"
+        copy.write_bytes(source.read_bytes())
+        original = source.read_bytes()
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        # 主任务输出到其他目录(链接原图),重复任务输出到自己的目录
+        tasks = [
+            ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=output_path,
+                quality=80,
+                output_policy=OutputPolicy(
+                    min_savings_percent=99, fallback=FallbackAction.LINK_ORIGINAL
+                )
+            )
+            for path, output_path in [(source, output_dir / "a.webp"), (copy, tmp_path / "b.webp")]
+        ]
+
+        results = ConverterService().batch_convert(tasks, dedup=True)
+
+        assert all(result.success for result in results)
+        assert results[0].outcome == OutputOutcome.ORIGINAL_LINKED
+        assert results[1].outcome == OutputOutcome.ORIGINAL_KEPT
+        assert results[1].output_path == copy
+        assert source.read_bytes() == original and copy.read_bytes() == original
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.png", "b.png", "out"]
+
+    def test_tiled_duplicates_converted_separately(self, tmp_path):
+        """分块输出的重复任务单独转换,不链接到主任务的清单文件"""
+        from src.services.converter_service import ConverterService
+        from src.models.conversion_task import ConversionTask
+        from src.models.tiling_policy import TilingPolicy
+
+        source = tmp_path / "big.png"
+        Image.linear_gradient('L').resize((250, 180)).save(source)
+        copy = tmp_path / "copy.png"
+        copy.write_bytes(source.read_bytes())
+        tasks = [
+            ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=tmp_path / f"out_{i}.webp",
+                quality=80,
+                tiling_policy=TilingPolicy(max_dimension=200, tile_size=128)
+            )
+            for i, path in enumerate([source, copy])
+        ]
+
+        results = ConverterService().batch_convert(tasks, dedup=True)
+
+        assert all(result.success for result in results)
+        assert [result.output_path.name for result in results] == ["manifest.json"] * 2
+        assert results[0].output_path != results[1].output_path
+        assert 'dedup' not in results[1].encode_params
+        assert not (tmp_path / "out_1.webp").exists()
+
+    def test_deadline_counts_primaries_only(self, tmp_path, monkeypatch):
+        """截止时间模式只按需要编码的主任务估算总像素数"""
+        import src.services.converter_service as converter_module
+        from src.models.conversion_task import ConversionTask
+
+        source = tmp_path / "photo.png"
+        Image.new('RGB', (40, 30), (200, 100, 50)).save(source)
+        copy = tmp_path / "copy.png"
+        copy.write_bytes(source.read_bytes())
+        tasks = [
+            ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=tmp_path / f"out_{i}.webp",
+                quality=80
+            )
+            for i, path in enumerate([source, copy])
+        ]
+        seen = {}
+
+        class RecordingController(converter_module.DeadlineController):
+            def __init__(self, **kwargs):
+                seen.update(kwargs)
+                super().__init__(**kwargs)
+
+        monkeypatch.setattr(converter_module, 'DeadlineController', RecordingController)
+        converter_module.ConverterService().batch_convert(tasks, dedup=True, deadline=10.0)
+
+        assert seen['total_pixels'] == 40 * 30
+
+
+class TestConverterServicePixelCache:
+    """像素内容缓存测试"""
+
+    def test_metadata_only_difference_hits_cache(self, tmp_path):
+        """像素相同、EXIF不同的图片命中缓存,输出带各自的EXIF"""
+        from src.services.converter_service import ConverterService
+        from src.services.pixel_cache import PixelCache
+
+        cache = PixelCache(tmp_path / "cache")
+        service = ConverterService()
+        results = []
+        for i, make in enumerate(["First", "Second"]):
+            exif = Image.Exif()
+            exif[0x010F] = make
+            input_path = tmp_path / f"export_{i}.png"
+            Image.new('RGB', (48, 48), (40, 90, 160)).save(input_path, exif=exif)
+            results.append(service.convert_image(
+                ImageFile.from_path(input_path), tmp_path / f"export_{i}.webp",
+                quality=80, pixel_cache=cache
+            ))
+
+        assert [r.encode_params['pixel_cache'] for r in results] == ['miss', 'hit']
+        for result, make in zip(results, ["First", "Second"]):
+            with Image.open(result.output_path) as output_img:
+                assert output_img.getexif()[0x010F] == make
+
+
+class TestConverterServiceOutputPolicy:
+    """输出策略测试"""
+
+    @staticmethod
+    def _create_palette_png(path):
+        """创建压缩良好的调色板图形PNG"""
+        from PIL import ImageDraw
+        img = Image.new('P', (64, 64))
+        img.putpalette([0, 0, 0, 255, 0, 0, 0, 255, 0, 0, 0, 255] + [0] * 756)
+        draw = ImageDraw.Draw(img)
+        for x in range(0, 64, 8):
+            draw.rectangle((x, 0, x + 3, 63), fill=(x // 8) % 4)
+        img.save(path, format='PNG', optimize=True)
+
+    @staticmethod
+    def _create_noisy_jpeg(path):
+        """创建有损WebP也无法压得更小的小JPEG"""
+        Image.effect_noise((32, 32), 80).convert('RGB').save(path, 'JPEG', quality=30)
+
+    def test_default_outcome_is_lossy(self, tmp_path):
+        """未设置策略时始终输出有损WebP并记录阶段耗时"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputOutcome
+
+        input_path = tmp_path / "noisy.jpg"
+        self._create_noisy_jpeg(input_path)
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), tmp_path / "out.webp", quality=95
+        )
+        assert result.success is True
+        assert result.outcome == OutputOutcome.WEBP_LOSSY
+        assert set(result.stage_timings) == {'decode', 'encode', 'write'}
+        assert (tmp_path / "out.webp").exists()
+
+    def test_falls_back_to_lossless_for_graphics(self, tmp_path):
+        """有损结果不达标时图形类图片改用无损编码"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputPolicy, OutputOutcome
+
+        input_path = tmp_path / "graphic.png"
+        self._create_palette_png(input_path)
+        output_path = tmp_path / "graphic.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=80,
+            output_policy=OutputPolicy(min_savings_percent=90)
+        )
+        assert result.success is True
+        assert result.outcome == OutputOutcome.WEBP_LOSSLESS
+        assert result.encode_params['lossless'] is True
+        assert result.output_size == output_path.stat().st_size
+        with Image.open(output_path) as output_img:
+            assert output_img.format == 'WEBP'
+
+    def test_keeps_original_when_webp_not_smaller(self, tmp_path):
+        """WebP不比原图小时保留原图且不写输出文件"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputPolicy, OutputOutcome
+
+        input_path = tmp_path / "noisy.jpg"
+        self._create_noisy_jpeg(input_path)
+        output_path = tmp_path / "noisy.webp"
+        image_file = ImageFile.from_path(input_path)
+
+        result = ConverterService().convert_image(
+            image_file, output_path, quality=95, output_policy=OutputPolicy()
+        )
+        assert result.success is True
+        assert result.outcome == OutputOutcome.ORIGINAL_KEPT
+        assert result.output_path == input_path
+        assert result.compression_ratio == 0
+        assert not output_path.exists()
+
+    def test_links_original_when_requested(self, tmp_path):
+        """LINK_ORIGINAL策略在输出目录创建原图链接"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputPolicy, OutputOutcome, FallbackAction
+
+        input_path = tmp_path / "noisy.jpg"
+        self._create_noisy_jpeg(input_path)
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_dir / "noisy.webp", quality=95,
+            output_policy=OutputPolicy(fallback=FallbackAction.LINK_ORIGINAL)
+        )
+        assert result.outcome == OutputOutcome.ORIGINAL_LINKED
+        assert result.output_path == output_dir / "noisy.jpg"
+        assert result.output_path.read_bytes() == input_path.read_bytes()
+        assert not (output_dir / "noisy.webp").exists()
+
+    def test_link_original_in_input_directory_keeps_source(self, tmp_path):
+        """输出目录即输入目录时不删除原图,按保留原图报告"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputPolicy, OutputOutcome, FallbackAction
+
+        input_path = tmp_path / "noisy.jpg"
+        self._create_noisy_jpeg(input_path)
+        original = input_path.read_bytes()
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), tmp_path / "noisy.webp", quality=95,
+            output_policy=OutputPolicy(fallback=FallbackAction.LINK_ORIGINAL)
+        )
+        assert result.success is True
+        assert result.outcome == OutputOutcome.ORIGINAL_KEPT
+        assert result.output_path == input_path
+        assert input_path.read_bytes() == original
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["noisy.jpg"]
+
+    def test_link_original_does_not_clobber_existing_file(self, tmp_path):
+        """输出目录中已有同名的其他文件时自动重命名,不覆盖"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputPolicy, OutputOutcome, FallbackAction
+
+        input_path = tmp_path / "noisy.jpg"
+        self._create_noisy_jpeg(input_path)
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        (output_dir / "noisy.jpg").write_bytes(b"unrelated")
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_dir / "noisy.webp", quality=95,
+            output_policy=OutputPolicy(fallback=FallbackAction.LINK_ORIGINAL)
+        )
+        assert result.outcome == OutputOutcome.ORIGINAL_LINKED
+        assert result.output_path == output_dir / "noisy_1.jpg"
+        assert result.output_path.read_bytes() == input_path.read_bytes()
+        assert (output_dir / "noisy.jpg").read_bytes() == b"unrelated"
+
+
+class TestConverterServicePalette:
+    """调色板图片转换测试"""
+
+    def _create_palette_gif(self, path, transparent_used=True):
+        img = Image.new('P', (64, 64), 1)
+        img.putpalette([255, 255, 255, 255, 0, 0, 0, 0, 255] + [0] * 759)
+        img.paste(2, (16, 16, 48, 48))
+        if transparent_used:
+            img.paste(0, (0, 0, 8, 8))
+        img.save(path, format='GIF', transparency=0)
+
+    def test_palette_transparency_preserved(self, tmp_path):
+        """使用了透明色的调色板图片保留透明度并无损编码"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputOutcome
+
+        input_path = tmp_path / "icon.gif"
+        self._create_palette_gif(input_path)
+        output_path = tmp_path / "icon.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=50
+        )
+        assert result.success is True
+        assert result.outcome == OutputOutcome.WEBP_LOSSLESS
+        assert result.encode_params['lossless'] is True
+        with Image.open(output_path) as output_img:
+            assert output_img.mode == 'RGBA'
+            assert output_img.getpixel((0, 0))[3] == 0
+            assert output_img.getpixel((32, 32)) == (0, 0, 255, 255)
+
+    def test_full_palette_photo_encoded_lossy(self, tmp_path):
+        """用满256色的抖动照片不强制无损"""
+        from src.services.converter_service import ConverterService
+        from src.models.output_policy import OutputOutcome
+
+        photo = Image.merge('RGB', [
+            Image.effect_noise((96, 96), 60),
+            Image.linear_gradient('L').resize((96, 96)),
+            Image.radial_gradient('L').resize((96, 96)),
+        ])
+        input_path = tmp_path / "dithered.gif"
+        photo.quantize(256, dither=Image.Dither.FLOYDSTEINBERG).save(input_path)
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), tmp_path / "dithered.webp", quality=80
+        )
+
+        assert result.success is True
+        assert result.outcome == OutputOutcome.WEBP_LOSSY
+        assert 'lossless' not in result.encode_params
+
+    def test_unused_transparency_converts_to_rgb(self, tmp_path):
+        """透明色未被使用时直接转换为RGB"""
+        from src.services.converter_service import ConverterService
+
+        input_path = tmp_path / "opaque.gif"
+        self._create_palette_gif(input_path, transparent_used=False)
+
+        with Image.open(input_path) as img:
+            assert ConverterService().prepare_image(img).mode == 'RGB'
+
+
+class TestConverterServiceMetadataPolicy:
+    """元数据策略转换测试"""
+
+    def test_strip_gps_records_savings(self, tmp_path):
+        """去除GPS后输出不含GPS,节省字节数记录在savings中"""
+        from src.services.converter_service import ConverterService
+        from src.models.metadata_policy import MetadataPolicy
+
+        exif = Image.Exif()
+        exif[0x0112] = 1
+        exif.get_ifd(0x8825)[1] = "N"
+        input_path = tmp_path / "photo.jpg"
+        Image.new('RGB', (32, 32), (90, 120, 30)).save(input_path, exif=exif)
+        output_path = tmp_path / "photo.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=80,
+            metadata_policy=MetadataPolicy.STRIP_GPS
+        )
+
+        assert result.success is True
+        assert result.savings['metadata']['bytes'] > 0
+        assert 'metadata' in result.stage_timings
+        with Image.open(output_path) as output_img:
+            assert 0x8825 not in output_img.getexif()
+            assert output_img.getexif()[0x0112] == 1
+
+
+class TestConverterServiceOrientation:
+    """EXIF方向转正测试"""
+
+    def _create_rotated_jpeg(self, path, orientation):
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        img = Image.new('RGB', (40, 20), (255, 255, 255))
+        img.paste((0, 0, 0), (0, 0, 10, 10))  # 左上角黑块用于确认方向
+        img.save(path, exif=exif, quality=95)
+
+    def test_rotated_image_is_transposed(self, tmp_path):
+        """方向为6时像素按ImageOps.exif_transpose转正,方向标签重置为1"""
+        from PIL import ImageOps
+        from src.services.converter_service import ConverterService
+
+        input_path = tmp_path / "phone.jpg"
+        self._create_rotated_jpeg(input_path, 6)
+        output_path = tmp_path / "phone.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=90,
+            normalize_orientation=True
+        )
+
+        assert result.success is True
+        assert result.encode_params['orientation'] == 6
+        assert 'orientation' in result.stage_timings
+        with Image.open(input_path) as source, Image.open(output_path) as output_img:
+            expected = ImageOps.exif_transpose(source)
+            assert output_img.size == expected.size == (20, 40)
+            assert output_img.getexif()[0x0112] == 1
+            assert output_img.convert('L').getpixel((15, 5)) < 64
+            assert expected.convert('L').getpixel((15, 5)) < 64
+
+    def test_orientation_one_is_skipped(self, tmp_path):
+        """方向为1时不做处理,不记录orientation阶段"""
+        from src.services.converter_service import ConverterService
+
+        input_path = tmp_path / "upright.jpg"
+        self._create_rotated_jpeg(input_path, 1)
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), tmp_path / "upright.webp", quality=90,
+            normalize_orientation=True
+        )
+
+        assert result.success is True
+        assert 'orientation' not in result.stage_timings
+        assert 'orientation' not in result.encode_params
+
+
+class TestConverterServiceColorManagement:
+    """ICC到sRGB转换测试"""
+
+    def test_profile_converted_and_dropped(self, tmp_path):
+        """转换到sRGB后输出不含ICC,节省的字节数记录在savings中"""
+        from PIL import ImageCms
+        from src.services.converter_service import ConverterService
+
+        icc = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+        input_path = tmp_path / "wide.png"
+        Image.new('RGB', (16, 16), (200, 30, 30)).save(input_path, icc_profile=icc)
+        output_path = tmp_path / "wide.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=90,
+            convert_to_srgb=True
+        )
+
+        assert result.success is True
+        assert result.savings['color']['bytes'] == len(icc)
+        assert 'color' in result.stage_timings
+        with Image.open(output_path) as output_img:
+            assert 'icc_profile' not in output_img.info
+
+    def test_unconverted_profile_kept(self, tmp_path):
+        """模式不支持转换时保留ICC配置文件,不计入节省"""
+        from PIL import ImageCms
+        from src.services.converter_service import ConverterService
+
+        icc = ImageCms.ImageCmsProfile(ImageCms.createProfile('LAB')).tobytes()
+        input_path = tmp_path / "gray.png"
+        Image.new('LA', (16, 16), (120, 200)).save(input_path, icc_profile=icc)
+        output_path = tmp_path / "gray.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=90,
+            convert_to_srgb=True
+        )
+
+        assert result.success is True
+        assert not result.savings or 'color' not in result.savings
+        assert 'color_space' not in result.encode_params
+        with Image.open(output_path) as output_img:
+            assert output_img.info.get('icc_profile') == icc
+
+
+class TestConverterServiceModes:
+    """CMYK与高位深模式转换测试"""
+
+    @pytest.mark.parametrize("mode, value, expected", [
+        ('I;16', 65535, 255),
+        ('I;16', 32896, 128),
+        ('I;16B', 32896, 128),
+        ('I', 200, 200),
+        ('I', 65535, 255),
+        ('F', 0.5, 127),
+    ])
+    def test_high_bit_depth_scaled_to_8bit(self, mode, value, expected):
+        """高位深灰度按取值范围缩放,而不是截断到255"""
+        from src.services.converter_service import ConverterService
+
+        img = Image.new(mode, (4, 4), value)
+        img.putpixel((0, 0), 0)
+
+        prepared = ConverterService().prepare_image(img)
+
+        assert prepared.mode == 'L'
+        assert prepared.getpixel((0, 0)) == 0
+        assert prepared.getpixel((1, 1)) == expected
+
+    def test_out_of_range_values_stretched(self):
+        """超出16位范围的I模式按实际范围拉伸"""
+        from src.services.converter_service import ConverterService
+
+        img = Image.new('I', (4, 4), -1000)
+        img.putpixel((0, 0), 100000)
+
+        prepared = ConverterService().prepare_image(img)
+
+        assert prepared.getextrema() == (0, 255)
+
+    def test_cmyk_jpeg_with_rgb_profile(self, tmp_path):
+        """CMYK JPEG附带非CMYK配置文件时退回朴素转换,转换成功"""
+        from PIL import ImageCms
+        from src.services.converter_service import ConverterService
+
+        icc = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+        input_path = tmp_path / "cmyk.jpg"
+        Image.new('CMYK', (16, 16), (0, 255, 255, 0)).save(input_path, icc_profile=icc)
+        output_path = tmp_path / "cmyk.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=90
+        )
+
+        assert result.success is True
+        with Image.open(output_path) as output_img:
+            red, green, blue = output_img.convert('RGB').getpixel((8, 8))
+            assert red > 200 and green < 60 and blue < 60
+
+    def test_16bit_png_conversion(self, tmp_path):
+        """16位灰度PNG转换后保留灰度层次"""
+        from src.services.converter_service import ConverterService
+
+        input_path = tmp_path / "depth.png"
+        gradient = Image.linear_gradient('L').resize((64, 64))
+        gradient.convert('I').point(lambda v: v * 257).convert('I;16').save(input_path)
+        output_path = tmp_path / "depth.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=100
+        )
+
+        assert result.success is True
+        with Image.open(output_path) as output_img:
+            low, high = output_img.convert('L').getextrema()
+            assert low < 16 and high > 240
+
+    def test_cmyk_jpeg_conversion(self, tmp_path):
+        """CMYK JPEG转换为RGB WebP"""
+        from src.services.converter_service import ConverterService
+
+        input_path = tmp_path / "print.jpg"
+        Image.new('CMYK', (32, 32), (0, 255, 255, 0)).save(input_path, quality=95)
+        output_path = tmp_path / "print.webp"
+
+        result = ConverterService().convert_image(
+            ImageFile.from_path(input_path), output_path, quality=95
+        )
+
+        assert result.success is True
+        with Image.open(output_path) as output_img:
+            assert output_img.mode == 'RGB'
+            red, green, blue = output_img.getpixel((16, 16))
+            assert red > 200 and green < 60 and blue < 60
+
+    def test_cmyk_with_invalid_profile_falls_back(self):
+        """CMYK的ICC配置文件无法解析时退回朴素转换"""
+        from src.services.converter_service import ConverterService
+
+        img = Image.new('CMYK', (4, 4), (0, 255, 255, 0))
+        img.info['icc_profile'] = b'not an icc profile'
+
+        prepared = ConverterService().prepare_image(img)
+
+        assert prepared.mode == 'RGB'
+        assert prepared.getpixel((0, 0)) == (255, 0, 0)
+
+
 class TestBatchConversionJobProgressPercentage:
     """批量作业进度计算测试 (T080)"""
 
@@ -471,3 +1089,93 @@ class TestBatchConversionJobProgressPercentage:
         job.tasks[4].complete(output_size=5000, duration=1.0)
 
         assert job.progress_percentage == 100.0
+
+
+class TestConverterServiceScheduling:
+    """测试批量转换的调度策略"""
+
+    def test_locality_order_changes_submission_only(self, tmp_path):
+        """测试LOCALITY顺序下结果仍与任务一一对应"""
+        from src.models.scheduling_policy import SchedulingPolicy, TaskOrder
+        from src.models.conversion_task import ConversionTask
+        from src.services.converter_service import ConverterService
+
+        service = ConverterService()
+        tasks = []
+        for i, directory in enumerate(["b", "a", "b", "a"]):
+            path = tmp_path / directory / f"{i}.png"
+            path.parent.mkdir(exist_ok=True)
+            Image.new('RGB', (16 + i, 16), (i * 40, 0, 0)).save(path)
+            tasks.append(ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=path.with_suffix('.webp'),
+                quality=80
+            ))
+
+        started = []
+        original = service.convert_image
+
+        def recording_convert(**kwargs):
+            started.append(kwargs['input_file'].file_path.parent.name)
+            return original(**kwargs)
+
+        service.convert_image = recording_convert
+        results = service.batch_convert(
+            tasks, max_workers=1,
+            scheduling=SchedulingPolicy(order=TaskOrder.LOCALITY)
+        )
+
+        assert all(result.success for result in results)
+        for task, result in zip(tasks, results):
+            assert Path(result.output_path) == task.output_path
+        assert started in (['a', 'a', 'b', 'b'], ['b', 'b', 'a', 'a'])
+
+    def test_batch_records_cost_samples(self, tmp_path):
+        """测试批量转换把每个成功结果记录到成本模型"""
+        from src.models.conversion_task import ConversionTask
+        from src.services.converter_service import ConverterService
+        from src.services.cost_model import CostModel
+
+        tasks = []
+        for i in range(3):
+            path = tmp_path / f"{i}.png"
+            Image.new('RGBA', (16 + i, 16), (i * 40, 0, 0, 128)).save(path)
+            tasks.append(ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=path.with_suffix('.webp'),
+                quality=80
+            ))
+        model = CostModel(tmp_path / "costs.jsonl")
+
+        results = ConverterService().batch_convert(tasks, max_workers=2, cost_model=model)
+
+        assert all(result.success for result in results)
+        assert model.get_summary() == {'PNG': 3, '*': 3}
+        assert tasks[0].input_file.mode == 'RGBA'
+
+    @pytest.mark.parametrize("io_workers", [None, 1])
+    def test_cost_model_error_does_not_fail_batch(self, tmp_path, io_workers):
+        """测试成本模型出错时批次仍正常完成(线程池和流水线模式)"""
+        from src.models.conversion_task import ConversionTask
+        from src.services.converter_service import ConverterService
+        from src.services.cost_model import CostModel
+
+        class BrokenCostModel(CostModel):
+            def record(self, task, result):
+                raise RuntimeError("boom")
+
+        tasks = []
+        for i in range(3):
+            path = tmp_path / f"{i}.png"
+            Image.new('RGB', (16 + i, 16), (i * 40, 0, 0)).save(path)
+            tasks.append(ConversionTask(
+                input_file=ImageFile.from_path(path),
+                output_path=path.with_suffix('.webp'),
+                quality=80
+            ))
+
+        results = ConverterService().batch_convert(
+            tasks, max_workers=2, io_workers=io_workers, cost_model=BrokenCostModel()
+        )
+
+        assert all(result.success for result in results)
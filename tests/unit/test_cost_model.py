@@ -0,0 +1,129 @@
+"""
+CostModel单元测试
+
+测试按格式拟合耗时/输出大小、样本不足时的退回策略、JSONL记录的恢复,
+以及未实际编码的结果不被记录。
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.models.image_file import ImageFile
+from src.models.conversion_task import ConversionTask
+from src.services.converter_service import ConversionResult
+from src.services.cost_model import CostModel
+
+
+def _task(width, height, format='PNG', mode='RGB', quality=80):
+    return ConversionTask(
+        input_file=ImageFile(
+            file_path=Path(f"{width}x{height}.{format.lower()}"),
+            file_name=f"{width}x{height}.{format.lower()}",
+            format=format,
+            width=width,
+            height=height,
+            file_size=width * height,
+            mode=mode
+        ),
+        output_path=Path("out.webp"),
+        quality=quality
+    )
+
+
+def _result(task, seconds_per_mp=0.5, bytes_per_pixel=0.25, **extra):
+    megapixels = task.input_file.width * task.input_file.height / 1_000_000
+    return ConversionResult(
+        success=True,
+        output_size=int(task.input_file.width * task.input_file.height * bytes_per_pixel),
+        encode_params={'quality': task.quality, 'method': 4, **extra},
+        stage_timings={'decode': 0.01 + megapixels * 0.1, 'encode': megapixels * seconds_per_mp},
+    )
+
+
+def _train(model, format='PNG', count=12, **kwargs):
+    for i in range(1, count + 1):
+        task = _task(200 * i, 150 + 10 * i, format=format)
+        model.record(task, _result(task, **kwargs))
+
+
+def test_predicts_linear_cost_per_format():
+    """测试拟合后按该格式的样本预测耗时、阶段耗时和输出大小"""
+    model = CostModel()
+    _train(model)
+
+    task = _task(1000, 1000)
+    prediction = model.predict(task)
+
+    assert prediction.basis == 'format'
+    assert prediction.samples == 12
+    assert prediction.seconds == pytest.approx(0.01 + 0.1 + 0.5, rel=0.05)
+    assert prediction.stages['encode'] == pytest.approx(0.5, rel=0.05)
+    assert prediction.output_size == pytest.approx(250_000, rel=0.05)
+    assert model.estimate_seconds(task) == prediction.seconds
+
+
+def test_falls_back_to_all_formats_then_static():
+    """测试格式样本不足时使用全部格式的拟合,总样本不足时使用静态估计"""
+    model = CostModel()
+    assert model.predict(_task(1000, 1000)).basis == 'static'
+    assert model.predict(_task(1000, 1000)).output_size is None
+
+    _train(model, format='JPEG')
+    prediction = model.predict(_task(1000, 1000, format='GIF'))
+
+    assert prediction.basis == 'all'
+    assert prediction.seconds > 0
+
+
+def test_fit_refreshes_incrementally():
+    """测试新记录加入后预测随之更新"""
+    model = CostModel()
+    _train(model, seconds_per_mp=0.5)
+    before = model.predict(_task(1000, 1000)).seconds
+
+    _train(model, count=40, seconds_per_mp=2.0)
+
+    assert model.predict(_task(1000, 1000)).seconds > before + 0.5
+
+
+def test_records_persist_to_jsonl(tmp_path):
+    """测试记录追加到JSONL并在新实例中恢复,损坏的行被跳过"""
+    store = tmp_path / "history" / "costs.jsonl"
+    model = CostModel(store)
+    _train(model)
+    with open(store, 'a', encoding='utf-8') as f:
+        f.write("{not json\n")
+
+    restored = CostModel(store)
+
+    assert len(store.read_text(encoding='utf-8').splitlines()) == 13
+    assert restored.get_summary() == {'PNG': 12, '*': 12}
+    assert restored.predict(_task(1000, 1000)).seconds == pytest.approx(
+        model.predict(_task(1000, 1000)).seconds
+    )
+
+
+def test_skips_results_without_encoding():
+    """测试失败、缓存命中和没有编码阶段的结果不被记录"""
+    model = CostModel()
+    task = _task(100, 100)
+
+    assert model.record(task, ConversionResult(success=False)) is None
+    assert model.record(task, _result(task, pixel_cache='hit')) is None
+    assert model.record(task, ConversionResult(
+        success=True, output_size=10, encode_params={'method': 4}, stage_timings={'write': 0.1}
+    )) is None
+    assert model.sample_count == 0
+
+
+def test_unwritable_store_keeps_in_memory_fit(tmp_path):
+    """测试记录文件无法写入时仍计入内存中的拟合"""
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory")
+    model = CostModel(blocker / "costs.jsonl")
+
+    _train(model)
+
+    assert model.sample_count == 12
+    assert model.predict(_task(1000, 1000)).basis == 'format'
@@ -0,0 +1,97 @@
+"""
+DeadlineController单元测试
+
+测试截止时间模式下method的降级/升级逻辑,以及batch_convert的集成。
+"""
+
+import pytest
+from PIL import Image
+
+from src.models.image_file import ImageFile
+from src.models.conversion_task import ConversionTask
+from src.services.deadline_controller import DeadlineController
+
+
+class TestDeadlineController:
+    """截止时间控制器测试"""
+
+    def test_lowers_method_when_deadline_would_be_missed(self):
+        """预计超时时降到能赶上的最高method"""
+        controller = DeadlineController(
+            deadline_seconds=10.0, total_pixels=200_000_000, initial_method=4
+        )
+        # 实测method=4每秒仅处理10MP,剩余190MP需要19秒,超出10秒预算
+        controller.record(10_000_000, 1.0, 4)
+
+        method = controller.next_method()
+        assert method < 4
+        assert controller.projected_duration(method) <= controller.remaining_time
+
+    def test_falls_back_to_min_method_when_hopeless(self):
+        """所有method都赶不上时使用最低method"""
+        controller = DeadlineController(deadline_seconds=0.0, total_pixels=50_000_000)
+        assert controller.next_method() == 0
+
+    def test_raises_method_one_step_when_slack(self):
+        """时间充裕时每次提高一级"""
+        controller = DeadlineController(
+            deadline_seconds=3600.0, total_pixels=1_000_000, initial_method=2
+        )
+        assert controller.next_method() == 3
+        assert controller.next_method() == 4
+        for _ in range(5):
+            controller.next_method()
+        assert controller.current_method == 6
+
+    def test_calibrates_unobserved_methods(self):
+        """未实测的method按已实测method的比例校准"""
+        controller = DeadlineController(deadline_seconds=60.0, total_pixels=10_000_000)
+        # 实测method=4的吞吐量是经验值的一半
+        controller.record(5_000_000, 1.0, 4)
+        assert controller.estimate_mpps(4) == pytest.approx(5.0)
+        assert controller.estimate_mpps(0) == pytest.approx(15.0)
+
+    def test_summary_reports_throughput(self):
+        """摘要包含吞吐量和当前method"""
+        controller = DeadlineController(deadline_seconds=60.0, total_pixels=2_000_000)
+        controller.record(1_000_000, 0.5, 4)
+        summary = controller.get_summary()
+        assert summary['completed_pixels'] == 1_000_000
+        assert summary['current_method'] == 4
+        assert summary['throughput_mpps'] >= 0
+
+
+class TestBatchConvertDeadline:
+    """batch_convert截止时间模式测试"""
+
+    def _create_tasks(self, tmp_path, count):
+        tasks = []
+        for i in range(count):
+            img_path = tmp_path / f"image_{i}.png"
+            Image.new('RGB', (120, 90), color='orange').save(img_path, 'PNG')
+            tasks.append(ConversionTask(
+                input_file=ImageFile.from_path(img_path),
+                output_path=tmp_path / f"output_{i}.webp",
+                quality=80
+            ))
+        return tasks
+
+    def test_expired_deadline_uses_fastest_method(self, tmp_path):
+        """截止时间已过时所有任务使用最低method"""
+        from src.services.converter_service import ConverterService
+
+        tasks = self._create_tasks(tmp_path, 3)
+        results = ConverterService().batch_convert(tasks, max_workers=1, deadline=0.0)
+
+        assert all(r.success for r in results)
+        assert [r.encode_params['method'] for r in results] == [0, 0, 0]
+
+    def test_generous_deadline_raises_method(self, tmp_path):
+        """时间充裕时method逐步提高"""
+        from src.services.converter_service import ConverterService
+
+        tasks = self._create_tasks(tmp_path, 3)
+        results = ConverterService().batch_convert(tasks, max_workers=1, deadline=3600.0)
+
+        assert all(r.success for r in results)
+        assert [r.encode_params['method'] for r in results] == [5, 6, 6]
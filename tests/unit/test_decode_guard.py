@@ -0,0 +1,145 @@
+"""
+DecodeGuard单元测试
+
+测试文件头解析、解码成本检查(拒绝/分块)和批量转换的内存预算。
+"""
+
+import struct
+import threading
+import time
+import zlib
+
+import pytest
+from PIL import Image
+
+from src.models.image_file import ImageFile
+from src.services.converter_service import ConverterService
+from src.services.decode_guard import DecodeGuard, DecodeVerdict, MemoryBudget
+from src.utils.image_header import read_image_header
+
+
+def _create_png_bomb(path, width=60000, height=60000):
+    """只有文件头声称巨大尺寸的PNG(约几十字节)"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    path.write_bytes(
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        + chunk(b'IDAT', zlib.compress(b''))
+        + chunk(b'IEND', b'')
+    )
+
+
+@pytest.mark.parametrize("fmt, mode, bands, params", [
+    ('PNG', 'RGBA', 4, {}),
+    ('GIF', 'P', 1, {}),
+    ('BMP', 'RGB', 3, {}),
+    ('JPEG', 'RGB', 3, {'exif': b'Exif\x00\x00' + b'\x00' * 200}),
+    ('WEBP', 'RGB', 3, {}),
+    ('WEBP', 'RGBA', 4, {'lossless': True}),
+])
+def test_read_image_header(tmp_path, fmt, mode, bands, params):
+    """测试各格式文件头解析"""
+    path = tmp_path / f"img.{fmt.lower()}"
+    Image.new(mode, (321, 123)).save(path, format=fmt, **params)
+
+    header = read_image_header(path)
+
+    assert (header.format, header.width, header.height) == (fmt, 321, 123)
+    assert header.bands == bands
+    assert header.decode_bytes == 321 * 123 * bands
+
+
+def test_read_image_header_unknown(tmp_path):
+    """测试无法识别的文件返回None"""
+    path = tmp_path / "notes.txt"
+    path.write_text("not an image")
+    assert read_image_header(path) is None
+
+
+def test_guard_rejects_decompression_bomb(tmp_path):
+    """测试文件头声称巨大尺寸的PNG在解码前被拒绝"""
+    path = tmp_path / "bomb.png"
+    _create_png_bomb(path)
+
+    check = DecodeGuard().check(path)
+
+    assert check.verdict == DecodeVerdict.REJECT
+    assert "60000x60000" in check.message
+
+
+def test_default_limit_is_pillow_hard_limit():
+    """测试默认上限为Pillow硬上限: 超过MAX_IMAGE_PIXELS的不可分块图片仍允许整张解码"""
+    from src.utils.image_header import ImageHeader
+
+    guard = DecodeGuard()
+    large = ImageHeader(format='PNG', width=10000, height=10000, bands=3)
+    assert Image.MAX_IMAGE_PIXELS < large.pixel_count < 2 * Image.MAX_IMAGE_PIXELS
+
+    assert guard.max_pixels == 2 * Image.MAX_IMAGE_PIXELS
+    assert guard.check_header(large).verdict == DecodeVerdict.ALLOW
+    huge = ImageHeader(format='PNG', width=20000, height=20000, bands=3)
+    assert guard.check_header(huge).verdict == DecodeVerdict.REJECT
+
+
+def test_convert_image_rejects_bomb_without_decoding(tmp_path):
+    """测试ImageFile只读文件头,转换阶段直接拒绝"""
+    path = tmp_path / "bomb.png"
+    _create_png_bomb(path)
+
+    image_file = ImageFile.from_path(path)
+    assert (image_file.width, image_file.height) == (60000, 60000)
+    assert image_file.decode_bytes == 60000 * 60000 * 3
+
+    result = ConverterService().convert_image(image_file, tmp_path / "bomb.webp", quality=80)
+    assert result.success is False
+    assert "60000x60000" in result.error_message
+
+
+def test_guard_tiles_streamable_inputs(tmp_path):
+    """测试可按条带读取的超限图片改为分块处理"""
+    path = tmp_path / "scan.bmp"
+    Image.new('RGB', (200, 100), 'white').save(path)
+
+    service = ConverterService()
+    service.decode_guard = DecodeGuard(max_pixels=5000)
+    assert service.decode_guard.check(path).verdict == DecodeVerdict.TILE
+
+    result = service.convert_image(ImageFile.from_path(path), tmp_path / "scan.webp", quality=80)
+    assert result.success is True
+    assert result.encode_params['tile_mode'] == 'SPLIT'
+
+
+def test_guard_memory_limit_rejects_compressed(tmp_path):
+    """测试超出内存上限的压缩格式图片被拒绝"""
+    path = tmp_path / "photo.png"
+    Image.new('RGB', (200, 100)).save(path)
+
+    check = DecodeGuard(max_decode_bytes=10_000).check(path)
+    assert check.verdict == DecodeVerdict.REJECT
+
+
+def test_memory_budget_limits_concurrency():
+    """测试内存预算限制同时进行的任务"""
+    budget = MemoryBudget(100)
+
+    def work():
+        with budget.reserve(60):
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert budget.peak_bytes == 60
+    assert budget.in_use == 0
+
+
+def test_memory_budget_oversized_task_runs_alone():
+    """测试超出总预算的任务按总预算预留"""
+    budget = MemoryBudget(100)
+    with budget.reserve(500) as granted:
+        assert granted == 100
@@ -0,0 +1,67 @@
+"""
+DedupService单元测试
+
+测试按大小/文件头/全文哈希分组,以及转换参数不同的任务不合并。
+"""
+
+from PIL import Image
+
+from src.models.image_file import ImageFile
+from src.models.conversion_task import ConversionTask
+from src.services.dedup_service import DedupService
+
+
+def _task(path, quality=80):
+    return ConversionTask(
+        input_file=ImageFile.from_path(path),
+        output_path=path.with_suffix('.webp'),
+        quality=quality
+    )
+
+
+def test_identical_files_grouped(tmp_path):
+    """测试内容相同的文件归为一组,主任务为组内第一个"""
+    source = tmp_path / "a.png"
+    Image.new('RGB', (32, 32), (10, 20, 30)).save(source)
+    other = tmp_path / "b.png"
+    Image.new('RGB', (32, 32), (30, 20, 10)).save(other)
+    copies = [tmp_path / f"copy_{i}.png" for i in range(2)]
+    for copy in copies:
+        copy.write_bytes(source.read_bytes())
+
+    plan = DedupService().plan([_task(p) for p in [source, other, *copies]])
+
+    assert plan.primaries == [0, 1]
+    assert plan.duplicates == {2: 0, 3: 0}
+    assert plan.ratio(4) == 0.5
+
+
+def test_same_head_different_tail_not_grouped(tmp_path):
+    """测试文件头相同但尾部不同的同大小文件不合并"""
+    service = DedupService()
+    first = tmp_path / "first.png"
+    Image.new('RGB', (8, 8)).save(first)
+    head = first.read_bytes() + b'\x00' * service.HEAD_BYTES  # IEND之后的填充不影响解码
+    second = tmp_path / "second.png"
+    first.write_bytes(head + b'A')
+    second.write_bytes(head + b'B')
+    third = tmp_path / "third.png"
+    third.write_bytes(head + b'A')
+    tasks = [_task(first), _task(second), _task(third)]
+
+    plan = service.plan(tasks)
+
+    assert plan.duplicates == {2: 0}
+
+
+def test_different_params_not_grouped(tmp_path):
+    """测试转换参数不同的相同文件分别转换"""
+    source = tmp_path / "a.png"
+    Image.new('RGB', (32, 32)).save(source)
+    copy = tmp_path / "b.png"
+    copy.write_bytes(source.read_bytes())
+
+    plan = DedupService().plan([_task(source, quality=80), _task(copy, quality=50)])
+
+    assert plan.duplicate_count == 0
+    assert plan.primaries == [0, 1]
@@ -0,0 +1,106 @@
+"""
+EXIF IFD过滤工具单元测试
+
+测试去除GPS、只保留指定标签、去除缩略图、方向标签读写以及无法解析时原样返回。
+"""
+
+import struct
+
+from PIL import Image
+
+from src.utils.exif_ifd import (
+    filter_exif, get_orientation, set_orientation, EXIF_PREFIX, TAG_ORIENTATION, TAG_GPS_IFD
+)
+
+
+def _pillow_exif(with_gps: bool = True) -> bytes:
+    exif = Image.Exif()
+    exif[TAG_ORIENTATION] = 6
+    exif[0x010F] = "Maker"
+    exif.get_ifd(0x8769)[0x9003] = "2024:01:01 12:00:00"
+    if with_gps:
+        exif.get_ifd(TAG_GPS_IFD)[1] = "N"
+    return exif.tobytes()
+
+
+def _exif_with_thumbnail(thumbnail: bytes) -> bytes:
+    """手工构造带IFD1缩略图的大端EXIF: IFD0(方向) -> IFD1(缩略图偏移/长度)"""
+    ifd0 = struct.pack('>H', 1) + struct.pack('>HHIHH', TAG_ORIENTATION, 3, 1, 3, 0)
+    ifd1_offset = 8 + len(ifd0) + 4
+    ifd0 += struct.pack('>I', ifd1_offset)
+    thumb_offset = ifd1_offset + 2 + 2 * 12 + 4
+    ifd1 = (
+        struct.pack('>H', 2)
+        + struct.pack('>HHII', 0x0201, 4, 1, thumb_offset)
+        + struct.pack('>HHII', 0x0202, 4, 1, len(thumbnail))
+        + struct.pack('>I', 0)
+    )
+    return EXIF_PREFIX + b'MM\x00*' + struct.pack('>I', 8) + ifd0 + ifd1 + thumbnail
+
+
+def _parse(data: bytes) -> Image.Exif:
+    exif = Image.Exif()
+    exif.load(data)
+    return exif
+
+
+def test_strip_gps_keeps_other_tags():
+    """测试去除GPS子IFD,IFD0与Exif子IFD保留"""
+    data = _pillow_exif()
+    assert _parse(data).get_ifd(TAG_GPS_IFD)
+
+    filtered = _parse(filter_exif(data, strip_gps=True))
+
+    assert TAG_GPS_IFD not in filtered
+    assert filtered[TAG_ORIENTATION] == 6
+    assert filtered[0x010F] == "Maker"
+    assert filtered.get_ifd(0x8769)[0x9003] == "2024:01:01 12:00:00"
+
+
+def test_keep_tags_only():
+    """测试只保留方向标签"""
+    data = _pillow_exif()
+    result = filter_exif(data, keep_tags={TAG_ORIENTATION})
+
+    assert result.startswith(EXIF_PREFIX)
+    assert len(result) < len(data)
+    assert dict(_parse(result)) == {TAG_ORIENTATION: 6}
+
+
+def test_keep_tags_none_left_returns_none():
+    """测试过滤后不剩标签时返回None"""
+    assert filter_exif(_pillow_exif(), keep_tags={0x9999}) is None
+
+
+def test_strip_thumbnail():
+    """测试去除IFD1缩略图,未去除时缩略图保留"""
+    thumbnail = b'\xff\xd8' + b'\x00' * 3000 + b'\xff\xd9'
+    data = _exif_with_thumbnail(thumbnail)
+
+    kept = filter_exif(data)
+    assert thumbnail in kept
+
+    stripped = filter_exif(data, strip_thumbnail=True)
+    assert thumbnail not in stripped
+    assert len(stripped) < 100
+    assert _parse(stripped)[TAG_ORIENTATION] == 3
+
+
+def test_unparseable_data_returned_unchanged():
+    """测试无法解析的数据原样返回"""
+    garbage = EXIF_PREFIX + b'not a tiff header'
+    assert filter_exif(garbage, strip_gps=True) == garbage
+
+
+def test_orientation_read_and_rewrite_in_place():
+    """测试读取方向标签并原位改写,其余字节不变"""
+    data = _pillow_exif()
+    assert get_orientation(data) == 6
+
+    rewritten = set_orientation(data, 1)
+
+    assert len(rewritten) == len(data)
+    assert get_orientation(rewritten) == 1
+    assert _parse(rewritten)[0x010F] == "Maker"
+    assert get_orientation(None) == 1
+    assert get_orientation(b'garbage') == 1
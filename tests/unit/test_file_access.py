@@ -0,0 +1,87 @@
+"""
+文件访问工具单元测试
+
+测试mmap映射打开图片、posix_fadvise提示以及转换时的读取策略。
+"""
+
+import os
+
+import pytest
+from PIL import Image
+
+from src.models.image_file import ImageFile
+from src.models.io_policy import IOPolicy
+from src.utils.file_access import map_file, prefetch, release
+from src.utils.image_open import open_image
+
+
+def test_map_file_opens_with_pillow(tmp_path):
+    """测试mmap映射可直接交给Pillow解码"""
+    path = tmp_path / "scan.png"
+    Image.new('RGB', (40, 30), (1, 2, 3)).save(path)
+
+    mapped = map_file(path)
+    try:
+        assert mapped[:] == path.read_bytes()
+        with open_image(path, mapped) as img:
+            img.load()
+            assert img.size == (40, 30)
+            assert img.getpixel((0, 0)) == (1, 2, 3)
+    finally:
+        mapped.close()
+
+
+def test_map_empty_or_missing_file(tmp_path):
+    """测试空文件和不存在的文件返回None"""
+    empty = tmp_path / "empty.png"
+    empty.write_bytes(b'')
+
+    assert map_file(empty) is None
+    assert map_file(tmp_path / "missing.png") is None
+
+
+@pytest.mark.skipif(not hasattr(os, 'posix_fadvise'), reason="平台不支持posix_fadvise")
+def test_fadvise_hints(tmp_path):
+    """测试预读和释放提示"""
+    path = tmp_path / "data.bin"
+    path.write_bytes(b'\x00' * 4096)
+
+    assert prefetch(path) is True
+    assert release(path) is True
+    assert prefetch(tmp_path / "missing.bin") is False
+
+
+def test_io_policy_threshold():
+    """测试mmap阈值"""
+    assert IOPolicy(mmap_min_bytes=100).use_mmap(100) is True
+    assert IOPolicy(mmap_min_bytes=100).use_mmap(99) is False
+    assert IOPolicy(mmap_min_bytes=None).use_mmap(10 ** 9) is False
+
+
+def test_mmap_conversion_matches_path_conversion(tmp_path):
+    """测试mmap打开与按路径打开的转换结果相同,批量预读不影响结果"""
+    from src.services.converter_service import ConverterService
+    from src.models.conversion_task import ConversionTask
+
+    inputs = []
+    for i in range(3):
+        path = tmp_path / f"input_{i}.png"
+        Image.new('RGB', (64, 64), (i * 50, 100, 200)).save(path)
+        inputs.append(ImageFile.from_path(path))
+    service = ConverterService()
+
+    mapped = service.convert_image(
+        inputs[0], tmp_path / "mapped.webp", quality=80, io_policy=IOPolicy(mmap_min_bytes=0)
+    )
+    plain = service.convert_image(inputs[0], tmp_path / "plain.webp", quality=80)
+    assert mapped.success is True
+    assert mapped.output_path.read_bytes() == plain.output_path.read_bytes()
+
+    tasks = [
+        ConversionTask(input_file=f, output_path=tmp_path / f"batch_{i}.webp", quality=80)
+        for i, f in enumerate(inputs)
+    ]
+    results = service.batch_convert(
+        tasks, max_workers=1, io_policy=IOPolicy(mmap_min_bytes=0, readahead=2)
+    )
+    assert all(result.success for result in results)
@@ -6,6 +6,7 @@
 - check_disk_space: 磁盘空间检查
 - validate_file_path: 文件路径验证
 - get_safe_filename: 文件名清理
+- link_or_copy: 链接/复制不覆盖其他文件
 """
 
 import pytest
@@ -336,3 +337,55 @@ def test_get_safe_filename_empty():
     safe = service.get_safe_filename("")
 
     assert safe == ""  # 或返回默认值如"untitled"
+
+
+# ============= link_or_copy 测试 =============
+
+def test_link_or_copy_same_file_untouched(tmp_path):
+    """测试目标即源文件本身时不做任何操作"""
+    from src.services.file_service import FileService
+
+    service = FileService()
+    source = tmp_path / "a.png"
+    source.write_bytes(b"data")
+
+    assert service.link_or_copy(source, source) == "same"
+    assert service.link_or_copy_unique(source, source) == (source, "same")
+    assert source.read_bytes() == b"data"
+
+
+def test_link_or_copy_refuses_existing_target(tmp_path):
+    """测试默认不覆盖已存在的其他文件,overwrite=True时原子替换"""
+    from src.services.file_service import FileService
+
+    service = FileService()
+    source = tmp_path / "a.png"
+    source.write_bytes(b"data")
+    target = tmp_path / "b.png"
+    target.write_bytes(b"other")
+
+    with pytest.raises(FileExistsError):
+        service.link_or_copy(source, target)
+    assert target.read_bytes() == b"other"
+
+    assert service.link_or_copy(source, target, overwrite=True) in ("hardlink", "reflink", "copy")
+    assert target.read_bytes() == b"data"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.png", "b.png"]
+
+
+def test_link_or_copy_unique_renames(tmp_path):
+    """测试目标被其他文件占用时自动重命名"""
+    from src.services.file_service import FileService
+
+    service = FileService()
+    source = tmp_path / "src" / "photo.jpg"
+    source.parent.mkdir()
+    source.write_bytes(b"data")
+    (tmp_path / "photo.jpg").write_bytes(b"other")
+
+    path, method = service.link_or_copy_unique(source, tmp_path / "photo.jpg")
+
+    assert path == tmp_path / "photo_1.jpg"
+    assert method in ("hardlink", "reflink", "copy")
+    assert path.read_bytes() == b"data"
+    assert (tmp_path / "photo.jpg").read_bytes() == b"other"
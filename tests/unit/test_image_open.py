@@ -0,0 +1,60 @@
+"""
+图片打开工具单元测试
+
+测试扩展名格式提示、插件预注册和扩展名不符时的回退。
+"""
+
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from src.utils.image_open import format_hint, open_image, preinit_plugins, SUPPORTED_FORMATS
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("photo.JPG", "JPEG"),
+    ("photo.jpeg", "JPEG"),
+    ("icon.png", "PNG"),
+    ("anim.gif", "GIF"),
+    ("scan.bmp", "BMP"),
+    ("image.webp", "WEBP"),
+    ("scan.tiff", None),
+])
+def test_format_hint(name, expected):
+    """测试扩展名到格式的映射"""
+    assert format_hint(name) == expected
+
+
+def test_preinit_registers_supported_plugins():
+    """测试预注册覆盖全部支持格式(包括Image.preinit不含的WebP)"""
+    preinit_plugins()
+    for format_name in SUPPORTED_FORMATS:
+        assert format_name in Image.OPEN
+        assert format_name in Image.SAVE
+
+
+def test_open_image_with_hint(tmp_path):
+    """测试按扩展名提示打开"""
+    path = tmp_path / "image.webp"
+    Image.new('RGB', (8, 4)).save(path)
+
+    with open_image(path) as img:
+        assert img.format == 'WEBP'
+        assert img.size == (8, 4)
+
+
+def test_open_image_falls_back_on_mismatch(tmp_path):
+    """测试扩展名与内容不符时退回完整扫描"""
+    path = tmp_path / "actually_png.jpg"
+    Image.new('RGB', (8, 4)).save(path, format='PNG')
+
+    with open_image(path) as img:
+        assert img.format == 'PNG'
+
+
+def test_open_image_rejects_non_image(tmp_path):
+    """测试非图片文件仍抛出UnidentifiedImageError"""
+    path = tmp_path / "notes.png"
+    path.write_text("not an image")
+
+    with pytest.raises(UnidentifiedImageError):
+        open_image(path)
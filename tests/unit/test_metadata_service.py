@@ -9,6 +9,7 @@ from pathlib import Path
 from PIL import Image
 
 from src.models.image_metadata import ImageMetadata
+from src.models.metadata_policy import MetadataPolicy
 
 
 class TestMetadataService:
@@ -156,3 +157,194 @@ class TestMetadataService:
         if original_metadata.exif:
             assert is_valid is False
             assert "丢失" in message or "失败" in message or "不一致" in message
+
+
+class TestReadFileMetadata:
+    """不打开解码器的原始元数据读取测试"""
+
+    XMP = b'<x:xmpmeta xmlns:x="adobe:ns:meta/"></x:xmpmeta>'
+
+    def _exif(self):
+        exif = Image.Exif()
+        exif[0x0110] = "Test Camera"
+        return exif
+
+    def _assert_matches_pillow(self, path):
+        from src.services.metadata_service import MetadataService
+
+        metadata = MetadataService().read_file_metadata(path)
+        with Image.open(path) as img:
+            assert metadata.exif == img.info.get('exif')
+            assert metadata.xmp == img.info.get('xmp')
+            assert metadata.icc_profile == img.info.get('icc_profile')
+        return metadata
+
+    def test_jpeg_segments_match_pillow(self, tmp_path):
+        """测试JPEG的APP1/APP2读取结果与Pillow一致(ICC分多段)"""
+        path = tmp_path / "photo.jpg"
+        icc = bytes(range(256)) * 600  # 超过单个APP2段上限,会被拆成多段
+        Image.new('RGB', (16, 16)).save(path, exif=self._exif(), xmp=self.XMP, icc_profile=icc)
+
+        metadata = self._assert_matches_pillow(path)
+        assert metadata.icc_profile == icc
+        assert metadata.xmp == self.XMP
+
+    def test_png_chunks_match_pillow(self, tmp_path):
+        """测试PNG的eXIf/iTXt/iCCP读取结果与Pillow一致"""
+        from PIL import PngImagePlugin
+
+        path = tmp_path / "graphic.png"
+        pnginfo = PngImagePlugin.PngInfo()
+        pnginfo.add_itxt('XML:com.adobe.xmp', self.XMP.decode(), zip=True)
+        Image.new('RGB', (16, 16)).save(
+            path, exif=self._exif(), icc_profile=b'fake icc profile', pnginfo=pnginfo
+        )
+
+        metadata = self._assert_matches_pillow(path)
+        assert metadata.has_metadata
+
+    def test_other_formats_fall_back_to_pillow(self, tmp_path):
+        """测试非JPEG/PNG格式回退到Pillow"""
+        from src.services.metadata_service import MetadataService
+
+        path = tmp_path / "image.webp"
+        Image.new('RGB', (16, 16)).save(path, exif=self._exif())
+
+        metadata = MetadataService().read_file_metadata(path)
+        assert metadata.exif is not None
+
+    def test_batch_skips_unreadable(self, tmp_path):
+        """测试批量读取跳过无法读取的文件"""
+        from src.services.metadata_service import MetadataService
+
+        good = tmp_path / "good.jpg"
+        Image.new('RGB', (16, 16)).save(good)
+        bad = tmp_path / "bad.png"
+        bad.write_text("not an image")
+
+        results = MetadataService().read_file_metadata_batch([good, bad])
+        assert list(results) == [good]
+        assert not results[good].has_metadata
+
+    def test_malformed_png_chunks_keep_other_fields(self, tmp_path):
+        """测试缺少NUL分隔符的iCCP/iTXt块被跳过,其余元数据照常返回"""
+        import struct
+        import zlib
+        from src.utils.raw_metadata import read_raw_metadata
+
+        def chunk(chunk_type, data):
+            crc = zlib.crc32(chunk_type + data)
+            return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', crc)
+
+        path = tmp_path / "malformed.png"
+        Image.new('RGB', (16, 16)).save(path, exif=self._exif())
+        data = path.read_bytes()
+        idat = data.index(b'IDAT') - 4
+        path.write_bytes(
+            data[:idat] + chunk(b'iCCP', b'no separator') + chunk(b'iTXt', b'no separator')
+            + data[idat:]
+        )
+
+        metadata = read_raw_metadata(path)
+        assert metadata is not None
+        assert metadata.exif is not None
+        assert metadata.icc_profile is None
+        assert metadata.xmp is None
+
+
+class TestWebPMetadataChunks:
+    """基于RIFF块的WebP元数据验证和改写测试"""
+
+    def test_validate_detects_changed_xmp(self, tmp_path):
+        """测试XMP内容不一致时验证失败"""
+        from src.services.metadata_service import MetadataService
+
+        output_path = tmp_path / "output.webp"
+        Image.new('RGB', (16, 16)).save(output_path, xmp=b'<changed/>')
+
+        original = ImageMetadata(xmp=b'<original/>')
+        is_valid, message = MetadataService().validate_metadata_preservation(original, output_path)
+        assert is_valid is False
+        assert "不一致" in message
+
+    def test_validate_ignores_exif_prefix(self, tmp_path):
+        """测试JPEG的EXIF前缀不影响与WebP EXIF块的比较"""
+        from src.services.metadata_service import MetadataService
+
+        exif = Image.Exif()
+        exif[0x0110] = "Test Camera"
+        exif_bytes = exif.tobytes()
+        output_path = tmp_path / "output.webp"
+        Image.new('RGB', (16, 16)).save(output_path, exif=exif_bytes)
+
+        original = ImageMetadata(exif=exif_bytes)
+        assert original.exif.startswith(b'Exif\x00\x00')
+        is_valid, _ = MetadataService().validate_metadata_preservation(original, output_path)
+        assert is_valid is True
+
+    def test_replace_webp_metadata(self, tmp_path):
+        """测试替换WebP元数据后验证通过"""
+        from src.services.metadata_service import MetadataService
+
+        path = tmp_path / "output.webp"
+        Image.new('RGB', (16, 16)).save(path)
+        metadata = ImageMetadata(xmp=b'<x/>', icc_profile=b'icc')
+
+        service = MetadataService()
+        service.replace_webp_metadata(path, metadata)
+
+        assert service.validate_metadata_preservation(metadata, path) == (True, "元数据保留成功")
+
+
+class TestMetadataPolicy:
+    """元数据策略过滤测试"""
+
+    @staticmethod
+    def _metadata():
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        exif[0x010F] = "Maker"
+        exif.get_ifd(0x8825)[1] = "N"
+        return ImageMetadata(exif=exif.tobytes(), xmp=b'<x/>', icc_profile=b'icc')
+
+    @staticmethod
+    def _service():
+        from src.services.metadata_service import MetadataService
+
+        return MetadataService()
+
+    def test_keep_all_returns_same_object(self):
+        """测试KEEP_ALL不复制元数据"""
+        service = self._service()
+        metadata = self._metadata()
+        assert service.apply_policy(metadata, MetadataPolicy.KEEP_ALL) is metadata
+
+    def test_strip_all(self):
+        """测试STRIP_ALL去除全部元数据"""
+        result = self._service().apply_policy(self._metadata(), MetadataPolicy.STRIP_ALL)
+        assert not result.has_metadata
+
+    def test_strip_gps(self):
+        """测试STRIP_GPS只去除GPS,XMP/ICC保留"""
+        metadata = self._metadata()
+        result = self._service().apply_policy(metadata, MetadataPolicy.STRIP_GPS)
+
+        exif = Image.Exif()
+        exif.load(result.exif)
+        assert 0x8825 not in exif
+        assert exif[0x010F] == "Maker"
+        assert result.xmp == b'<x/>'
+        assert result.icc_profile == b'icc'
+        assert result.byte_size < metadata.byte_size
+
+    def test_keep_orientation_and_icc(self):
+        """测试只保留方向和ICC"""
+        result = self._service().apply_policy(
+            self._metadata(), MetadataPolicy.KEEP_ORIENTATION_AND_ICC
+        )
+
+        exif = Image.Exif()
+        exif.load(result.exif)
+        assert dict(exif) == {0x0112: 6}
+        assert result.xmp is None
+        assert result.icc_profile == b'icc'
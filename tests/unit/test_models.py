@@ -106,6 +106,53 @@ def test_quality_preset_ordering():
     assert high < normal < low
 
 
+# ============= EncoderProfile 测试 =============
+
+def test_encoder_profile_fixed_methods():
+    """测试固定档位返回固定method"""
+    from src.models.encoder_profile import EncoderProfile
+
+    assert EncoderProfile.FASTEST.resolve_method(80_000_000) == 1
+    assert EncoderProfile.BALANCED.resolve_method(80_000_000) == 4
+    assert EncoderProfile.SMALLEST.resolve_method(80_000_000) == 6
+
+
+def test_encoder_profile_auto_selection():
+    """测试自动档位按像素数和时间预算选择method"""
+    from src.models.encoder_profile import EncoderProfile, estimate_encode_time
+
+    # 缩略图使用最慢最小的method
+    assert EncoderProfile.AUTO.resolve_method(200 * 200) == 6
+
+    # 大图在预算内选择尽可能高的method
+    pixel_count = 12_000_000
+    method = EncoderProfile.AUTO.resolve_method(pixel_count, time_budget=2.0)
+    assert estimate_encode_time(pixel_count, method) <= 2.0
+    if method < 6:
+        assert estimate_encode_time(pixel_count, method + 1) > 2.0
+
+    # 80MP扫描件在紧预算下降到低method,预算不足时返回0
+    assert EncoderProfile.AUTO.resolve_method(80_000_000, time_budget=4.0) <= 2
+    assert EncoderProfile.AUTO.resolve_method(80_000_000, time_budget=0.01) == 0
+
+
+# ============= OutputPolicy 测试 =============
+
+def test_output_policy_threshold():
+    """测试输出策略的大小阈值"""
+    from src.models.output_policy import OutputPolicy, FallbackAction
+
+    policy = OutputPolicy()
+    assert policy.fallback == FallbackAction.KEEP_ORIGINAL
+    assert policy.accepts(1000, 1000) is True
+    assert policy.accepts(1001, 1000) is False
+
+    strict = OutputPolicy(min_savings_percent=20)
+    assert strict.size_threshold(1000) == 800
+    assert strict.accepts(800, 1000) is True
+    assert strict.accepts(801, 1000) is False
+
+
 # ============= ImageFile 测试 =============
 
 def test_image_file_from_path_valid():
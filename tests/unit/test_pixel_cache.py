@@ -0,0 +1,70 @@
+"""
+PixelCache单元测试
+
+测试缓存键忽略元数据、命中后重写元数据块以及按磁盘大小的LRU淘汰。
+"""
+
+import io
+
+from PIL import Image
+
+from src.services.pixel_cache import PixelCache
+
+
+def _webp(color, **params) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buffer, format='WEBP', **params)
+    return buffer.getvalue()
+
+
+def test_key_ignores_metadata_params(tmp_path):
+    """测试缓存键只取决于像素和编码参数"""
+    cache = PixelCache(tmp_path)
+    img = Image.new('RGB', (16, 16), (1, 2, 3))
+
+    base = cache.key(img, {'quality': 80, 'method': 4})
+
+    assert cache.key(img, {'method': 4, 'quality': 80, 'exif': b'x', 'xmp': b'y'}) == base
+    assert cache.key(img, {'quality': 70, 'method': 4}) != base
+    assert cache.key(Image.new('RGB', (16, 16), (1, 2, 4)), {'quality': 80, 'method': 4}) != base
+
+
+def test_lookup_rewrites_metadata(tmp_path):
+    """测试缓存中不含元数据,命中后写入调用方的元数据"""
+    cache = PixelCache(tmp_path)
+    cache.put('k', _webp((9, 9, 9), xmp=b'<old/>'))
+
+    assert cache.get('k').find(b'<old/>') == -1
+    data = cache.lookup('k', {'exif': b'Exif\x00\x00MM\x00*\x00\x00\x00\x08\x00\x00'})
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        assert img.info['exif'] == b'MM\x00*\x00\x00\x00\x08\x00\x00'
+    assert cache.lookup('missing', {}) is None
+    assert cache.get_summary()['hits'] == 2
+    assert cache.get_summary()['misses'] == 1
+
+
+def test_lru_eviction_by_size(tmp_path):
+    """测试超出大小上限时淘汰最久未使用的条目"""
+    entry = _webp((0, 0, 0))
+    cache = PixelCache(tmp_path, max_bytes=len(entry) * 2 + 16)
+    cache.put('a', entry)
+    cache.put('b', _webp((0, 0, 1)))
+    cache.get('a')
+    cache.put('c', _webp((0, 0, 2)))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.total_bytes <= cache.max_bytes
+    assert not (tmp_path / 'b.webp').exists()
+    assert cache.get_summary()['evictions'] == 1
+
+
+def test_existing_entries_restored(tmp_path):
+    """测试重新打开缓存目录时恢复已有条目"""
+    PixelCache(tmp_path).put('a', _webp((5, 5, 5)))
+
+    cache = PixelCache(tmp_path)
+
+    assert cache.get('a') is not None
+    assert cache.total_bytes == (tmp_path / 'a.webp').stat().st_size
@@ -0,0 +1,125 @@
+"""
+RateDistortionService单元测试
+
+测试率失真扫描、拐点汇总、报告输出和PSNR/SSIM指标。
+"""
+
+import csv
+import json
+import pytest
+from PIL import Image, ImageFilter
+
+from src.models.quality_preset import QualityPreset
+from src.services.rate_distortion_service import RateDistortionService
+from src.utils.image_metrics import compute_psnr, compute_ssim, MAX_PSNR
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """创建包含照片和图形两类内容的小语料"""
+    photo = Image.merge('RGB', [
+        Image.effect_noise((320, 240), 40),
+        Image.radial_gradient('L').resize((320, 240)),
+        Image.linear_gradient('L').resize((320, 240)),
+    ])
+    photo.save(tmp_path / "photo.jpg", 'JPEG', quality=95)
+
+    graphic = Image.new('RGB', (200, 200), color='white')
+    graphic.paste((255, 0, 0), (20, 20, 120, 120))
+    graphic.save(tmp_path / "graphic.png", 'PNG')
+
+    return [tmp_path / "photo.jpg", tmp_path / "graphic.png"]
+
+
+class TestImageMetrics:
+    """PSNR/SSIM指标测试"""
+
+    def test_identical_images(self):
+        """相同图片PSNR封顶,SSIM为1"""
+        img = Image.radial_gradient('L').convert('RGB')
+        assert compute_psnr(img, img) == MAX_PSNR
+        assert compute_ssim(img, img) == pytest.approx(1.0)
+
+    def test_degraded_image_scores_lower(self):
+        """模糊后的图片指标下降"""
+        img = Image.radial_gradient('L').convert('RGB')
+        blurred = img.filter(ImageFilter.GaussianBlur(3))
+        assert compute_psnr(img, blurred) < MAX_PSNR
+        assert compute_ssim(img, blurred) < 1.0
+
+    def test_size_mismatch_raises(self):
+        """尺寸不一致时抛出ValueError"""
+        with pytest.raises(ValueError):
+            compute_psnr(Image.new('RGB', (10, 10)), Image.new('RGB', (20, 20)))
+
+
+class TestRateDistortionService:
+    """率失真扫描测试"""
+
+    def test_sweep_covers_grid(self, corpus):
+        """每张图片产生 质量数×method数 个测量点"""
+        service = RateDistortionService()
+        points = service.sweep(corpus, qualities=[40, 90], methods=[0, 4], max_workers=2)
+
+        assert len(points) == 2 * 2 * 2
+        for point in points:
+            assert point.output_size > 0
+            assert point.encode_time >= 0
+            assert 0 < point.psnr <= MAX_PSNR
+
+        # 同一图片同一method下,高质量PSNR不低于低质量
+        photo = {(p.quality, p.method): p for p in points if p.file_name == "photo.jpg"}
+        assert photo[(90, 4)].psnr >= photo[(40, 4)].psnr
+        assert photo[(90, 4)].output_size >= photo[(40, 4)].output_size
+
+    def test_default_grid_includes_presets(self):
+        """默认质量网格包含所有预设质量值"""
+        for preset in QualityPreset:
+            assert preset.quality_value in RateDistortionService.DEFAULT_QUALITIES
+
+    def test_summarize_reports_knee_per_content_type(self, corpus):
+        """汇总按内容类型给出拐点和预设表现"""
+        service = RateDistortionService()
+        points = service.sweep(corpus, qualities=[30, 60, 80, 95], methods=[4])
+        summary = service.summarize(points)
+
+        assert set(summary) == {'PHOTO', 'GRAPHIC'}
+        for info in summary.values():
+            assert info['image_count'] == 1
+            assert info['methods'][4]['knee_quality'] in (30, 60, 80, 95)
+            assert info['presets']['NORMAL'][4]['quality'] == 80
+
+    def test_custom_content_type(self, corpus):
+        """支持自定义内容类型分类函数"""
+        service = RateDistortionService()
+        points = service.sweep(
+            corpus, qualities=[80], methods=[4],
+            content_type_fn=lambda img: "all"
+        )
+        assert {p.content_type for p in points} == {"all"}
+
+    def test_write_reports(self, corpus, tmp_path):
+        """CSV和JSON报告包含全部测量点"""
+        service = RateDistortionService()
+        points = service.sweep(corpus, qualities=[60, 80], methods=[4])
+
+        csv_path = service.write_csv(points, tmp_path / "rd.csv")
+        json_path = service.write_json(points, tmp_path / "rd.json")
+
+        with open(csv_path, encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == len(points)
+        assert 'bits_per_pixel' in rows[0]
+
+        report = json.loads(json_path.read_text(encoding='utf-8'))
+        assert len(report['points']) == len(points)
+        assert 'PHOTO' in report['summary']
+
+    def test_stop_event_skips_remaining_images(self, corpus):
+        """取消后不再处理后续图片"""
+        import threading
+        stop_event = threading.Event()
+        stop_event.set()
+
+        service = RateDistortionService()
+        assert service.sweep(corpus, qualities=[80], methods=[4], stop_event=stop_event) == []
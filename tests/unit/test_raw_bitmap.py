@@ -0,0 +1,70 @@
+"""
+未压缩位图工具单元测试
+
+测试从mmap映射构造BMP像素(行跨度填充、自下而上行序、零复制)以及转换结果一致。
+"""
+
+import pytest
+from PIL import Image
+
+from src.models.image_file import ImageFile
+from src.models.io_policy import IOPolicy
+from src.utils.file_access import map_file
+from src.utils.raw_bitmap import map_raw_image, raw_layout
+
+
+@pytest.mark.parametrize("mode, size", [
+    ('RGB', (33, 17)),   # 24位,每行需要填充到4字节对齐
+    ('RGBA', (20, 9)),   # 32位
+    ('L', (31, 5)),      # 8位灰度,rawmode与模式相同
+    ('P', (13, 7)),      # 8位调色板
+])
+def test_mapped_pixels_match_pillow(tmp_path, mode, size):
+    """测试映射构造的像素与Pillow解码结果逐字节相同"""
+    path = tmp_path / "scan.bmp"
+    source = Image.linear_gradient('L').resize(size).convert(mode)
+    source.putpixel((0, 0), source.getpixel((size[0] - 1, size[1] - 1)))
+    source.save(path)
+
+    mapped = map_file(path)
+    with Image.open(mapped) as img:
+        pixels = map_raw_image(img, mapped)
+        with Image.open(path) as reference:
+            reference.load()
+            assert pixels.mode == reference.mode
+            assert pixels.tobytes() == reference.tobytes()
+            if mode == 'P':
+                assert pixels.getpalette() == reference.getpalette()
+    if mode == 'L':
+        assert pixels.readonly
+    del pixels
+
+
+def test_compressed_layout_rejected(tmp_path):
+    """测试非raw块(如PNG)不走映射路径"""
+    path = tmp_path / "graphic.png"
+    Image.new('RGB', (8, 8)).save(path)
+
+    with Image.open(path) as img:
+        assert raw_layout(img) is None
+
+
+def test_bmp_conversion_through_mapping(tmp_path):
+    """测试启用mmap时BMP转换结果与按路径解码相同"""
+    from src.services.converter_service import ConverterService
+
+    results = []
+    for mode in ('RGB', 'L'):
+        path = tmp_path / f"scan_{mode}.bmp"
+        Image.linear_gradient('L').resize((64, 48)).convert(mode).save(path)
+        input_file = ImageFile.from_path(path)
+        service = ConverterService()
+        mapped = service.convert_image(
+            input_file, tmp_path / f"mapped_{mode}.webp", quality=80,
+            io_policy=IOPolicy(mmap_min_bytes=0)
+        )
+        plain = service.convert_image(input_file, tmp_path / f"plain_{mode}.webp", quality=80)
+        assert mapped.success is True
+        results.append(mapped.output_path.read_bytes() == plain.output_path.read_bytes())
+
+    assert results == [True, True]
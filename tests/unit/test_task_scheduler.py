@@ -0,0 +1,99 @@
+"""
+TaskScheduler单元测试
+
+测试默认保持调用顺序、按(设备, 目录, inode)排序、同目录内大小文件交替,
+以及按估计耗时的SJF/LPT顺序。
+"""
+
+import os
+
+from PIL import Image
+
+from src.models.image_file import ImageFile
+from src.models.conversion_task import ConversionTask
+from src.models.scheduling_policy import SchedulingPolicy, TaskOrder
+from src.services.task_scheduler import TaskScheduler
+
+
+def _task(path, size=16, noisy=False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if noisy:
+        Image.effect_noise((size, size), 64).convert('RGB').save(path)
+    else:
+        Image.new('RGB', (size, size), (10, 20, 30)).save(path)
+    return ConversionTask(
+        input_file=ImageFile.from_path(path),
+        output_path=path.with_suffix('.webp'),
+        quality=80
+    )
+
+
+def test_fifo_keeps_caller_order(tmp_path):
+    """测试默认策略保持调用顺序"""
+    tasks = [_task(tmp_path / f"{name}.png") for name in "cab"]
+
+    assert TaskScheduler().order(tasks, [2, 0, 1], SchedulingPolicy()) == [2, 0, 1]
+
+
+def test_locality_groups_by_directory_and_inode(tmp_path):
+    """测试LOCALITY顺序下同一目录的任务连续,目录内按inode递增"""
+    paths = [tmp_path / "b" / "1.png", tmp_path / "a" / "1.png",
+             tmp_path / "b" / "2.png", tmp_path / "a" / "2.png"]
+    tasks = [_task(path) for path in paths]
+
+    order = TaskScheduler().order(
+        tasks, range(len(tasks)), SchedulingPolicy(order=TaskOrder.LOCALITY)
+    )
+
+    directories = [paths[index].parent.name for index in order]
+    assert directories in (['a', 'a', 'b', 'b'], ['b', 'b', 'a', 'a'])
+    inodes = [os.stat(paths[index]).st_ino for index in order]
+    assert inodes[:2] == sorted(inodes[:2]) and inodes[2:] == sorted(inodes[2:])
+
+
+def test_locality_interleaves_large_and_small(tmp_path):
+    """测试交替模式下同目录内大文件和小文件交替提交"""
+    tasks = [
+        _task(tmp_path / f"{i}.png", size=128 if i % 2 else 8, noisy=bool(i % 2))
+        for i in range(6)
+    ]
+    policy = SchedulingPolicy(order=TaskOrder.LOCALITY, interleave_sizes=True)
+
+    order = TaskScheduler().order(tasks, range(len(tasks)), policy)
+
+    assert sorted(order) == list(range(6))
+    large = [tasks[index].input_file.file_size > 1000 for index in order]
+    assert large == [True, False, True, False, True, False]
+
+
+def test_sjf_and_lpt_order_by_estimated_cost(tmp_path):
+    """测试SJF按估计耗时升序、LPT降序,默认估计随像素数增长"""
+    tasks = [_task(tmp_path / f"{i}.png", size=size) for i, size in enumerate([64, 256, 16, 128])]
+    scheduler = TaskScheduler()
+
+    assert scheduler.order(tasks, range(4), SchedulingPolicy(order=TaskOrder.SJF)) == [2, 0, 3, 1]
+    assert scheduler.order(tasks, range(4), SchedulingPolicy(order=TaskOrder.LPT)) == [1, 3, 0, 2]
+
+
+def test_cost_estimator_is_pluggable(tmp_path):
+    """测试自定义耗时估计覆盖默认估计,估计相同的任务保持调用顺序"""
+    tasks = [_task(tmp_path / f"{i}.png", size=16 + i) for i in range(4)]
+    costs = {id(tasks[0]): 3.0, id(tasks[1]): 1.0, id(tasks[2]): 3.0, id(tasks[3]): 2.0}
+    policy = SchedulingPolicy(order=TaskOrder.LPT, cost_estimator=lambda task: costs[id(task)])
+
+    assert TaskScheduler().order(tasks, range(4), policy) == [0, 2, 3, 1]
+
+
+def test_estimate_cost_depends_on_format_and_profile(tmp_path):
+    """测试同尺寸下解码慢的格式和高method档位估计耗时更长"""
+    from dataclasses import replace
+
+    from src.models.encoder_profile import EncoderProfile
+
+    task = _task(tmp_path / "a.png", size=512)
+    bmp = replace(task, input_file=replace(task.input_file, format='BMP'))
+    smallest = replace(task, encoder_profile=EncoderProfile.SMALLEST)
+    scheduler = TaskScheduler()
+
+    assert scheduler.estimate_cost(bmp) < scheduler.estimate_cost(task)
+    assert scheduler.estimate_cost(smallest) > scheduler.estimate_cost(task)
@@ -0,0 +1,96 @@
+"""
+TiledConverter单元测试
+
+测试条带读取、分块拆分与清单、缩小输出以及convert_image的分块分支。
+"""
+
+import json
+
+import pytest
+from PIL import Image, ImageChops
+
+from src.models.image_file import ImageFile
+from src.models.tiling_policy import TilingPolicy, TileMode, WEBP_MAX_DIMENSION
+from src.services.converter_service import ConverterService
+from src.services.tiled_converter import TiledConverter
+
+
+def _create_gradient(path, size=(250, 180), format=None):
+    img = Image.linear_gradient('L').resize(size).convert('RGB')
+    img.paste((255, 0, 0), (0, 0, 20, 20))
+    img.save(path, format=format)
+    return img
+
+
+@pytest.mark.parametrize("name", ["big.bmp", "big.png"])
+def test_iter_strips_matches_source(tmp_path, name):
+    """测试条带拼接后与原图一致"""
+    path = tmp_path / name
+    source = _create_gradient(path)
+
+    with Image.open(path) as img:
+        converter = TiledConverter()
+        assert converter.is_streamable(img) == name.endswith(".bmp")
+        canvas = Image.new('RGB', img.size)
+        for top, strip in converter.iter_strips(img, 64):
+            canvas.paste(strip.convert('RGB'), (0, top))
+
+    assert ImageChops.difference(canvas, source).getbbox() is None
+
+
+def test_split_writes_tiles_and_manifest(tmp_path):
+    """测试拆分模式输出分块和清单"""
+    path = tmp_path / "big.bmp"
+    _create_gradient(path)
+
+    with Image.open(path) as img:
+        output = TiledConverter().convert(
+            img, tmp_path / "big.webp", TilingPolicy(tile_size=100), quality=80
+        )
+
+    manifest = json.loads(output.output_path.read_text(encoding='utf-8'))
+    assert output.output_path == tmp_path / "big_tiles" / "manifest.json"
+    assert output.streamed is True
+    assert (manifest['width'], manifest['height']) == (250, 180)
+    assert len(manifest['tiles']) == 6
+    last = manifest['tiles'][-1]
+    assert (last['x'], last['y'], last['width'], last['height']) == (200, 100, 50, 80)
+    with Image.open(tmp_path / "big_tiles" / last['file']) as tile:
+        assert tile.size == (50, 80)
+
+
+def test_downscale_fits_max_dimension(tmp_path):
+    """测试缩小模式输出不超过尺寸上限"""
+    path = tmp_path / "big.bmp"
+    _create_gradient(path)
+
+    policy = TilingPolicy(mode=TileMode.DOWNSCALE, max_dimension=100, strip_height=32)
+    with Image.open(path) as img:
+        output = TiledConverter().convert(img, tmp_path / "small.webp", policy, quality=80)
+
+    with Image.open(output.output_path) as result:
+        assert result.size == (100, 72)
+        assert result.convert('RGB').getpixel((2, 2))[0] > 200
+
+
+def test_requires_tiling():
+    """测试分块触发条件"""
+    assert TilingPolicy().requires_tiling(WEBP_MAX_DIMENSION + 1, 10)
+    assert not TilingPolicy().requires_tiling(WEBP_MAX_DIMENSION, 10)
+    assert TilingPolicy(max_pixels=1000).requires_tiling(40, 30)
+
+
+def test_convert_image_uses_tiling(tmp_path):
+    """测试convert_image对超限图片走分块分支"""
+    path = tmp_path / "big.png"
+    _create_gradient(path)
+
+    result = ConverterService().convert_image(
+        ImageFile.from_path(path), tmp_path / "big.webp", quality=80,
+        tiling_policy=TilingPolicy(max_dimension=200, tile_size=128)
+    )
+
+    assert result.success is True
+    assert result.encode_params['tile_mode'] == 'SPLIT'
+    assert result.encode_params['tiles'] == 4
+    assert result.output_path.name == "manifest.json"
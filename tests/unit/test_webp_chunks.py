@@ -0,0 +1,104 @@
+"""
+WebP RIFF块工具单元测试
+
+测试块列表读取、元数据块的添加/替换/删除、码流不变以及原地改写的原子替换。
+"""
+
+import os
+
+import pytest
+from PIL import Image
+
+from src.utils.webp_chunks import (
+    read_chunks, read_metadata_chunks, write_webp_metadata, EXIF, XMP, ICCP, VP8X
+)
+
+
+TIFF_EXIF = b'MM\x00*\x00\x00\x00\x08\x00\x00'
+
+
+def _fourccs(path):
+    return [chunk.fourcc for chunk in read_chunks(path)]
+
+
+@pytest.mark.parametrize("mode, params", [
+    ('RGB', {}),
+    ('RGBA', {}),
+    ('RGBA', {'lossless': True}),
+])
+def test_add_and_strip_metadata_round_trip(tmp_path, mode, params):
+    """测试添加元数据后再删除,文件与原始文件逐字节相同"""
+    source = tmp_path / "source.webp"
+    Image.new(mode, (37, 21), (10, 200, 30, 128)[:len(mode)]).save(source, **params)
+    tagged = tmp_path / "tagged.webp"
+    stripped = tmp_path / "stripped.webp"
+
+    write_webp_metadata(
+        source, tagged, exif=b'Exif\x00\x00' + TIFF_EXIF, xmp=b'<x/>', icc_profile=b'icc'
+    )
+    fourccs = _fourccs(tagged)
+    assert fourccs[0] == VP8X
+    assert fourccs[1] == ICCP
+    assert fourccs[-2:] == [EXIF, XMP]
+
+    with Image.open(tagged) as img:
+        img.load()
+        assert img.size == (37, 21)
+        assert img.mode == mode
+        assert img.info['xmp'] == b'<x/>'
+        assert img.info['icc_profile'] == b'icc'
+        assert img.info['exif'] == TIFF_EXIF
+
+    write_webp_metadata(tagged, stripped, exif=None, xmp=None, icc_profile=None)
+    assert stripped.read_bytes() == source.read_bytes()
+
+
+def test_replace_keeps_other_chunks(tmp_path):
+    """测试只替换指定块,其余元数据保持不变"""
+    path = tmp_path / "image.webp"
+    Image.new('RGB', (8, 8)).save(path, exif=TIFF_EXIF, xmp=b'<old/>')
+
+    write_webp_metadata(path, xmp=b'<new/>')
+
+    chunks = read_metadata_chunks(path)
+    assert chunks[XMP] == b'<new/>'
+    assert chunks[EXIF] == TIFF_EXIF
+    assert ICCP not in chunks
+
+
+def test_in_place_rewrite_leaves_hardlinks_untouched(tmp_path):
+    """测试原地改写替换目标路径,硬链接的其他文件保持原内容,不留临时文件"""
+    path = tmp_path / "image.webp"
+    Image.new('RGB', (8, 8)).save(path, xmp=b'<old/>')
+    link = tmp_path / "link.webp"
+    os.link(path, link)
+    original = link.read_bytes()
+
+    write_webp_metadata(path, xmp=b'<new/>')
+
+    assert read_metadata_chunks(path)[XMP] == b'<new/>'
+    assert link.read_bytes() == original
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["image.webp", "link.webp"]
+
+
+def test_animated_webp_keeps_frames(tmp_path):
+    """测试动画WebP改写元数据后帧不变"""
+    path = tmp_path / "anim.webp"
+    frames = [Image.new('RGB', (8, 8), color) for color in ('red', 'green', 'blue')]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    original = path.read_bytes()
+
+    write_webp_metadata(path, exif=TIFF_EXIF)
+    with Image.open(path) as img:
+        assert img.n_frames == 3
+
+    write_webp_metadata(path, exif=None)
+    assert path.read_bytes() == original
+
+
+def test_read_chunks_rejects_non_webp(tmp_path):
+    """测试非WebP文件抛出ValueError"""
+    path = tmp_path / "image.png"
+    Image.new('RGB', (8, 8)).save(path)
+    with pytest.raises(ValueError):
+        read_chunks(path)